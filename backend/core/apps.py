@@ -6,4 +6,6 @@ class CoreConfig(AppConfig):
 
     def ready(self):
         # This imports the signals file when Django starts
-        import core.signals
\ No newline at end of file
+        import core.signals
+        import core.db
+        import core.tokens
\ No newline at end of file
@@ -0,0 +1,103 @@
+import time
+import uuid
+
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Q
+
+
+def _user_version_key(user_id):
+    return f"jwt-user-version:{user_id}"
+
+
+def invalidate_cached_user(user_id):
+    """Drop the cached auth snapshot of a user once the current transaction commits."""
+    transaction.on_commit(lambda: cache.set(_user_version_key(user_id), uuid.uuid4().hex, None))
+
+
+def _snapshot(user):
+    """
+    The fields authentication and permission checks read, without the password
+    hash. Superusers pass every has_perm() anyway; others get their user and
+    group permissions from one query.
+    """
+    permissions = [] if user.is_superuser else sorted(
+        f"{app_label}.{codename}"
+        for app_label, codename in Permission.objects.filter(Q(user=user) | Q(group__user=user))
+        .values_list("content_type__app_label", "codename").distinct()
+    )
+    snapshot = {
+        "id": user.pk,
+        "username": user.get_username(),
+        "is_active": user.is_active,
+        "is_staff": user.is_staff,
+        "is_superuser": user.is_superuser,
+        "permissions": permissions,
+    }
+    if api_settings.CHECK_REVOKE_TOKEN:
+        snapshot["password_md5"] = get_md5_hash_password(user.password)
+    return snapshot
+
+
+def _read_only(*args, **kwargs):
+    raise TypeError("Users rebuilt from an auth snapshot can't be saved.")
+
+
+def _user_from_snapshot(snapshot):
+    User = get_user_model()
+    user = User(**{
+        User._meta.pk.attname: snapshot["id"],
+        User.USERNAME_FIELD: snapshot["username"],
+        "is_active": snapshot["is_active"],
+        "is_staff": snapshot["is_staff"],
+        "is_superuser": snapshot["is_superuser"],
+    })
+    user._state.adding = False
+    user._state.db = DEFAULT_DB_ALIAS
+    # ModelBackend answers has_perm() from this cache instead of querying
+    user._perm_cache = set(snapshot["permissions"])
+    # It has no password hash, so saving it would wipe the real one
+    user.save = _read_only
+    return user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that keeps a small snapshot of the resolved user (id,
+    username, active/staff/superuser flags and permission set) in the shared
+    cache for the remaining lifetime of the access token, so bursts of
+    authenticated calls skip the User query. request.user is rebuilt from it.
+    Entries are keyed by a per-user version that invalidate_cached_user()
+    replaces on user save/delete and group/permission changes (see signals).
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            raise InvalidToken("Token contained no recognizable user identification")
+
+        # Read the version before the database so an invalidation that lands
+        # in between leaves the new entry under a version nobody reads
+        version = cache.get_or_set(_user_version_key(user_id), uuid.uuid4().hex, None)
+        key = f"jwt-user:{user_id}:{version}"
+        snapshot = cache.get(key)
+        if snapshot is None:
+            user = super().get_user(validated_token)
+            timeout = max(1, int(validated_token.get("exp", 0) - time.time()))
+            cache.set(key, _snapshot(user), timeout)
+            return user
+
+        # Same checks super() runs, against the snapshot
+        if api_settings.CHECK_USER_IS_ACTIVE and not snapshot["is_active"]:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and (
+            validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != snapshot.get("password_md5")
+        ):
+            raise AuthenticationFailed("The user's password has been changed.", code="password_changed")
+        return _user_from_snapshot(snapshot)
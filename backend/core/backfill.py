@@ -0,0 +1,74 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .caching import bump_model_version_on_commit
+from .changes import record_changes
+from .models import ChangeEvent
+from .placeholders import fill_placeholders
+
+logger = logging.getLogger(__name__)
+
+# One thread per process: rows saved without a placeholder are filled here,
+# after the response, instead of inside the request that saved them
+_filler = ThreadPoolExecutor(max_workers=1, thread_name_prefix="placeholder-fill")
+
+
+def _parent(model):
+    # (parent model, foreign key attname) whose last_modified moves with a file row; None for gallery rows
+    for field in model._meta.concrete_fields:
+        if field.many_to_one:
+            return field.related_model, field.attname
+    return None
+
+
+def save_placeholders(model, rows):
+    """
+    Store filled width/height/placeholder on `model` rows. bulk_update skips
+    signals and auto_now, so ETags, cached bodies and the change log are kept
+    honest by hand.
+    """
+    now = timezone.now()
+    fields = ["width", "height", "placeholder"]
+    parent = _parent(model)
+    with transaction.atomic():
+        if parent is None:
+            for row in rows:
+                row.last_modified = now
+            fields.append("last_modified")
+            record_changes(model, [row.pk for row in rows], ChangeEvent.UPDATED)
+        else:
+            parent_model, attname = parent
+            parent_ids = {getattr(row, attname) for row in rows}
+            parent_model.objects.filter(pk__in=parent_ids).update(last_modified=now)
+            record_changes(parent_model, parent_ids, ChangeEvent.UPDATED)
+            bump_model_version_on_commit(parent_model)
+        model.objects.bulk_update(rows, fields)
+        bump_model_version_on_commit(model)
+
+
+def _fill(model, filters):
+    try:
+        rows = fill_placeholders(list(model.objects.filter(placeholder="", **filters)))
+        if rows:
+            save_placeholders(model, rows)
+    except Exception:
+        logger.exception("Filling placeholders for %s %s failed", model.__name__, filters)
+    finally:
+        connections.close_all()
+
+
+def fill_placeholders_later(model, **filters):
+    """
+    Once the current transaction commits, fetch the Cloudinary previews of the
+    `model` rows matching `filters` that have no placeholder yet, in the
+    background. Rows it misses are left to `manage.py backfill_placeholders`.
+    """
+    transaction.on_commit(lambda: _filler.submit(_fill, model, filters))
+
+
+def wait_for_placeholder_fills():
+    """Block until every queued fill has run (benchmarks)."""
+    _filler.submit(lambda: None).result()
@@ -0,0 +1,181 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+
+from .compression import compress_variants, negotiate_encoding
+
+
+VERSION_KEY_PREFIX = "model-version"
+RESPONSE_KEY_PREFIX = "api-response"
+
+
+def _version_key(model):
+    return f"{VERSION_KEY_PREFIX}:{model._meta.label_lower}"
+
+
+def get_model_versions(models):
+    """
+    Return the current version stamp of each model, in order.
+    Stamps live in the shared cache so every gunicorn worker sees the same value.
+    """
+    keys = [_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Never set or evicted: start a fresh stamp so nothing cached under
+            # an older one can be served again
+            cache.add(key, uuid.uuid4().hex, timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_model_version(model):
+    # A random stamp (not incr) so two concurrent bumps can never collide
+    cache.set(_version_key(model), uuid.uuid4().hex, timeout=None)
+
+
+def bump_model_version_on_commit(model):
+    """
+    Bump `model`'s version once the current transaction commits. Deleting or
+    saving many rows in one transaction queues a single bump per model.
+    """
+    if connection.in_atomic_block and any(
+        getattr(func, "bumps_model", None) is model and not func.done for _, func, _ in connection.run_on_commit
+    ):
+        return
+
+    def bump():
+        # TestCase.captureOnCommitCallbacks() runs callbacks without removing them from run_on_commit
+        bump.done = True
+        bump_model_version(model)
+
+    # Bumping after commit means a concurrent reader can't cache pre-commit data under the new version
+    bump.bumps_model, bump.done = model, False
+    transaction.on_commit(bump)
+
+
+def _request_query(request):
+    return sorted((key, sorted(values)) for key, values in request.GET.lists())
+
+
+def response_cache_key(request, versions):
+    # Bodies carry absolute links (pagination `next`), so they are cached per scheme and host
+    raw = f"{request.scheme}://{request.get_host()}{request.path}|{_request_query(request)}|{versions}"
+    return f"{RESPONSE_KEY_PREFIX}:{hashlib.md5(raw.encode()).hexdigest()}"
+
+
+def is_cacheable(request):
+    # Only anonymous JSON reads are shared; the browsable API and admin traffic bypass the cache
+    return (
+        request.method == "GET"
+        and not request.user.is_authenticated
+        and getattr(request.accepted_renderer, "format", None) == "json"
+    )
+
+
+def compute_etag(request, versions):
+    """
+    Strong ETag for a response built from models at these version stamps. Any
+    save or delete bumps a stamp, so it changes with every write (deletes
+    included) without a query. There is no Last-Modified: nothing cheap
+    advances it on deletes, and a stale one would answer If-Modified-Since with 304.
+    """
+    raw = f"{request.path}|{_request_query(request)}|{versions}"
+    return f'"{hashlib.md5(raw.encode()).hexdigest()}"'
+
+
+def _set_validators(response, etag, vary_encoding=False):
+    if response.status_code in (200, 304) and etag:
+        response["ETag"] = etag
+    if vary_encoding:
+        patch_vary_headers(response, ("Accept-Encoding",))
+    return response
+
+
+def cached_response(request, models, build):
+    """
+    Serve `build()` through the response cache.
+    `models` are the tables the body is built from; saving or deleting any of
+    them bumps its version, which changes both the cache key and the ETag, so
+    a matching conditional GET gets a 304 before anything is built or read.
+    Cached bodies are stored with their br/gzip variants, compressed once, and
+    served in the encoding the client's Accept-Encoding prefers.
+    """
+    cacheable = is_cacheable(request)
+    encoding = negotiate_encoding(request) if cacheable else None
+    versions = get_model_versions(models)
+    etag = None
+    if request.method == "GET":
+        etag = compute_etag(request, versions)
+        if encoding:
+            # Each encoding is its own representation and needs its own strong ETag
+            etag = f'{etag[:-1]}-{encoding}"'
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return _set_validators(not_modified, etag, vary_encoding=cacheable)
+
+    if not cacheable:
+        return _set_validators(build(), etag)
+
+    key = response_cache_key(request, versions)
+    entry = cache.get(key)
+    if entry is None:
+        response = build()
+        if response.status_code != 200:
+            return response
+        content = request.accepted_renderer.render(
+            response.data, request.accepted_media_type, {"request": request, "response": response}
+        )
+        entry = {"content": content, "content_type": request.accepted_media_type,
+                 "encoded": compress_variants(content)}
+        cache.set(key, entry, settings.RESPONSE_CACHE_TIMEOUT)
+
+    response = _encoded_response(entry["content"], entry.get("encoded", {}), entry["content_type"], encoding)
+    return _set_validators(response, etag, vary_encoding=True)
+
+
+def _encoded_response(content, encoded, content_type, encoding):
+    body = encoded.get(encoding)
+    response = HttpResponse(body or content, content_type=content_type)
+    if body:
+        response["Content-Encoding"] = encoding
+    return response
+
+
+def precomputed_response(request, content, encoded, etag, content_type="application/json"):
+    """
+    Serve an already rendered body and its compress_variants() with the same
+    conditional GET and Accept-Encoding handling as cached_response, without
+    touching the database or the cache.
+    """
+    encoding = negotiate_encoding(request)
+    if encoding:
+        etag = f'{etag[:-1]}-{encoding}"'
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return _set_validators(not_modified, etag, vary_encoding=True)
+    response = _encoded_response(content, encoded, content_type, encoding)
+    return _set_validators(response, etag, vary_encoding=True)
+
+
+class CachedReadMixin:
+    """
+    Caches list/retrieve responses of a DRF view and answers conditional GETs.
+    Set `cache_models` to every model the serializer reads from.
+    """
+    cache_models = ()
+
+    def list(self, request, *args, **kwargs):
+        return cached_response(
+            request, self.cache_models, lambda: super(CachedReadMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return cached_response(
+            request, self.cache_models, lambda: super(CachedReadMixin, self).retrieve(request, *args, **kwargs),
+        )
@@ -0,0 +1,177 @@
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import request_finished
+from django.db import connections, transaction
+from django.db.models import Max, Min
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import ChangeEvent, Events, GymGallery, LiveUpdates, SiteInfo, Testimonial
+from .serializers import (EventsSerializer, GymGallerySerializer, LiveUpdatesSerializer, SiteInfoSerializer,
+                          TestimonialSerializer)
+
+logger = logging.getLogger(__name__)
+
+# kind -> (model, serializer, prefetch) for everything in the change log
+CHANGE_SOURCES = {
+    "event": (Events, EventsSerializer, "events_files"),
+    "live_update": (LiveUpdates, LiveUpdatesSerializer, "liveupdates_files"),
+    "gallery": (GymGallery, GymGallerySerializer, None),
+    "testimonial": (Testimonial, TestimonialSerializer, None),
+    "site_info": (SiteInfo, SiteInfoSerializer, None),
+}
+CHANGE_KINDS = {model: kind for kind, (model, _, _) in CHANGE_SOURCES.items()}
+
+PRUNE_LOCK_KEY = "change-log-prune-lock"
+
+# The open batched_changes() list, if any
+_pending_changes = ContextVar("pending_changes", default=None)
+
+
+def record_change(model, object_id, action):
+    """Append a ChangeEvent for one row; call inside the transaction that changed it."""
+    event = ChangeEvent(kind=CHANGE_KINDS[model], object_id=object_id, action=action)
+    pending = _pending_changes.get()
+    if pending is not None:
+        pending.append(event)
+    else:
+        event.save()
+
+
+def record_changes(model, object_ids, action):
+    """record_change for many rows of one model in one insert, for paths that skip signals."""
+    ChangeEvent.objects.bulk_create(
+        ChangeEvent(kind=CHANGE_KINDS[model], object_id=object_id, action=action) for object_id in object_ids
+    )
+
+
+@contextmanager
+def batched_changes():
+    """
+    Queue the record_change calls made inside the block, e.g. by the post_delete
+    handlers of a queryset delete, and insert them in one query, in order, when
+    it exits. Nothing is inserted if the block raises.
+    """
+    pending = []
+    token = _pending_changes.set(pending)
+    try:
+        yield
+    finally:
+        _pending_changes.reset(token)
+    ChangeEvent.objects.bulk_create(pending)
+
+
+def latest_change_id():
+    return ChangeEvent.objects.aggregate(latest=Max("id"))["latest"] or 0
+
+
+def is_replayable(after_id):
+    """
+    False when entries after `after_id` have been pruned from the log.
+    Pruning always keeps the newest entry, so an empty log means nothing was
+    ever recorded and only the initial cursor (0) is current.
+    """
+    oldest = ChangeEvent.objects.aggregate(oldest=Min("id"))["oldest"]
+    if oldest is None:
+        return after_id <= 0
+    return oldest <= after_id + 1
+
+
+def fetch_changes(after_id, limit=500):
+    """
+    ChangeEvents with id > after_id, oldest first. Stops short of an id gap
+    younger than CHANGE_GAP_WAIT: that id may belong to a transaction that
+    hasn't committed yet and would otherwise be skipped for good.
+    """
+    rows = list(ChangeEvent.objects.filter(id__gt=after_id).order_by("id")[:limit])
+    recent = timezone.now() - timedelta(seconds=settings.CHANGE_GAP_WAIT)
+    expected = after_id + 1
+    for index, row in enumerate(rows):
+        if row.id != expected and row.created > recent:
+            return rows[:index]
+        expected = row.id + 1
+    return rows
+
+
+def serialize_changes(events):
+    """
+    Render ChangeEvents as {"id", "kind", "action", "object_id", "data"} with
+    the current serialized object, loading each kind in one query. An object
+    deleted since its entry was written goes out as a tombstone (action
+    "deleted", data None), never as a create or update without data.
+    """
+    objects = {}
+    for kind, (model, serializer, prefetch) in CHANGE_SOURCES.items():
+        ids = {event.object_id for event in events if event.kind == kind and event.action != ChangeEvent.DELETED}
+        if ids:
+            rows = model.objects.filter(pk__in=ids)
+            if prefetch:
+                rows = rows.prefetch_related(prefetch)
+            objects[kind] = {row.pk: data for row, data in zip(rows, serializer(rows, many=True).data)}
+    changes = []
+    for event in events:
+        data = objects.get(event.kind, {}).get(event.object_id)
+        changes.append({
+            "id": event.id,
+            "kind": event.kind,
+            "action": event.action if data is not None else ChangeEvent.DELETED,
+            "object_id": event.object_id,
+            "data": data,
+        })
+    return changes
+
+
+def collapse_changes(events):
+    """Keep only the newest entry per object; it carries the object's current state anyway."""
+    latest = {(event.kind, event.object_id): event for event in events}
+    return sorted(latest.values(), key=lambda event: event.id)
+
+
+def sse_message(change):
+    return f"id: {change['id']}\nevent: change\ndata: {json.dumps(change, default=str)}\n\n"
+
+
+def prune_change_log(chunk_size=5000):
+    """
+    Delete entries older than CHANGE_LOG_RETENTION, oldest first, one short
+    transaction per chunk. The newest entry is always kept: it marks how far
+    the log reaches, so is_replayable() can reject cursors from before the pruning.
+    """
+    cutoff = timezone.now() - settings.CHANGE_LOG_RETENTION
+    newest = latest_change_id()
+    deleted = 0
+    while True:
+        ids = list(ChangeEvent.objects.filter(created__lt=cutoff, id__lt=newest)
+                   .order_by("id").values_list("id", flat=True)[:chunk_size])
+        if not ids:
+            return deleted
+        with transaction.atomic():
+            ChangeEvent.objects.filter(id__lte=ids[-1]).delete()
+        deleted += len(ids)
+
+
+def _prune_in_background():
+    try:
+        deleted = prune_change_log()
+        if deleted:
+            logger.info("Pruned %d change log entries", deleted)
+    except Exception:
+        logger.exception("Change log pruning failed")
+    finally:
+        connections.close_all()
+
+
+@receiver(request_finished)
+def maybe_prune_change_log(sender, **kwargs):
+    # Same scheme as token pruning: one worker per interval, in a background thread
+    if not settings.CHANGE_LOG_PRUNE_INTERVAL:
+        return
+    if cache.add(PRUNE_LOCK_KEY, True, timeout=settings.CHANGE_LOG_PRUNE_INTERVAL):
+        threading.Thread(target=_prune_in_background, name="change-log-prune", daemon=True).start()
@@ -0,0 +1,54 @@
+import gzip
+
+from django.conf import settings
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+
+# Compression runs on the cold path of a request, so not at the maximum:
+# brotli 11 is ~300x slower than 5 on our JSON for a <2% smaller body
+BROTLI_QUALITY = 5
+GZIP_LEVEL = 6
+
+# Preferred first when the client accepts several equally
+ENCODERS = {"gzip": lambda content: gzip.compress(content, compresslevel=GZIP_LEVEL, mtime=0)}
+if brotli is not None:
+    ENCODERS = {"br": lambda content: brotli.compress(content, quality=BROTLI_QUALITY), **ENCODERS}
+
+
+def compress_variants(content):
+    """
+    Every supported encoding of `content`, compressed once when the body is
+    cached. Small or incompressible bodies get none.
+    """
+    if len(content) < settings.COMPRESS_MIN_SIZE:
+        return {}
+    variants = {}
+    for encoding, encode in ENCODERS.items():
+        compressed = encode(content)
+        if len(compressed) < len(content):
+            variants[encoding] = compressed
+    return variants
+
+
+def negotiate_encoding(request):
+    """The supported encoding the client's Accept-Encoding prefers, or None for identity."""
+    accepted = {}
+    for part in request.headers.get("Accept-Encoding", "").split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    best, best_quality = None, 0.0
+    for encoding in ENCODERS:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
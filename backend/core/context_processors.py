@@ -0,0 +1,8 @@
+from django.utils.functional import SimpleLazyObject
+
+from .site_config import get_site_snapshot
+
+
+def site_info(request):
+    """`site_info` in templates: the SiteInfo snapshot, loaded only if a template uses it."""
+    return {"site_info": SimpleLazyObject(lambda: get_site_snapshot().data)}
@@ -0,0 +1,13 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """Apply SQLITE_PRAGMAS (synchronous, mmap, busy timeout) to each new SQLite connection."""
+    if connection.vendor != "sqlite":
+        return
+    # Straight on the sqlite3 connection: setup, not queries to log or count
+    for name, value in settings.SQLITE_PRAGMAS.items():
+        connection.connection.execute(f"PRAGMA {name} = {value}")
@@ -0,0 +1,53 @@
+import functools
+import hashlib
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.http import HttpResponse
+
+from .caching import precomputed_response
+from .compression import compress_variants
+
+
+SHELL_NAME = f"{settings.FRONTEND_STATIC_PREFIX}/index.html"
+# Vite's build output, already content-hashed (index-Bx3f_9aQ.js)
+VITE_ASSETS_URL = f"{settings.STATIC_URL}{settings.FRONTEND_STATIC_PREFIX}/assets/"
+ASSET_URL_RE = re.compile(r'(?P<attr>src|href)="(?P<url>[^"]+)"')
+
+
+@functools.lru_cache(maxsize=1)
+def _shell():
+    # Built once per process: index.html with its other static URLs (favicon and
+    # the like) pointed at the manifest-hashed names, plus its compressed variants
+    # and ETag. Vite's chunks import each other by their own names, so the entry
+    # keeps its name too; a renamed copy would load every module twice.
+    with staticfiles_storage.open(SHELL_NAME) as shell:
+        html = shell.read().decode()
+
+    def hashed(match):
+        url = match["url"]
+        if not url.startswith(settings.STATIC_URL) or url.startswith(VITE_ASSETS_URL):
+            return match[0]
+        try:
+            return f'{match["attr"]}="{staticfiles_storage.url(url[len(settings.STATIC_URL):])}"'
+        except ValueError:
+            return match[0]
+
+    content = ASSET_URL_RE.sub(hashed, html).encode()
+    return content, compress_variants(content), f'"{hashlib.md5(content).hexdigest()}"'
+
+
+def spa_shell(request, *args, **kwargs):
+    """
+    The React app's index.html for `/` and any other non-API path, so client
+    routes survive a reload. Revalidated on every visit (a cheap 304); the
+    hashed assets it references are immutable and never revalidated.
+    """
+    try:
+        content, encoded, etag = _shell()
+    except FileNotFoundError:
+        return HttpResponse("Frontend not built: run `npm run build` and `collectstatic`.", status=503)
+    response = precomputed_response(request, content, encoded, etag, content_type="text/html; charset=utf-8")
+    response["Cache-Control"] = "no-cache"
+    return response
@@ -0,0 +1,114 @@
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+from rest_framework.serializers import ListSerializer
+
+
+# Context variables rather than thread locals so worker threads started with
+# contextvars.copy_context() (parallel uploads) report into the same request
+_stats = ContextVar("request_stats", default=None)
+_in_serializer = ContextVar("in_serializer", default=False)
+
+
+class RequestStats:
+    """Counters gathered while a `collect()` block is active in this context."""
+
+    def __init__(self):
+        self.queries = 0
+        self.query_time = 0.0
+        self.serializer_time = 0.0
+        self.media_calls = 0
+        self.media_time = 0.0
+        self._lock = threading.Lock()
+
+    def add_media_call(self, seconds):
+        with self._lock:
+            self.media_calls += 1
+            self.media_time += seconds
+
+
+def current_stats():
+    return _stats.get()
+
+
+def _record_query(execute, sql, params, many, context):
+    stats = current_stats()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.query_time += time.perf_counter() - start
+
+
+@contextmanager
+def timed_serialization():
+    """Add the enclosed block to the serializer time of the active `collect()`."""
+    stats = current_stats()
+    # Only the outermost block is timed; nested serializers run inside it
+    if stats is None or _in_serializer.get():
+        yield
+        return
+    token = _in_serializer.set(True)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.serializer_time += time.perf_counter() - start
+        _in_serializer.reset(token)
+
+
+class TimedListSerializer(ListSerializer):
+    @property
+    def data(self):
+        with timed_serialization():
+            return super().data
+
+
+class TimedSerializerMixin:
+    """
+    Report `.data` as serializer time. Serializers opt in by mixing this in
+    and setting Meta.list_serializer_class = TimedListSerializer for many=True.
+    """
+
+    @property
+    def data(self):
+        with timed_serialization():
+            return super().data
+
+
+@contextmanager
+def media_call():
+    """Time one outbound call to the media service."""
+    stats = current_stats()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if stats is not None:
+            stats.add_media_call(time.perf_counter() - start)
+
+
+@contextmanager
+def collect():
+    """
+    Count queries, query time, serializer time and media calls for the enclosed
+    block. A nested block joins the enclosing one and yields the same stats.
+    """
+    if current_stats() is not None:
+        yield current_stats()
+        return
+    stats = RequestStats()
+    token = _stats.set(stats)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(_record_query))
+            yield stats
+    finally:
+        _stats.reset(token)
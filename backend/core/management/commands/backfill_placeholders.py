@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from core.backfill import save_placeholders
+from core.models import EventFiles, GymGallery, LiveUpdateFiles
+from core.placeholders import fill_placeholders
+
+
+MEDIA_MODELS = (GymGallery, EventFiles, LiveUpdateFiles)
+
+
+class Command(BaseCommand):
+    help = "Compute width, height and blurred placeholder for existing images that don't have one."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100, help="Rows fetched and updated per batch.")
+
+    def handle(self, *args, **options):
+        for model in MEDIA_MODELS:
+            filled = skipped = 0
+            last_pk = 0
+            pending = model.objects.filter(placeholder="", resource_type="image").exclude(public_id="").order_by("pk")
+            while True:
+                rows = list(pending.filter(pk__gt=last_pk)[:options["batch_size"]])
+                if not rows:
+                    break
+                last_pk = rows[-1].pk
+                done = fill_placeholders(rows)
+                skipped += len(rows) - len(done)
+                if done:
+                    save_placeholders(model, done)
+                    filled += len(done)
+            self.stdout.write(f"{model.__name__}: filled={filled} skipped={skipped}")
@@ -0,0 +1,392 @@
+import asyncio
+import io
+import json
+import time
+
+import cloudinary
+import cloudinary.utils
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, RequestFactory, override_settings
+from django.test.utils import (setup_databases, setup_test_environment, teardown_databases,
+                               teardown_test_environment)
+from django.urls import URLPattern, URLResolver, get_resolver
+from PIL import Image
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core import media
+from core.authentication import CachedJWTAuthentication
+from core.backfill import wait_for_placeholder_fills
+from core.instrumentation import collect
+from core.models import (EventFiles, Events, GymGallery, LiveUpdateFiles, LiveUpdates,
+                         SearchEntry, SiteInfo, Testimonial)
+from core.search import SEARCH_SOURCES
+from core.stream import Broadcaster, _poll
+
+
+# Ceilings on the queries of one request on the cold (uncached) path, not
+# snapshots of today's counts: each is what the route needs by design (below)
+# plus about a quarter, at least one query, of headroom. An incidental extra
+# query stays within it; a query per seeded row (ten or more) does not. Routes
+# that must not touch the database at all (api-root, cached JWT users) stay at
+# 0. The measured counts are printed beside the budgets, and
+# core/tests/test_query_counts.py checks that the key routes keep the same count
+# as rows grow.
+# ETags come from the cached model versions, so conditional GETs and cache hits cost no query;
+# authenticated calls pay two to load the JWT user snapshot (user, then its user and group permissions in one query), which
+# later requests reuse.
+# Bulk delete selects the ids, then the rows for their post_delete signals, and
+# runs one DELETE plus one insert each into the outbox and the change log,
+# whatever the number of rows (20 here). Bulk create checks every image against
+# the gallery's existing assets in one query.
+# SiteInfo reads pay one query only when the process-local snapshot reloads
+# (every cold iteration here, since the cache is cleared), then none.
+# Exports (staff only) stream every row: one query per chunk of EXPORT_CHUNK_SIZE,
+# plus its prefetch, after the two of authentication.
+# Attaching direct uploads costs one query over a server-side upload: the check
+# that none of them is already attached.
+# "stream" is one poll of the change log, shared by all STREAM_SUBSCRIBERS.
+QUERY_BUDGETS = {
+    "api-root": 0,
+    "bootstrap": 10,
+    "edit_site_info": 2,
+    "site_info-list": 2,
+    "site_info-detail": 2,
+    "testimonials-list": 2,
+    "testimonials-detail": 2,
+    "liveupdates-list": 3,
+    "liveupdates-detail": 3,
+    "events-list": 3,
+    "events-detail": 3,
+    "events-list POST": 16,
+    "events-list POST assets": 17,
+    "events-list export": 5,
+    "gym-gallery": 2,
+    "gym-gallery export": 4,
+    "gym-gallery-delete": 2,
+    "gym-gallery-bulk": 8,
+    "gym-gallery-bulk-delete": 10,
+    "search": 4,
+    "changes": 8,
+    "cloudinary-signature": 3,
+    "cloudinary-signature-batch": 3,
+    "auth_logout": 10,
+    "jwt-auth miss": 3,
+    "jwt-auth hit": 0,
+    "stream": 4,
+}
+
+# Idle /api/stream/ connections held open while one change is fanned out
+STREAM_SUBSCRIBERS = 1000
+
+ROUTE_PREFIX = "/api/"
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def _image(name):
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8)).save(buffer, "JPEG")
+    buffer.seek(0)
+    buffer.name = name
+    return buffer
+
+
+def seed_media(model, folder, index, **fields):
+    row = model(**fields, **{model.media_field: f"image/upload/v1/{folder}/seed_{index}.jpg"})
+    row.sync_media_columns()
+    return row
+
+
+def seed(events=50, files=5, live_updates=50, gallery=200, testimonials=50):
+    """Fill the current database with benchmark rows; returns one primary key per model."""
+    SiteInfo.objects.create(
+        main_bg_image="site_info_media/bg.jpg", membershi_plan=[{"name": "Monthly", "price": 1000}],
+        phone1=9000000000, gym_address="Main road",
+    )
+    events = Events.objects.bulk_create(
+        Events(title=f"Event {i}", highlights="Deadlift\nSquat\nBench", description="Lorem ipsum " * 80,
+               location="Main hall") for i in range(events))
+    EventFiles.objects.bulk_create(
+        seed_media(EventFiles, "event_photos", f"{event.pk}_{j}", event=event)
+        for event in events for j in range(files))
+    updates = LiveUpdates.objects.bulk_create(
+        LiveUpdates(subject=f"Update {i}", description="Timings change " * 40)
+        for i in range(live_updates))
+    LiveUpdateFiles.objects.bulk_create(
+        seed_media(LiveUpdateFiles, "live_update_files", f"{update.pk}_{j}", live_update=update)
+        for update in updates for j in range(files))
+    GymGallery.objects.bulk_create(
+        seed_media(GymGallery, "gym_gallery", i, title=f"Photo {i}") for i in range(gallery))
+    testimonials = Testimonial.objects.bulk_create(
+        Testimonial(name=f"Member {i}", text="Great coaches and equipment " * 5)
+        for i in range(testimonials))
+
+    # bulk_create skips the signal that maintains the search index
+    entries = []
+    for kind, (model, text) in SEARCH_SOURCES.items():
+        rows = {"event": events, "live_update": updates, "testimonial": testimonials}[kind]
+        for row in rows:
+            title, body = text(row)
+            entries.append(SearchEntry(kind=kind, object_id=row.pk, title=title, body=body))
+    SearchEntry.objects.bulk_create(entries, batch_size=500)
+
+    return {
+        "event": events[0].pk if events else 0,
+        "live_update": updates[0].pk if updates else 0,
+        "testimonial": testimonials[0].pk if testimonials else 0,
+        "gallery": GymGallery.objects.values_list("pk", flat=True).first() or 0,
+        "site_info": SiteInfo.objects.get().pk,
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database, call every route in core/urls.py through the "
+        "test client with Cloudinary stubbed locally, report queries, serializer time and "
+        "p50/p99 latency, and fail when a route exceeds its query budget."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--events", type=int, default=50)
+        parser.add_argument("--files", type=int, default=5, help="Files per event and per live update.")
+        parser.add_argument("--live-updates", type=int, default=50)
+        parser.add_argument("--gallery", type=int, default=200)
+        parser.add_argument("--testimonials", type=int, default=50)
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--json", help="Also write the results to this file.")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        # Test databases for every alias (the replica mirrors the primary)
+        old_config = setup_databases(verbosity=0, interactive=False, serialized_aliases=set())
+        settings_override = override_settings(
+            MEDIA_BACKEND="core.media.InMemoryMediaBackend",
+            CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+            # No background pruning racing the scenarios on the shared in-memory database
+            CHANGE_LOG_PRUNE_INTERVAL=None,
+            TOKEN_PRUNE_INTERVAL=None,
+        )
+        settings_override.enable()
+        media._backend = None
+        try:
+            self.ids = seed(
+                events=options["events"], files=options["files"], live_updates=options["live_updates"],
+                gallery=options["gallery"], testimonials=options["testimonials"],
+            )
+            self.user = User.objects.create_user("bench", password="bench", is_staff=True)
+            results = self.run_scenarios(options["iterations"])
+        finally:
+            settings_override.disable()
+            media._backend = None
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        self.report(results)
+        if options["json"]:
+            with open(options["json"], "w") as fh:
+                json.dump(results, fh, indent=2)
+
+        over = [r for r in results if r["max_queries"] > r["budget"]]
+        if over:
+            raise CommandError("Query budget exceeded: " + ", ".join(
+                f"{r['route']} ({r['max_queries']} > {r['budget']})" for r in over))
+
+    # --- scenarios --------------------------------------------------------
+
+    def scenarios(self):
+        """(route name, method, path, authenticated, prepare) where prepare() returns request kwargs."""
+        ids = self.ids
+
+        def gallery_batch():
+            return {"data": [{"title": f"Bulk {i}", "image": f"https://res.cloudinary.com/demo/image/upload/v1/"
+                                                              f"gym_gallery/bulk_{time.time_ns()}_{i}.jpg"}
+                             for i in range(20)],
+                    "content_type": "application/json"}
+
+        def gallery_ids():
+            rows = GymGallery.objects.bulk_create(
+                seed_media(GymGallery, "gym_gallery", f"del_{time.time_ns()}_{i}") for i in range(20))
+            return {"data": {"ids": [row.pk for row in rows]}, "content_type": "application/json"}
+
+        def event_upload():
+            return {"data": {"title": "New", "highlights": "h", "description": "d",
+                             "uploaded_images": [_image(f"p{i}.jpg") for i in range(3)]}}
+
+        def event_assets():
+            # Signed upload responses, as the browser gets them back from Cloudinary
+            assets = []
+            for i in range(3):
+                public_id = f"event_photos/direct_{time.time_ns()}_{i}"
+                signature = cloudinary.utils.api_sign_request(
+                    {"public_id": public_id, "version": 1}, cloudinary.config().api_secret, signature_version=1)
+                assets.append({"public_id": public_id, "version": 1, "signature": signature, "format": "jpg"})
+            return {"data": {"title": "New", "highlights": "h", "description": "d", "uploaded_assets": assets},
+                    "content_type": "application/json"}
+
+        def signature_batch():
+            return {"data": {"count": 50, "folder": "gym_gallery"}, "content_type": "application/json"}
+
+        def refresh_token():
+            return {"data": {"refresh": str(RefreshToken.for_user(self.user))}, "content_type": "application/json"}
+
+        return [
+            ("api-root", "get", "", False, None),
+            ("bootstrap", "get", "bootstrap/", False, None),
+            ("edit_site_info", "get", "edit/", False, None),
+            ("site_info-list", "get", "site_info/", False, None),
+            ("site_info-detail", "get", f"site_info/{ids['site_info']}/", False, None),
+            ("testimonials-list", "get", "testimonials/", False, None),
+            ("testimonials-detail", "get", f"testimonials/{ids['testimonial']}/", False, None),
+            ("liveupdates-list", "get", "live-updates/", False, None),
+            ("liveupdates-detail", "get", f"live-updates/{ids['live_update']}/", False, None),
+            ("events-list", "get", "events/", False, None),
+            ("events-detail", "get", f"events/{ids['event']}/", False, None),
+            ("events-list POST", "post", "events/", True, event_upload),
+            ("events-list POST assets", "post", "events/", True, event_assets),
+            ("events-list export", "get", "events/?export=ndjson", True, None),
+            ("gym-gallery", "get", "gallery/", False, None),
+            ("gym-gallery export", "get", "gallery/?export=json", True, None),
+            ("gym-gallery-delete", "get", f"gallery/{ids['gallery']}/", False, None),
+            ("gym-gallery-bulk", "post", "gallery/bulk/", True, gallery_batch),
+            ("gym-gallery-bulk-delete", "post", "gallery/bulk-delete/", True, gallery_ids),
+            ("search", "get", "search/?q=deadlift", False, None),
+            ("changes", "get", "changes/?since=0", False, None),
+            ("cloudinary-signature", "get", "cloudinary-signature/", True, None),
+            ("cloudinary-signature-batch", "post", "cloudinary-signature/batch/", True, signature_batch),
+            ("auth_logout", "post", "logout/", True, refresh_token),
+        ]
+
+    def route_names(self):
+        names = set()
+        for pattern in get_resolver().url_patterns:
+            if isinstance(pattern, URLResolver) and pattern.pattern.regex.pattern.lstrip("^") == "api/":
+                for inner in pattern.url_patterns:
+                    if isinstance(inner, URLPattern) and inner.name:
+                        names.add(inner.name)
+        return names
+
+    def run_scenarios(self, iterations):
+        scenarios = self.scenarios()
+        # /api/stream/ is ASGI only; measure_stream drives its broadcaster directly
+        covered = {name.split(" ")[0] for name, *_ in scenarios} | {"stream"}
+        missing = self.route_names() - covered
+        if missing:
+            raise CommandError(f"No benchmark scenario for routes: {', '.join(sorted(missing))}")
+
+        token = str(RefreshToken.for_user(self.user).access_token)
+        results = []
+        for name, method, path, authenticated, prepare in scenarios:
+            client = Client(HTTP_AUTHORIZATION=f"Bearer {token}") if authenticated else Client()
+            cold, warm, queries, serializer = [], [], [], []
+            for _ in range(iterations):
+                kwargs = prepare() if prepare else {}
+                cache.clear()
+                with collect() as stats:
+                    start = time.perf_counter()
+                    response = getattr(client, method)(ROUTE_PREFIX + path, **kwargs)
+                    if response.streaming:
+                        b"".join(response.streaming_content)
+                    cold.append(time.perf_counter() - start)
+                if response.status_code >= 400:
+                    raise CommandError(f"{name}: {method.upper()} {path} returned {response.status_code}")
+                # Placeholders of direct uploads are filled after the response; let them finish off the clock
+                wait_for_placeholder_fills()
+                queries.append(stats.queries)
+                serializer.append(stats.serializer_time)
+                if method == "get":
+                    # Same request again, now served by the response cache
+                    start = time.perf_counter()
+                    response = client.get(ROUTE_PREFIX + path)
+                    if response.streaming:
+                        b"".join(response.streaming_content)
+                    warm.append(time.perf_counter() - start)
+
+            results.append({
+                "route": name,
+                "budget": QUERY_BUDGETS.get(name, 0),
+                "max_queries": max(queries),
+                "serializer_ms": round(1000 * sum(serializer) / len(serializer), 2),
+                "p50_ms": round(1000 * _percentile(cold, 0.5), 2),
+                "p99_ms": round(1000 * _percentile(cold, 0.99), 2),
+                "warm_p50_ms": round(1000 * _percentile(warm, 0.5), 2) if warm else None,
+            })
+        results.extend(self.measure_authentication(token, iterations))
+        results.append(self.measure_stream(iterations))
+        return results
+
+    def measure_authentication(self, token, iterations):
+        """JWT authentication alone, with the user snapshot cache cold (miss) and warm (hit)."""
+        authentication = CachedJWTAuthentication()
+        request = RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        timings = {"jwt-auth miss": [], "jwt-auth hit": []}
+        queries = {name: [] for name in timings}
+        for _ in range(iterations):
+            cache.clear()
+            for name in timings:
+                with collect() as stats:
+                    start = time.perf_counter()
+                    authentication.authenticate(request)
+                    timings[name].append(time.perf_counter() - start)
+                queries[name].append(stats.queries)
+        return [
+            {
+                "route": name,
+                "budget": QUERY_BUDGETS[name],
+                "max_queries": max(queries[name]),
+                "serializer_ms": 0.0,
+                "p50_ms": round(1000 * _percentile(timings[name], 0.5), 3),
+                "p99_ms": round(1000 * _percentile(timings[name], 0.99), 3),
+                "warm_p50_ms": None,
+            }
+            for name in timings
+        ]
+
+    def measure_stream(self, iterations):
+        """Time from committing a live update to its message sitting in every subscriber's queue."""
+        timings, change_ids, queries = [], [], []
+
+        async def fan_out():
+            broadcaster = Broadcaster()
+            subscribers = [(await broadcaster.subscribe())[0] for _ in range(STREAM_SUBSCRIBERS)]
+            for index in range(iterations):
+                start = time.perf_counter()
+                await asyncio.to_thread(LiveUpdates.objects.create, subject=f"Stream {index}", description="d")
+                while not all(subscriber.queue.qsize() for subscriber in subscribers):
+                    await asyncio.sleep(0.001)
+                timings.append(time.perf_counter() - start)
+                change_ids.append(broadcaster.last_id)
+                for subscriber in subscribers:
+                    subscriber.queue.get_nowait()
+            for subscriber in subscribers:
+                broadcaster.unsubscribe(subscriber)
+
+        with override_settings(SSE_POLL_INTERVAL=0.005):
+            asyncio.run(fan_out())
+        # The polls that rendered each change, repeated on this thread where queries are counted
+        for change_id in change_ids:
+            with collect() as stats:
+                _poll(change_id - 1)
+            queries.append(stats.queries)
+        return {
+            "route": "stream",
+            "budget": QUERY_BUDGETS["stream"],
+            "max_queries": max(queries),
+            "serializer_ms": 0.0,
+            "p50_ms": round(1000 * _percentile(timings, 0.5), 2),
+            "p99_ms": round(1000 * _percentile(timings, 0.99), 2),
+            "warm_p50_ms": None,
+        }
+
+    def report(self, results):
+        header = f"{'route':<26}{'queries':>9}{'budget':>8}{'serial ms':>11}{'p50 ms':>9}{'p99 ms':>9}{'warm p50':>10}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for r in results:
+            line = (f"{r['route']:<26}{r['max_queries']:>9}{r['budget']:>8}{r['serializer_ms']:>11}"
+                    f"{r['p50_ms']:>9}{r['p99_ms']:>9}{str(r['warm_p50_ms'] or '-'):>10}")
+            self.stdout.write(self.style.ERROR(line) if r["max_queries"] > r["budget"] else line)
@@ -0,0 +1,131 @@
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections, transaction
+from django.test import RequestFactory, override_settings
+
+from core.models import Testimonial
+from core.routers import REPLICA_DB_ALIAS
+
+from .benchmark_api import _percentile, seed
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure concurrent read throughput against a file-backed SQLite copy, once with "
+        "the plain database setup (rollback journal, no connection pragmas, no replica "
+        "routing) and once with the configured one, while writer threads keep committing."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--readers", type=int, default=8)
+        parser.add_argument("--writers", type=int, default=1)
+        parser.add_argument("--seconds", type=float, default=5)
+        parser.add_argument("--path", default="/api/events/?page_size=20")
+        parser.add_argument("--events", type=int, default=200)
+
+    def handle(self, *args, **options):
+        directory = tempfile.mkdtemp(prefix="royalgym-bench-")
+        path = Path(directory) / "bench.sqlite3"
+        self.use_database(path)
+        # Every read has to reach the database
+        dummy_cache = override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}})
+        dummy_cache.enable()
+        try:
+            call_command("migrate", verbosity=0)
+            seed(events=options["events"])
+            connections.close_all()
+
+            with override_settings(SQLITE_PRAGMAS={}, DATABASE_ROUTERS=[]):
+                baseline = self.run("plain", options, journal_mode="DELETE")
+            tuned = self.run("tuned", options, journal_mode="WAL")
+        finally:
+            dummy_cache.disable()
+            connections.close_all()
+            shutil.rmtree(directory, ignore_errors=True)
+
+        header = f"{'setup':<8}{'requests':>10}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'errors':>8}{'writes':>8}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for r in (baseline, tuned):
+            self.stdout.write(
+                f"{r['setup']:<8}{r['requests']:>10}{r['rps']:>9}{r['p50_ms']:>9}{r['p99_ms']:>9}"
+                f"{r['errors']:>8}{r['writes']:>8}"
+            )
+        if baseline["rps"]:
+            self.stdout.write(f"Read throughput: {tuned['rps'] / baseline['rps']:.2f}x")
+
+    def use_database(self, path):
+        for alias in connections:
+            connections[alias].close()
+        connections.settings["default"]["NAME"] = str(path)
+        if REPLICA_DB_ALIAS in connections.settings:
+            connections.settings[REPLICA_DB_ALIAS]["NAME"] = f"file:{path}?mode=ro"
+
+    def run(self, setup, options, journal_mode):
+        # Stored in the file, as migration 0026 sets it on a real database
+        with connections["default"].cursor() as cursor:
+            cursor.execute(f"PRAGMA journal_mode = {journal_mode}")
+        connections.close_all()
+
+        stop = threading.Event()
+        handler = WSGIHandler()
+        latencies, errors, writes = [], [], [0]
+        lock = threading.Lock()
+
+        def read():
+            factory = RequestFactory()
+            mine, failed = [], 0
+
+            def start_response(status, headers, exc_info=None):
+                nonlocal failed
+                if not status.startswith("200"):
+                    failed += 1
+
+            while not stop.is_set():
+                start = time.perf_counter()
+                response = handler(factory.get(options["path"]).environ, start_response)
+                for _ in response:
+                    pass
+                # Fires request_finished, which closes the connection
+                response.close()
+                mine.append(time.perf_counter() - start)
+            connections.close_all()
+            with lock:
+                latencies.extend(mine)
+                errors.append(failed)
+
+        def write():
+            while not stop.is_set():
+                with transaction.atomic():
+                    Testimonial.objects.create(name="Bench", text="Concurrent write")
+                with lock:
+                    writes[0] += 1
+                close_old_connections()
+                time.sleep(0.005)
+            connections.close_all()
+
+        threads = [threading.Thread(target=read) for _ in range(options["readers"])]
+        threads += [threading.Thread(target=write) for _ in range(options["writers"])]
+        for thread in threads:
+            thread.start()
+        time.sleep(options["seconds"])
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        return {
+            "setup": setup,
+            "requests": len(latencies),
+            "rps": round(len(latencies) / options["seconds"], 1),
+            "p50_ms": round(1000 * _percentile(latencies, 0.5), 2) if latencies else None,
+            "p99_ms": round(1000 * _percentile(latencies, 0.99), 2) if latencies else None,
+            "errors": sum(errors),
+            "writes": writes[0],
+        }
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.outbox import drain_media_outbox
+
+
+class Command(BaseCommand):
+    help = "Destroy queued Cloudinary assets from the MediaDeletion outbox in bulk."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep draining until interrupted.")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds to sleep when the outbox is empty.")
+        parser.add_argument("--limit", type=int, default=500, help="Entries handled per pass.")
+
+    def handle(self, *args, **options):
+        while True:
+            stats = drain_media_outbox(limit=options["limit"])
+            if stats["deleted"] or stats["failed"]:
+                self.stdout.write(f"deleted={stats['deleted']} failed={stats['failed']} dead={stats['dead']}")
+            if not options["loop"]:
+                return
+            # Go straight into the next pass while there is a backlog
+            if not (stats["deleted"] or stats["failed"]):
+                time.sleep(options["interval"])
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from core.tokens import prune_expired_tokens, token_table_stats
+
+
+class Command(BaseCommand):
+    help = "Delete expired JWT outstanding/blacklisted tokens in chunks and report table sizes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, help="Tokens deleted per transaction (default TOKEN_PRUNE_CHUNK).")
+        parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between chunks.")
+        parser.add_argument("--stats", action="store_true", help="Only report table sizes.")
+
+    def handle(self, *args, **options):
+        before = token_table_stats()
+        self.stdout.write(
+            f"outstanding={before['outstanding']} blacklisted={before['blacklisted']} expired={before['expired']}"
+        )
+        if options["stats"]:
+            return
+
+        stats = prune_expired_tokens(chunk_size=options["chunk_size"], pause=options["pause"])
+        rate = stats["outstanding"] / stats["seconds"] if stats["seconds"] else 0
+        after = token_table_stats()
+        self.stdout.write(
+            f"pruned outstanding={stats['outstanding']} blacklisted={stats['blacklisted']} "
+            f"in {stats['chunks']} chunks, {stats['seconds']:.2f}s ({rate:.0f} tokens/s)"
+        )
+        self.stdout.write(f"outstanding={after['outstanding']} blacklisted={after['blacklisted']}")
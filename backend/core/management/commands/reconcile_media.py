@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.reconcile import reconcile_media
+
+
+class Command(BaseCommand):
+    help = "Find Cloudinary assets no row references (abandoned direct uploads, failed inserts) and delete them."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only report the orphans.")
+        parser.add_argument("--grace-hours", type=float,
+                            help="Leave assets younger than this alone (default MEDIA_RECONCILE_GRACE).")
+        parser.add_argument("--folder", action="append", dest="folders",
+                            help="Folder to scan, repeatable (default MEDIA_RECONCILE_FOLDERS).")
+
+    def handle(self, *args, **options):
+        folders = None
+        if options["folders"]:
+            folders = {folder: settings.MEDIA_RECONCILE_FOLDERS.get(folder, ["image"]) for folder in options["folders"]}
+        grace = timedelta(hours=options["grace_hours"]) if options["grace_hours"] is not None else None
+
+        def report(resource):
+            if options["verbosity"] > 1:
+                self.stdout.write(f"orphan {resource['resource_type']}:{resource['public_id']} "
+                                  f"({resource.get('bytes') or 0} bytes, {resource['created_at']})")
+
+        stats = reconcile_media(folders=folders, grace=grace, dry_run=options["dry_run"], report=report)
+        self.stdout.write(
+            f"scanned={stats['scanned']} referenced={stats['referenced']} recent={stats['recent']} "
+            f"orphans={stats['orphans']} ({stats['orphan_bytes'] / 1e6:.1f} MB)"
+        )
+        if options["dry_run"]:
+            self.stdout.write("dry run: nothing deleted")
+        else:
+            self.stdout.write(f"deleted={stats['deleted']} failed={stats['failed']}")
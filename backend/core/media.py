@@ -0,0 +1,253 @@
+import functools
+import io
+import itertools
+
+import cloudinary.api
+import cloudinary.uploader
+import cloudinary.utils
+import requests
+from cloudinary import CloudinaryResource
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.module_loading import import_string
+from PIL import Image, UnidentifiedImageError
+
+from .instrumentation import media_call
+
+
+# Cloudinary's bulk delete endpoint accepts at most 100 public IDs per call
+DELETE_BATCH_SIZE = 100
+# and its resource listing at most 500 assets per page
+LIST_PAGE_SIZE = 500
+
+
+def describe_asset(value, default_resource_type="image"):
+    """
+    Resolve a stored media value into the columns persisted on MediaAsset
+    models: public_id, resource_type, version and the delivery url.
+    Handles CloudinaryResource objects as well as the full delivery URLs that
+    direct browser uploads save into the gallery. Returns None for empty values.
+    """
+    if not value:
+        return None
+    resource_type = getattr(value, "resource_type", None) or default_resource_type
+    if resource_type == "auto":
+        resource_type = "image"
+    is_resource = isinstance(value, CloudinaryResource)
+    public_id = value.public_id if is_resource else str(value)
+    version = value.version if is_resource else None
+    extension = value.format if is_resource else None
+    delivery_url = None
+
+    if "upload/" in public_id:
+        # Full URL: https://res.cloudinary.com/<cloud>/<resource_type>/upload/v123/<public_id>.<ext>
+        if public_id.startswith("http"):
+            delivery_url = public_id if not extension else f"{public_id}.{extension}"
+        head, _, tail = public_id.rpartition("upload/")
+        parts = head.rstrip("/").split("/")
+        if parts and parts[-1] in ("image", "video", "raw"):
+            resource_type = parts[-1]
+        path_parts = tail.split("/")
+        if path_parts[0].startswith("v") and path_parts[0][1:].isdigit():
+            version = path_parts[0][1:]
+            path_parts = path_parts[1:]
+        public_id = "/".join(path_parts)
+        if not is_resource and resource_type != "raw":
+            # Plain strings still carry the extension (CloudinaryResource splits it
+            # into .format already); raw public IDs keep theirs
+            public_id, _, extension = public_id.rpartition(".") if "." in public_id else (public_id, "", None)
+
+    if delivery_url is None:
+        delivery_url = CloudinaryResource(
+            public_id, format=extension, version=version, resource_type=resource_type
+        ).build_url(secure=True)
+    return {
+        "public_id": public_id,
+        "resource_type": resource_type,
+        "version": int(version) if version else None,
+        "url": delivery_url,
+    }
+
+
+# Formats a width/format transformation makes sense for; PDFs and other
+# documents stored as "image" resources are served as-is
+RASTER_FORMATS = {"jpg", "jpeg", "png", "webp", "gif", "avif", "heic", "bmp", "tif", "tiff"}
+
+
+@functools.lru_cache(maxsize=4096)
+def _variant_urls(public_id, version, widths):
+    return tuple(
+        cloudinary.utils.cloudinary_url(
+            public_id, resource_type="image", version=version, secure=True,
+            width=width, crop="limit", fetch_format="auto", quality="auto",
+        )[0]
+        for _, width in widths
+    )
+
+
+def is_raster_image(public_id, resource_type, url=""):
+    """True for image assets whose delivery URL has no extension or a raster one."""
+    filename = url.rpartition("/")[2]
+    extension = filename.rpartition(".")[2].lower() if "." in filename else ""
+    return bool(public_id) and resource_type == "image" and (not extension or extension in RASTER_FORMATS)
+
+
+def image_variants(public_id, version=None, resource_type="image", url=""):
+    """
+    Width-bounded f_auto/q_auto delivery URLs for an image, one per
+    IMAGE_VARIANT_WIDTHS entry, plus a matching `srcset` string.
+    Built locally with cloudinary.utils (no API call); crop=limit never upscales.
+    Returns None for empty values and non-image assets.
+    """
+    if not is_raster_image(public_id, resource_type, url):
+        return None
+    widths = tuple(settings.IMAGE_VARIANT_WIDTHS.items())
+    urls = _variant_urls(public_id, version, widths)
+    return {
+        "variants": {name: variant for (name, _), variant in zip(widths, urls)},
+        "srcset": ", ".join(f"{variant} {width}w" for (_, width), variant in zip(widths, urls)),
+    }
+
+
+class CloudinaryMediaBackend:
+    """The only place that calls the Cloudinary upload and Admin APIs."""
+
+    def upload(self, file, **options):
+        """Upload one file; returns Cloudinary's upload response dict."""
+        with media_call():
+            return cloudinary.uploader.upload(file, **options)
+
+    def delete_resources(self, public_ids, resource_type="image"):
+        """Destroy up to DELETE_BATCH_SIZE assets; returns {public_id: "deleted" | "not_found"}."""
+        with media_call():
+            result = cloudinary.api.delete_resources(public_ids, resource_type=resource_type, invalidate=True)
+        return result.get("deleted", {})
+
+    def list_resources(self, prefix, resource_type="image", next_cursor=None):
+        """
+        One page of uploaded assets whose public_id starts with `prefix`.
+        Returns {"resources": [{"public_id", "resource_type", "created_at", "bytes"}], "next_cursor"}.
+        """
+        options = {"type": "upload", "prefix": prefix, "resource_type": resource_type, "max_results": LIST_PAGE_SIZE}
+        if next_cursor:
+            options["next_cursor"] = next_cursor
+        with media_call():
+            result = cloudinary.api.resources(**options)
+        return {
+            "resources": [
+                {
+                    "public_id": resource["public_id"],
+                    "resource_type": resource.get("resource_type", resource_type),
+                    "created_at": parse_datetime(resource["created_at"]),
+                    "bytes": resource.get("bytes", 0),
+                }
+                for resource in result.get("resources", [])
+            ],
+            "next_cursor": result.get("next_cursor"),
+        }
+
+    def image_preview(self, public_id, version=None, size=16):
+        """
+        Original width/height (fl_getinfo) and a JPEG rendition at most `size`
+        px wide, fetched from the CDN rather than the rate-limited Admin API.
+        Returns {"width", "height", "content"}.
+        """
+        info_url = cloudinary.utils.cloudinary_url(public_id, version=version, secure=True, flags="getinfo")[0]
+        thumb_url = cloudinary.utils.cloudinary_url(
+            public_id, version=version, secure=True, format="jpg",
+            width=size, height=size, crop="limit", quality=40,
+        )[0]
+        with media_call():
+            info = requests.get(info_url, timeout=10)
+            info.raise_for_status()
+        with media_call():
+            thumb = requests.get(thumb_url, timeout=10)
+            thumb.raise_for_status()
+        original = info.json()["input"]
+        return {"width": original["width"], "height": original["height"], "content": thumb.content}
+
+
+class InMemoryMediaBackend:
+    """
+    Local stand-in for Cloudinary. Select it with
+    MEDIA_BACKEND = "core.media.InMemoryMediaBackend" for tests and benchmarks.
+    """
+
+    def __init__(self):
+        self.assets = {}
+        self.calls = []
+        self.contents = {}
+        self._versions = itertools.count(1)
+
+    def upload(self, file, **options):
+        self.calls.append(("upload", getattr(file, "name", None), options.get("folder")))
+        resource_type = options.get("resource_type", "image")
+        if resource_type == "auto":
+            resource_type = "image"
+        name, _, extension = (getattr(file, "name", None) or "file").rpartition(".")
+        version = next(self._versions)
+        public_id = f"{options.get('folder', '').strip('/')}/{name or extension}_{version}".lstrip("/")
+        result = {
+            "public_id": public_id,
+            "version": version,
+            "format": extension if name else None,
+            "resource_type": resource_type,
+            "type": options.get("type", "upload"),
+        }
+        if hasattr(file, "seekable") and file.seekable():
+            file.seek(0)
+        self.contents[public_id] = file.read() if hasattr(file, "read") else b""
+        self.assets[(resource_type, public_id)] = {
+            **result, "created_at": timezone.now(), "bytes": len(self.contents[public_id]),
+        }
+        return result
+
+    def list_resources(self, prefix, resource_type="image", next_cursor=None):
+        self.calls.append(("list_resources", prefix, resource_type))
+        matching = sorted(
+            public_id for kind, public_id in self.assets if kind == resource_type and public_id.startswith(prefix)
+        )
+        # Keyset cursor (the last public_id returned), so deletes between pages skip nothing
+        if next_cursor:
+            matching = [public_id for public_id in matching if public_id > next_cursor]
+        page = matching[:LIST_PAGE_SIZE]
+        return {
+            "resources": [
+                {key: self.assets[(resource_type, public_id)][key]
+                 for key in ("public_id", "resource_type", "created_at", "bytes")}
+                for public_id in page
+            ],
+            "next_cursor": page[-1] if len(matching) > LIST_PAGE_SIZE else None,
+        }
+
+    def delete_resources(self, public_ids, resource_type="image"):
+        self.calls.append(("delete_resources", list(public_ids), resource_type))
+        return {
+            public_id: "deleted" if self.assets.pop((resource_type, public_id), None) else "not_found"
+            for public_id in public_ids
+        }
+
+    def image_preview(self, public_id, version=None, size=16):
+        self.calls.append(("image_preview", public_id))
+        try:
+            image = Image.open(io.BytesIO(self.contents[public_id]))
+            width, height = image.size
+        except (KeyError, UnidentifiedImageError):
+            # Not uploaded through this backend (e.g. seeded rows): a plain 4:3 image
+            image = Image.new("RGB", (size * 4, size * 3), (90, 90, 90))
+            width, height = 1600, 1200
+        image.thumbnail((size, size))
+        buffer = io.BytesIO()
+        image.convert("RGB").save(buffer, "JPEG", quality=40)
+        return {"width": width, "height": height, "content": buffer.getvalue()}
+
+
+_backend = None
+
+
+def get_media_backend():
+    global _backend
+    if _backend is None:
+        _backend = import_string(settings.MEDIA_BACKEND)()
+    return _backend
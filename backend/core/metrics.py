@@ -0,0 +1,68 @@
+import os
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client import REGISTRY, multiprocess
+from prometheus_client.core import GaugeMetricFamily
+
+from .outbox import outbox_stats
+
+
+# With PROMETHEUS_MULTIPROC_DIR set (see gunicorn.conf.py) every worker writes its
+# samples to files in that directory and /metrics sums them across workers
+LABELS = ["route", "method"]
+
+REQUESTS = Counter("http_requests_total", "API requests handled.", LABELS + ["status"])
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Time spent handling a request.", LABELS,
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_QUERIES = Histogram(
+    "http_request_db_queries", "Database queries run per request.", LABELS,
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+DB_SECONDS = Histogram(
+    "http_request_db_seconds", "Time spent in database queries per request.", LABELS,
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+SERIALIZER_SECONDS = Histogram(
+    "http_request_serializer_seconds", "Time spent rendering serializer data per request.", LABELS,
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+MEDIA_SECONDS = Histogram(
+    "http_request_cloudinary_seconds", "Time spent in Cloudinary calls per request (requests that made any).", LABELS,
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+
+def observe(route, method, status, duration, stats):
+    labels = {"route": route, "method": method}
+    REQUESTS.labels(status=str(status), **labels).inc()
+    REQUEST_SECONDS.labels(**labels).observe(duration)
+    DB_QUERIES.labels(**labels).observe(stats.queries)
+    DB_SECONDS.labels(**labels).observe(stats.query_time)
+    SERIALIZER_SECONDS.labels(**labels).observe(stats.serializer_time)
+    if stats.media_calls:
+        MEDIA_SECONDS.labels(**labels).observe(stats.media_time)
+
+
+class OutboxCollector:
+    """Media deletion outbox depth, read from the database at scrape time (the drain worker exports nothing)."""
+
+    def collect(self):
+        family = GaugeMetricFamily(
+            "media_outbox_entries", "Queued Cloudinary deletions; dead ones used up their attempts.", labels=["state"])
+        for state, count in outbox_stats().items():
+            family.add_metric([state], count)
+        yield family
+
+
+def render_metrics():
+    """Return (body, content_type) in the Prometheus text format, aggregated across workers."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    database = CollectorRegistry()
+    database.register(OutboxCollector())
+    return generate_latest(registry) + generate_latest(database), CONTENT_TYPE_LATEST
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.4 on 2026-10-17 21:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_alter_eventfiles_file_alter_events_location'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='events',
+            index=models.Index(fields=['-timestamp', '-id'], name='events_timestamp_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='liveupdates',
+            index=models.Index(fields=['-last_modified', '-id'], name='liveupdate_modified_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testimonial',
+            index=models.Index(fields=['-created', '-id'], name='testimonial_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.4 on 2026-10-17 21:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='events',
+            name='last_modified',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='gymgallery',
+            name='last_modified',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='siteinfo',
+            name='last_modified',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='testimonial',
+            name='last_modified',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
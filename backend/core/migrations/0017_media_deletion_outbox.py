@@ -0,0 +1,29 @@
+# Generated by Django 5.0.4 on 2026-10-17 21:46
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_last_modified_timestamps'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaDeletion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('public_id', models.CharField(max_length=255)),
+                ('resource_type', models.CharField(default='image', max_length=20)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(blank=True, default='')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['next_attempt_at'], name='mediadeletion_due_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,139 @@
+# Generated by Django 5.0.4 on 2026-10-17 21:48
+
+from cloudinary import CloudinaryResource
+from django.db import migrations, models
+
+
+MEDIA_COLUMNS = ["public_id", "resource_type", "version", "url"]
+
+
+def describe_asset(value, default_resource_type="image"):
+    # Frozen copy of core.media.describe_asset as of this migration, so later
+    # changes to the app code can't change what it writes
+    if not value:
+        return None
+    resource_type = getattr(value, "resource_type", None) or default_resource_type
+    if resource_type == "auto":
+        resource_type = "image"
+    is_resource = isinstance(value, CloudinaryResource)
+    public_id = value.public_id if is_resource else str(value)
+    version = value.version if is_resource else None
+    extension = value.format if is_resource else None
+    delivery_url = None
+
+    if "upload/" in public_id:
+        # Full URL: https://res.cloudinary.com/<cloud>/<resource_type>/upload/v123/<public_id>.<ext>
+        if public_id.startswith("http"):
+            delivery_url = public_id if not extension else f"{public_id}.{extension}"
+        head, _, tail = public_id.rpartition("upload/")
+        parts = head.rstrip("/").split("/")
+        if parts and parts[-1] in ("image", "video", "raw"):
+            resource_type = parts[-1]
+        path_parts = tail.split("/")
+        if path_parts[0].startswith("v") and path_parts[0][1:].isdigit():
+            version = path_parts[0][1:]
+            path_parts = path_parts[1:]
+        public_id = "/".join(path_parts)
+        if not is_resource and resource_type != "raw":
+            public_id, _, extension = public_id.rpartition(".") if "." in public_id else (public_id, "", None)
+
+    if delivery_url is None:
+        delivery_url = CloudinaryResource(
+            public_id, format=extension, version=version, resource_type=resource_type
+        ).build_url(secure=True)
+    return {
+        "public_id": public_id,
+        "resource_type": resource_type,
+        "version": int(version) if version else None,
+        "url": delivery_url,
+    }
+
+
+def backfill_media_columns(apps, schema_editor):
+    for model_name, field_name in (("GymGallery", "image"), ("EventFiles", "file"), ("LiveUpdateFiles", "file")):
+        model = apps.get_model("core", model_name)
+        field = model._meta.get_field(field_name)
+        batch = []
+        for row in model.objects.iterator(chunk_size=500):
+            asset = describe_asset(getattr(row, field_name), field.resource_type)
+            if asset is None:
+                continue
+            for name, value in asset.items():
+                setattr(row, name, value)
+            batch.append(row)
+            if len(batch) >= 500:
+                model.objects.bulk_update(batch, MEDIA_COLUMNS)
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, MEDIA_COLUMNS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_media_deletion_outbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventfiles',
+            name='public_id',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='eventfiles',
+            name='resource_type',
+            field=models.CharField(blank=True, default='', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='eventfiles',
+            name='url',
+            field=models.URLField(blank=True, default='', max_length=600),
+        ),
+        migrations.AddField(
+            model_name='eventfiles',
+            name='version',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='gymgallery',
+            name='public_id',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='gymgallery',
+            name='resource_type',
+            field=models.CharField(blank=True, default='', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='gymgallery',
+            name='url',
+            field=models.URLField(blank=True, default='', max_length=600),
+        ),
+        migrations.AddField(
+            model_name='gymgallery',
+            name='version',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='liveupdatefiles',
+            name='public_id',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='liveupdatefiles',
+            name='resource_type',
+            field=models.CharField(blank=True, default='', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='liveupdatefiles',
+            name='url',
+            field=models.URLField(blank=True, default='', max_length=600),
+        ),
+        migrations.AddField(
+            model_name='liveupdatefiles',
+            name='version',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_media_columns, migrations.RunPython.noop),
+    ]
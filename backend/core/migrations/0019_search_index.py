@@ -0,0 +1,97 @@
+# Generated by Django 5.0.4 on 2026-10-17 21:49
+
+from django.db import migrations, models
+
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE core_searchentry_fts USING fts5("
+    "title, body, content='core_searchentry', content_rowid='id', tokenize='porter unicode61')",
+    # Keep the external-content FTS table in step with core_searchentry
+    "CREATE TRIGGER core_searchentry_ai AFTER INSERT ON core_searchentry BEGIN "
+    "INSERT INTO core_searchentry_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    "CREATE TRIGGER core_searchentry_ad AFTER DELETE ON core_searchentry BEGIN "
+    "INSERT INTO core_searchentry_fts(core_searchentry_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); END",
+    "CREATE TRIGGER core_searchentry_au AFTER UPDATE ON core_searchentry BEGIN "
+    "INSERT INTO core_searchentry_fts(core_searchentry_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); "
+    "INSERT INTO core_searchentry_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+]
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS core_searchentry_ai",
+    "DROP TRIGGER IF EXISTS core_searchentry_ad",
+    "DROP TRIGGER IF EXISTS core_searchentry_au",
+    "DROP TABLE IF EXISTS core_searchentry_fts",
+]
+POSTGRES_FORWARD = [
+    "ALTER TABLE core_searchentry ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(body, '')), 'B')) STORED",
+    "CREATE INDEX core_searchentry_vector_idx ON core_searchentry USING gin (search_vector)",
+]
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS core_searchentry_vector_idx",
+    "ALTER TABLE core_searchentry DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def _run(schema_editor, statements):
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def create_text_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        _run(schema_editor, SQLITE_FORWARD)
+    elif vendor == "postgresql":
+        _run(schema_editor, POSTGRES_FORWARD)
+
+
+def drop_text_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        _run(schema_editor, SQLITE_REVERSE)
+    elif vendor == "postgresql":
+        _run(schema_editor, POSTGRES_REVERSE)
+
+
+def backfill_entries(apps, schema_editor):
+    SearchEntry = apps.get_model("core", "SearchEntry")
+    entries = []
+    for event in apps.get_model("core", "Events").objects.iterator():
+        body = "\n".join(filter(None, [event.highlights, event.description, event.location]))
+        entries.append(SearchEntry(kind="event", object_id=event.pk, title=event.title, body=body))
+    for update in apps.get_model("core", "LiveUpdates").objects.iterator():
+        entries.append(SearchEntry(kind="live_update", object_id=update.pk, title=update.subject,
+                                   body=update.description))
+    for testimonial in apps.get_model("core", "Testimonial").objects.iterator():
+        entries.append(SearchEntry(kind="testimonial", object_id=testimonial.pk, title=testimonial.name,
+                                   body=testimonial.text))
+    SearchEntry.objects.bulk_create(entries, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_media_asset_columns'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('title', models.CharField(blank=True, default='', max_length=300)),
+                ('body', models.TextField(blank=True, default='')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='searchentry',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id'), name='searchentry_unique_object'),
+        ),
+        migrations.RunPython(create_text_index, drop_text_index),
+        migrations.RunPython(backfill_entries, migrations.RunPython.noop),
+    ]
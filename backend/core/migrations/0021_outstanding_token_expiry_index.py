@@ -0,0 +1,39 @@
+from django.db import migrations, models
+
+# The expires_at range scan behind prune_tokens; token_blacklist ships no such index.
+# It is safe to add from here: it only adds an index, under a name of our own,
+# through the schema editor (so the DDL suits every backend), and touches no
+# migration state, so token_blacklist's own migrations neither see nor conflict
+# with it. Should a later token_blacklist migration rebuild the table on SQLite,
+# the index is dropped with it; core.tests.test_tokens checks it is still there.
+EXPIRES_AT_INDEX = models.Index(fields=["expires_at"], name="token_blacklist_outstandingtoken_expires_at_idx")
+
+
+def _existing_indexes(schema_editor, model):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        return connection.introspection.get_constraints(cursor, model._meta.db_table)
+
+
+def add_expires_at_index(apps, schema_editor):
+    OutstandingToken = apps.get_model("token_blacklist", "OutstandingToken")
+    if EXPIRES_AT_INDEX.name not in _existing_indexes(schema_editor, OutstandingToken):
+        schema_editor.add_index(OutstandingToken, EXPIRES_AT_INDEX)
+
+
+def remove_expires_at_index(apps, schema_editor):
+    OutstandingToken = apps.get_model("token_blacklist", "OutstandingToken")
+    if EXPIRES_AT_INDEX.name in _existing_indexes(schema_editor, OutstandingToken):
+        schema_editor.remove_index(OutstandingToken, EXPIRES_AT_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_media_placeholders'),
+        ('token_blacklist', '0013_alter_blacklistedtoken_options_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_expires_at_index, remove_expires_at_index),
+    ]
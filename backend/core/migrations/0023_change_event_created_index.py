@@ -0,0 +1,19 @@
+# Generated by Django 5.0.4 on 2026-10-17 22:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_change_event_log'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='changeevent',
+            name='created',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+    ]
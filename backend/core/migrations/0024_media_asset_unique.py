@@ -0,0 +1,21 @@
+# Generated by Django 5.0.4 on 2026-10-17 22:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0023_change_event_created_index'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='eventfiles',
+            constraint=models.UniqueConstraint(condition=models.Q(('public_id', ''), _negated=True), fields=('resource_type', 'public_id'), name='eventfiles_unique_asset'),
+        ),
+        migrations.AddConstraint(
+            model_name='liveupdatefiles',
+            constraint=models.UniqueConstraint(condition=models.Q(('public_id', ''), _negated=True), fields=('resource_type', 'public_id'), name='liveupdatefiles_unique_asset'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.4 on 2026-10-17 22:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0024_media_asset_unique'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='liveupdates',
+            index=models.Index(fields=['-timestamp', '-id'], name='liveupdate_timestamp_id_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+from django.db import migrations
+
+
+def enable_wal(apps, schema_editor):
+    # Stored in the database file, so set once here rather than on every connection.
+    # No-op on other engines and on in-memory test databases (which report "memory").
+    if schema_editor.connection.vendor == "sqlite":
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode = WAL")
+
+
+def disable_wal(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode = DELETE")
+
+
+class Migration(migrations.Migration):
+    # SQLite can't change the journal mode inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('core', '0025_liveupdate_timestamp_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(enable_wal, disable_wal),
+    ]
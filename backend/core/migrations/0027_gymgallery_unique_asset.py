@@ -0,0 +1,17 @@
+# Generated by Django 5.0.4 on 2026-10-17 23:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0026_sqlite_wal'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='gymgallery',
+            constraint=models.UniqueConstraint(condition=models.Q(('public_id', ''), _negated=True), fields=('resource_type', 'public_id'), name='gymgallery_unique_asset'),
+        ),
+    ]
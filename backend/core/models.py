@@ -1,6 +1,10 @@
+from django.core.files.uploadedfile import UploadedFile
 from django.db import models
+from django.utils import timezone
 from cloudinary_storage.storage import MediaCloudinaryStorage, RawMediaCloudinaryStorage
 from cloudinary.models import CloudinaryField
+from .media import describe_asset, image_variants, is_raster_image
+from .placeholders import encode_placeholder
 
 class SiteInfo(models.Model):
     main_bg_image = models.ImageField(upload_to="site_info_media/", storage=MediaCloudinaryStorage())
@@ -14,26 +18,87 @@ class SiteInfo(models.Model):
     twitter = models.CharField(max_length=600, blank=True, null=True)
     youtube = models.CharField(max_length=600, blank=True, null=True)
     footer_description = models.TextField(blank=True, null=True)
+    last_modified = models.DateTimeField(auto_now=True)
 
 class Testimonial(models.Model):
     name = models.CharField(max_length=120)
     text = models.TextField()
     rating = models.IntegerField(default=5)
     created = models.DateTimeField(auto_now_add=True)
+    last_modified = models.DateTimeField(auto_now=True)
 
-class GymGallery(models.Model):
+    class Meta:
+        # Backs the keyset pagination ordering used by TestimonialViewSet
+        indexes = [models.Index(fields=["-created", "-id"], name="testimonial_created_id_idx")]
+
+class MediaAsset(models.Model):
+    """
+    Cloudinary identity of the model's file, resolved once at write time so
+    reads are plain column reads and deletes never parse URLs.
+    `media_field` names the CloudinaryField it describes.
+    """
+    media_field = None
+
+    public_id = models.CharField(max_length=255, blank=True, default="")
+    resource_type = models.CharField(max_length=20, blank=True, default="")
+    version = models.PositiveBigIntegerField(null=True, blank=True)
+    url = models.URLField(max_length=600, blank=True, default="")
+    # Intrinsic size and a tiny base64 WebP to paint before the image loads
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    placeholder = models.TextField(blank=True, default="")
+
+    class Meta:
+        abstract = True
+
+    def sync_media_columns(self):
+        field = self._meta.get_field(self.media_field)
+        asset = describe_asset(getattr(self, field.attname), field.resource_type) or {
+            "public_id": "", "resource_type": "", "version": None, "url": "",
+        }
+        for name, value in asset.items():
+            setattr(self, name, value)
+        return asset
+
+    def is_raster_image(self):
+        return is_raster_image(self.public_id, self.resource_type, self.url)
+
+    def image_variants(self):
+        """{"variants": {name: url}, "srcset": str} for images, else None."""
+        return image_variants(self.public_id, self.version, self.resource_type, self.url)
+
+    def save(self, *args, **kwargs):
+        pending_upload = isinstance(getattr(self, self.media_field), UploadedFile)
+        if not pending_upload:
+            self.sync_media_columns()
+        elif not self.placeholder:
+            # The bytes are at hand only now, before CloudinaryField uploads them
+            for name, value in (encode_placeholder(getattr(self, self.media_field)) or {}).items():
+                setattr(self, name, value)
+        super().save(*args, **kwargs)
+        if pending_upload:
+            # CloudinaryField uploaded the file during save; record what it produced
+            type(self).objects.filter(pk=self.pk).update(**self.sync_media_columns())
+
+
+class GymGallery(MediaAsset):
     # Standard images
     image = CloudinaryField(folder="gym_gallery/", resource_type="auto", use_filename=True, unique_filename=True, null=True, blank=True)
     title = models.CharField(max_length=250, null=True, blank=True)
     description = models.TextField(null=True, blank=True)
+    last_modified = models.DateTimeField(auto_now=True)
+
+    media_field = "image"
+
+    class Meta:
+        # Deleting a row destroys its asset, so two rows must never share one
+        constraints = [models.UniqueConstraint(
+            fields=["resource_type", "public_id"], condition=~models.Q(public_id=""),
+            name="gymgallery_unique_asset",
+        )]
 
     def __str__(self):
         return self.title or "Gym Gallery Image"
-    
-    def delete(self, *args, **kwargs):
-        if self.image:
-            self.image.delete(save=False)
-        super().delete(*args, **kwargs)
 
 class LiveUpdates(models.Model):
     timestamp = models.DateTimeField(auto_now_add=True)
@@ -47,8 +112,14 @@ class LiveUpdates(models.Model):
 
     class Meta:
         ordering = ['-last_modified']
+        indexes = [
+            # Backs the keyset pagination ordering used by LiveUpdatesViewSet
+            models.Index(fields=['-timestamp', '-id'], name='liveupdate_timestamp_id_idx'),
+            # and the newest last_modified behind the list's ETag
+            models.Index(fields=['-last_modified', '-id'], name='liveupdate_modified_id_idx'),
+        ]
 
-class LiveUpdateFiles(models.Model):
+class LiveUpdateFiles(MediaAsset):
     live_update = models.ForeignKey(LiveUpdates, related_name="liveupdates_files", on_delete=models.CASCADE)
     file = CloudinaryField(
         resource_type="auto",
@@ -56,11 +127,22 @@ class LiveUpdateFiles(models.Model):
         use_filename=True,     
         unique_filename=True   
     )
+
+    media_field = "file"
+
+    class Meta:
+        # An asset belongs to one post; also stops concurrent requests attaching the same direct upload
+        constraints = [models.UniqueConstraint(
+            fields=["resource_type", "public_id"], condition=~models.Q(public_id=""),
+            name="liveupdatefiles_unique_asset",
+        )]
+
     def __str__(self):
         return f"File for {self.live_update.subject}"
 
 class Events(models.Model):
     timestamp = models.DateTimeField(auto_now_add=True)
+    last_modified = models.DateTimeField(auto_now=True)
     title = models.CharField(max_length=250)
     
    
@@ -71,10 +153,12 @@ class Events(models.Model):
 
     def __str__(self):
         return self.title
-    
+
+    class Meta:
+        indexes = [models.Index(fields=['-timestamp', '-id'], name='events_timestamp_id_idx')]
     
 
-class EventFiles(models.Model):
+class EventFiles(MediaAsset):
     event = models.ForeignKey(Events, related_name="events_files", on_delete=models.CASCADE)
     
     
@@ -87,5 +171,60 @@ class EventFiles(models.Model):
         blank=True
     )
 
+    media_field = "file"
+
+    class Meta:
+        # An asset belongs to one event; also stops concurrent requests attaching the same direct upload
+        constraints = [models.UniqueConstraint(
+            fields=["resource_type", "public_id"], condition=~models.Q(public_id=""),
+            name="eventfiles_unique_asset",
+        )]
+
+    def __str__(self):
+        return f"File for {self.event.title}"
+
+
+class MediaDeletion(models.Model):
+    # Transactional outbox: remote assets waiting to be destroyed by the drain_media_outbox worker
+    public_id = models.CharField(max_length=255)
+    resource_type = models.CharField(max_length=20, default="image")
+    created = models.DateTimeField(auto_now_add=True)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default="")
+
+    def __str__(self):
+        return self.public_id
+
+    class Meta:
+        indexes = [models.Index(fields=["next_attempt_at"], name="mediadeletion_due_idx")]
+
+
+class SearchEntry(models.Model):
+    # Denormalised text of one searchable row. Migration 0019 attaches an FTS5
+    # table (SQLite) or a tsvector column (PostgreSQL) that indexes it
+    kind = models.CharField(max_length=20)
+    object_id = models.BigIntegerField()
+    title = models.CharField(max_length=300, blank=True, default="")
+    body = models.TextField(blank=True, default="")
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id}"
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["kind", "object_id"], name="searchentry_unique_object")]
+
+
+class ChangeEvent(models.Model):
+    # Append-only log of content changes, written in the same transaction as
+    # the change. The id is the SSE event id and the /api/changes/ cursor
+    CREATED, UPDATED, DELETED = "created", "updated", "deleted"
+    ACTIONS = [(CREATED, "Created"), (UPDATED, "Updated"), (DELETED, "Deleted")]
+
+    kind = models.CharField(max_length=20)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTIONS)
+    created = models.DateTimeField(default=timezone.now, db_index=True)  # retention pruning
+
     def __str__(self):
-        return f"File for {self.event.title}"
\ No newline at end of file
+        return f"{self.kind}:{self.object_id} {self.action}"
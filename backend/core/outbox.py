@@ -0,0 +1,146 @@
+import logging
+import secrets
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .media import DELETE_BATCH_SIZE, get_media_backend
+from .models import MediaDeletion
+
+logger = logging.getLogger(__name__)
+
+# The open batched_media_deletions() list, if any
+_pending_deletions = ContextVar("pending_media_deletions", default=None)
+
+
+def enqueue_media_deletion(public_id, resource_type="image"):
+    """
+    Record a remote asset for deletion. Call it inside the transaction that
+    deletes the row so the outbox entry commits (or rolls back) with it.
+    """
+    if not public_id:
+        return
+    pending = _pending_deletions.get()
+    if pending is not None:
+        pending.append((public_id, resource_type))
+    else:
+        MediaDeletion.objects.create(public_id=public_id, resource_type=resource_type or "image")
+
+
+def enqueue_media_deletions(assets):
+    """enqueue_media_deletion for many (public_id, resource_type) pairs in one insert."""
+    MediaDeletion.objects.bulk_create(
+        MediaDeletion(public_id=public_id, resource_type=resource_type or "image")
+        for public_id, resource_type in assets if public_id
+    )
+
+
+@contextmanager
+def batched_media_deletions():
+    """
+    Queue the enqueue_media_deletion calls made inside the block, e.g. by the
+    post_delete handlers of a queryset delete, and insert them in one query
+    when it exits. Nothing is inserted if the block raises.
+    """
+    pending = []
+    token = _pending_deletions.set(pending)
+    try:
+        yield
+    finally:
+        _pending_deletions.reset(token)
+    enqueue_media_deletions(pending)
+
+
+def _retry_delay(attempts):
+    # Exponential backoff: 30s, 1m, 2m, 4m ... capped at 1h
+    return timedelta(seconds=min(settings.MEDIA_OUTBOX_RETRY_BASE * 2 ** (attempts - 1), 3600))
+
+
+def _schedule_retry(entries, error):
+    """Back off `entries`; returns how many of them have now used up their attempts."""
+    dead = 0
+    for entry in entries:
+        entry.attempts += 1
+        entry.next_attempt_at = timezone.now() + _retry_delay(entry.attempts)
+        entry.last_error = error[:1000]
+        if entry.attempts >= settings.MEDIA_OUTBOX_MAX_ATTEMPTS:
+            dead += 1
+            logger.error("Giving up on deleting %s %s after %d attempts: %s",
+                         entry.resource_type, entry.public_id, entry.attempts, entry.last_error)
+    MediaDeletion.objects.bulk_update(entries, ["attempts", "next_attempt_at", "last_error"])
+    return dead
+
+
+def outbox_stats():
+    """{"pending": n, "dead": n}; dead entries used up MEDIA_OUTBOX_MAX_ATTEMPTS and stay for inspection."""
+    dead = MediaDeletion.objects.filter(attempts__gte=settings.MEDIA_OUTBOX_MAX_ATTEMPTS).count()
+    return {"pending": MediaDeletion.objects.count() - dead, "dead": dead}
+
+
+def _due(now):
+    return MediaDeletion.objects.filter(next_attempt_at__lte=now, attempts__lt=settings.MEDIA_OUTBOX_MAX_ATTEMPTS)
+
+
+def _lease(candidates, now):
+    # One conditional UPDATE stamps the rows that are still due with a lease
+    # time no other worker uses; only the rows carrying it are this worker's
+    lease = now + timedelta(seconds=settings.MEDIA_OUTBOX_LEASE, microseconds=secrets.randbelow(10 ** 6))
+    with transaction.atomic():
+        if not _due(now).filter(pk__in=candidates).update(next_attempt_at=lease):
+            return []
+        return list(MediaDeletion.objects.filter(pk__in=candidates, next_attempt_at=lease).order_by("id"))
+
+
+def claim_due_entries(limit, now=None):
+    """
+    Lease up to `limit` due entries for this worker. Two workers that select
+    the same candidates never both claim a row.
+    """
+    now = now or timezone.now()
+    candidates = list(_due(now).order_by("id").values_list("id", flat=True)[:limit])
+    return _lease(candidates, now) if candidates else []
+
+
+def drain_media_outbox(backend=None, limit=500):
+    """
+    Destroy up to `limit` due outbox entries, grouped by resource type into
+    bulk delete calls of DELETE_BATCH_SIZE.
+    Returns {"deleted": n, "failed": n, "dead": n}, where dead counts the
+    failures that used up their last attempt.
+    """
+    backend = backend or get_media_backend()
+    due = claim_due_entries(limit)
+    if not due:
+        return {"deleted": 0, "failed": 0, "dead": 0}
+
+    by_type = defaultdict(list)
+    for entry in due:
+        by_type[entry.resource_type].append(entry)
+
+    stats = {"deleted": 0, "failed": 0, "dead": 0}
+    for resource_type, entries in by_type.items():
+        for start in range(0, len(entries), DELETE_BATCH_SIZE):
+            batch = entries[start:start + DELETE_BATCH_SIZE]
+            try:
+                results = backend.delete_resources([entry.public_id for entry in batch], resource_type=resource_type)
+            except Exception as e:
+                logger.warning("Cloudinary bulk delete failed for %d assets: %s", len(batch), e)
+                stats["dead"] += _schedule_retry(batch, str(e))
+                stats["failed"] += len(batch)
+                continue
+
+            # "not_found" counts as done: the asset is gone either way
+            done = [entry for entry in batch if results.get(entry.public_id) in ("deleted", "not_found")]
+            retry = [entry for entry in batch if entry not in done]
+            MediaDeletion.objects.filter(pk__in=[entry.pk for entry in done]).delete()
+            if retry:
+                stats["dead"] += _schedule_retry(retry, "not reported as deleted")
+            stats["deleted"] += len(done)
+            stats["failed"] += len(retry)
+
+    return stats
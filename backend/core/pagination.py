@@ -0,0 +1,30 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Opt-in cursor pagination. Lists stay un-paginated (the React app expects
+    plain arrays) unless the client sends ?page_size= or ?cursor=.
+    The ordering comes from `cursor_ordering` on the view. DRF's cursor holds
+    only the value of its first field plus an offset among the rows sharing
+    that value; later fields order those rows but are not part of the
+    position. So the first field must never change once a row exists (an
+    edit would move the row across pages) and should be unique or close to
+    it: inserting or deleting rows that tie with a cursor's value shifts
+    the offset and can skip or repeat one of them. `-id` is exact;
+    creation timestamps tie only for rows created in the same microsecond.
+    """
+    page_size = settings.API_PAGE_SIZE
+    max_page_size = settings.API_MAX_PAGE_SIZE
+    page_size_query_param = "page_size"
+    ordering = ("-id",)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_ordering(self, request, queryset, view):
+        return tuple(getattr(view, "cursor_ordering", self.ordering))
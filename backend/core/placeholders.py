@@ -0,0 +1,84 @@
+import base64
+import contextvars
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from PIL import ExifTags, Image, ImageOps, UnidentifiedImageError
+
+from .media import get_media_backend
+
+logger = logging.getLogger(__name__)
+
+
+def encode_placeholder(image_file):
+    """
+    Intrinsic size and a tiny base64 WebP (at most IMAGE_PLACEHOLDER_SIZE px)
+    of an image file. Returns {"width", "height", "placeholder"}, or None when
+    the file isn't an image or is too large to decode safely.
+    """
+    size = settings.IMAGE_PLACEHOLDER_SIZE
+    try:
+        with Image.open(image_file) as image:
+            # Dimensions as displayed, after the EXIF rotation Cloudinary also applies
+            width, height = image.size
+            if image.getexif().get(ExifTags.Base.Orientation) in (5, 6, 7, 8):
+                width, height = height, width
+            # Let JPEGs decode at a fraction of full resolution before anything else touches the pixels
+            image.draft("RGB", (size, size))
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((size, size))
+            buffer = io.BytesIO()
+            # WebP: ~60 bytes at this size where JPEG headers alone take ~600
+            image.convert("RGB").save(buffer, "WEBP", quality=40)
+    except (UnidentifiedImageError, OSError):
+        return None
+    except Image.DecompressionBombError:
+        # Declares more than twice MAX_IMAGE_PIXELS: refused before any pixel is decoded
+        logger.warning("Skipped placeholder for an image over %s pixels", Image.MAX_IMAGE_PIXELS)
+        return None
+    finally:
+        if hasattr(image_file, "seekable") and image_file.seekable():
+            image_file.seek(0)
+    return {
+        "width": width,
+        "height": height,
+        "placeholder": "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode(),
+    }
+
+
+def _remote_placeholder(backend, row):
+    preview = backend.image_preview(row.public_id, row.version, size=settings.IMAGE_PLACEHOLDER_SIZE)
+    encoded = encode_placeholder(io.BytesIO(preview["content"]))
+    if encoded is None:
+        return None
+    return {**encoded, "width": preview["width"], "height": preview["height"]}
+
+
+def fill_placeholders(rows):
+    """
+    Set width/height/placeholder on MediaAsset rows whose image is already
+    in Cloudinary (e.g. direct browser uploads), fetching the previews in
+    parallel. Best effort: rows whose preview fails are left blank for
+    `manage.py backfill_placeholders`. Returns the rows that were filled.
+    """
+    pending = [row for row in rows if not row.placeholder and row.is_raster_image()]
+    if not pending:
+        return []
+    backend = get_media_backend()
+    with ThreadPoolExecutor(max_workers=min(settings.MEDIA_UPLOAD_WORKERS, len(pending))) as pool:
+        futures = [pool.submit(contextvars.copy_context().run, _remote_placeholder, backend, row) for row in pending]
+
+    filled = []
+    for row, future in zip(pending, futures):
+        try:
+            values = future.result()
+        except Exception as e:
+            logger.warning("No placeholder for %s: %s", row.public_id, e)
+            continue
+        if values:
+            for name, value in values.items():
+                setattr(row, name, value)
+            filled.append(row)
+    return filled
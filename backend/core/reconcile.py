@@ -0,0 +1,100 @@
+import logging
+
+from django.conf import settings
+from django.utils import timezone
+
+from .media import DELETE_BATCH_SIZE, get_media_backend
+from .models import EventFiles, GymGallery, LiveUpdateFiles, MediaDeletion, SiteInfo
+
+logger = logging.getLogger(__name__)
+
+MEDIA_MODELS = (GymGallery, EventFiles, LiveUpdateFiles)
+
+
+def known_assets():
+    """
+    Set of (resource_type, public_id) the database still points at, plus the
+    ones already queued in the deletion outbox (the drain worker owns those).
+    """
+    known = set()
+    for model in MEDIA_MODELS:
+        known.update(model.objects.exclude(public_id="").values_list("resource_type", "public_id").iterator())
+    known.update(MediaDeletion.objects.values_list("resource_type", "public_id").iterator())
+    # The storage keeps the public_id as the file name
+    known.update(("image", name) for name in SiteInfo.objects.values_list("main_bg_image", flat=True) if name)
+    return known
+
+
+def _still_unreferenced(resource_type, public_ids):
+    # Re-check right before deleting: a row may have been saved since the index was built
+    referenced = set()
+    for model in MEDIA_MODELS:
+        referenced.update(
+            model.objects.filter(resource_type=resource_type, public_id__in=public_ids).values_list("public_id", flat=True)
+        )
+    return [public_id for public_id in public_ids if public_id not in referenced]
+
+
+def list_folder(backend, folder, resource_type):
+    """Every uploaded asset under `folder/`, page by page."""
+    cursor = None
+    while True:
+        page = backend.list_resources(f"{folder.strip('/')}/", resource_type=resource_type, next_cursor=cursor)
+        yield from page["resources"]
+        cursor = page["next_cursor"]
+        if not cursor:
+            return
+
+
+def reconcile_media(backend=None, folders=None, grace=None, dry_run=False, report=None):
+    """
+    Delete remote assets in MEDIA_RECONCILE_FOLDERS that no row references,
+    e.g. direct uploads the client never saved or uploads left by a failed
+    insert. Assets younger than `grace` (MEDIA_RECONCILE_GRACE) are left
+    alone, since their row may still be on its way. Orphans are deleted in
+    bulk calls of DELETE_BATCH_SIZE; with `dry_run` nothing is deleted.
+    Known public_ids are held in one in-memory set, so each listed asset is
+    checked without a query.
+    `report(resource)` is called for every orphan found.
+    Returns {"scanned", "referenced", "recent", "orphans", "orphan_bytes", "deleted", "failed"}.
+    """
+    backend = backend or get_media_backend()
+    folders = folders or settings.MEDIA_RECONCILE_FOLDERS
+    cutoff = timezone.now() - (settings.MEDIA_RECONCILE_GRACE if grace is None else grace)
+    known = known_assets()
+    stats = dict.fromkeys(("scanned", "referenced", "recent", "orphans", "orphan_bytes", "deleted", "failed"), 0)
+
+    def delete(resource_type, public_ids):
+        batch = _still_unreferenced(resource_type, public_ids)
+        if not batch:
+            return
+        try:
+            results = backend.delete_resources(batch, resource_type=resource_type)
+        except Exception as e:
+            logger.warning("Deleting %d orphaned assets failed: %s", len(batch), e)
+            stats["failed"] += len(batch)
+            return
+        done = sum(results.get(public_id) in ("deleted", "not_found") for public_id in batch)
+        stats["deleted"] += done
+        stats["failed"] += len(batch) - done
+
+    for folder, resource_types in folders.items():
+        for resource_type in resource_types:
+            orphans = []
+            for resource in list_folder(backend, folder, resource_type):
+                stats["scanned"] += 1
+                if (resource_type, resource["public_id"]) in known:
+                    stats["referenced"] += 1
+                elif resource["created_at"] and resource["created_at"] > cutoff:
+                    stats["recent"] += 1
+                else:
+                    stats["orphans"] += 1
+                    stats["orphan_bytes"] += resource.get("bytes") or 0
+                    orphans.append(resource["public_id"])
+                    if report:
+                        report(resource)
+            # Deleted only once the listing is complete, so no page cursor is invalidated
+            if not dry_run:
+                for start in range(0, len(orphans), DELETE_BATCH_SIZE):
+                    delete(resource_type, orphans[start:start + DELETE_BATCH_SIZE])
+    return stats
@@ -0,0 +1,48 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+REPLICA_DB_ALIAS = "replica"
+
+_read_from_replica = ContextVar("read_from_replica", default=False)
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    """Route ORM reads in the block to the replica (writes always go to the primary)."""
+    token = _read_from_replica.set(enabled)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Writes go to the primary. Reads go to the replica only inside
+    `replica_reads()` (set by ReplicaRoutingMiddleware for safe requests) and
+    never while the primary has an open transaction, so a transaction reads
+    its own writes.
+    """
+
+    def db_for_read(self, model, **hints):
+        if (
+            _read_from_replica.get()
+            and REPLICA_DB_ALIAS in settings.DATABASES
+            and not connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return REPLICA_DB_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,92 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import Events, LiveUpdates, SearchEntry, Testimonial
+
+
+# kind -> (model, function returning the (title, body) text to index)
+SEARCH_SOURCES = {
+    "event": (Events, lambda event: (
+        event.title, "\n".join(filter(None, [event.highlights, event.description, event.location])))),
+    "live_update": (LiveUpdates, lambda update: (update.subject, update.description)),
+    "testimonial": (Testimonial, lambda testimonial: (testimonial.name, testimonial.text)),
+}
+MODEL_KINDS = {model: kind for kind, (model, _) in SEARCH_SOURCES.items()}
+
+FTS_TABLE = "core_searchentry_fts"
+
+
+def index_instance(instance):
+    """Insert or refresh the search entry of one Events/LiveUpdates/Testimonial row."""
+    kind = MODEL_KINDS[type(instance)]
+    title, body = SEARCH_SOURCES[kind][1](instance)
+    SearchEntry.objects.update_or_create(
+        kind=kind, object_id=instance.pk, defaults={"title": title or "", "body": body or ""}
+    )
+
+
+def unindex_instance(instance):
+    SearchEntry.objects.filter(kind=MODEL_KINDS[type(instance)], object_id=instance.pk).delete()
+
+
+def _terms(query):
+    # Only word characters reach the match expression, so user input can't inject FTS syntax
+    return re.findall(r"\w+", query.lower())[:10]
+
+
+def _search_sqlite(terms, kinds, limit, offset):
+    match = " ".join(f'"{term}"*' for term in terms)
+    sql = (
+        f"SELECT e.kind, e.object_id, e.title, "
+        f"snippet({FTS_TABLE}, 1, '', '', '…', 16), bm25({FTS_TABLE}, 10.0, 1.0) AS rank "
+        f"FROM {FTS_TABLE} JOIN core_searchentry e ON e.id = {FTS_TABLE}.rowid "
+        f"WHERE {FTS_TABLE} MATCH %s AND e.kind IN ({', '.join(['%s'] * len(kinds))}) "
+        f"ORDER BY rank LIMIT %s OFFSET %s"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [match, *kinds, limit, offset])
+        return [(kind, object_id, title, snippet, -rank) for kind, object_id, title, snippet, rank in cursor.fetchall()]
+
+
+def _search_postgres(terms, kinds, limit, offset):
+    tsquery = " & ".join(f"{term}:*" for term in terms)
+    sql = (
+        "SELECT kind, object_id, title, "
+        "ts_headline('english', body, q, 'StartSel=\"\", StopSel=\"\", MaxWords=16, MinWords=8'), "
+        "ts_rank(search_vector, q) AS rank "
+        "FROM core_searchentry, to_tsquery('english', %s) q "
+        f"WHERE search_vector @@ q AND kind IN ({', '.join(['%s'] * len(kinds))}) "
+        "ORDER BY rank DESC LIMIT %s OFFSET %s"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [tsquery, *kinds, limit, offset])
+        return cursor.fetchall()
+
+
+def _search_fallback(terms, kinds, limit, offset):
+    # Unindexed LIKE scan for other database backends
+    entries = SearchEntry.objects.filter(kind__in=kinds)
+    for term in terms:
+        entries = entries.filter(Q(title__icontains=term) | Q(body__icontains=term))
+    return [
+        (entry.kind, entry.object_id, entry.title, entry.body[:120], 0.0)
+        for entry in entries.order_by("-id")[offset:offset + limit]
+    ]
+
+
+def search(query, kinds=None, limit=20, offset=0):
+    """
+    Ranked full-text search over events, live updates and testimonials.
+    Returns a list of (kind, object_id, title, snippet, score), best match first.
+    """
+    terms = _terms(query)
+    kinds = [kind for kind in (kinds or SEARCH_SOURCES) if kind in SEARCH_SOURCES]
+    if not terms or not kinds:
+        return []
+    if connection.vendor == "sqlite":
+        return _search_sqlite(terms, kinds, limit, offset)
+    if connection.vendor == "postgresql":
+        return _search_postgres(terms, kinds, limit, offset)
+    return _search_fallback(terms, kinds, limit, offset)
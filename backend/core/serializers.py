@@ -1,80 +1,175 @@
+from contextlib import contextmanager
+
+import cloudinary.utils
+from django.conf import settings
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 from .models import (SiteInfo, Testimonial, GymGallery, EventFiles, 
                      LiveUpdateFiles, LiveUpdates, Events)
+from .instrumentation import TimedListSerializer, TimedSerializerMixin
+from .media import image_variants
+from .uploads import upload_files, media_row, compensating
+
+class SiteInfoSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    # Responsive versions of the hero background
+    main_bg_image_variants = serializers.SerializerMethodField()
+    main_bg_image_srcset = serializers.SerializerMethodField()
 
-class SiteInfoSerializer(serializers.ModelSerializer):
     class Meta:
         model = SiteInfo
+        list_serializer_class = TimedListSerializer
         fields = "__all__"
 
-class TestimonialSerializer(serializers.ModelSerializer):
+    def _bg_variants(self, obj):
+        # The storage keeps the Cloudinary public_id as the file name
+        return image_variants(obj.main_bg_image.name) or {}
+
+    def get_main_bg_image_variants(self, obj):
+        return self._bg_variants(obj).get("variants")
+
+    def get_main_bg_image_srcset(self, obj):
+        return self._bg_variants(obj).get("srcset")
+
+class TestimonialSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Testimonial
+        list_serializer_class = TimedListSerializer
         fields = "__all__"
 
 
-class GymGallerySerializer(serializers.ModelSerializer):
+class GymGallerySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     # Change this to CharField so it accepts the URL string from React
     image = serializers.CharField(required=False, allow_null=True, allow_blank=True)
 
     class Meta:
         model = GymGallery
-        fields = ["id", "title", "description", "image"]
+        list_serializer_class = TimedListSerializer
+        fields = ["id", "title", "description", "image", "width", "height", "placeholder"]
+        read_only_fields = ["width", "height", "placeholder"]
 
     def create(self, validated_data):
         """
         Custom create to prevent Django Storage from doubling the URL
         """
         image_url = validated_data.pop('image', None)
-        # Create instance without the image first
-        instance = GymGallery.objects.create(**validated_data)
-        
-        if image_url:
-            # We save the string directly to the database field 
-            # This bypasses the 'upload_to' prefixing logic
-            instance.image = image_url
-            instance.save()
-            
-        return instance
+        # The URL string is saved directly to the database field, bypassing the
+        # 'upload_to' prefixing logic; save() resolves its public_id/url columns
+        gallery = GymGallery(image=image_url or None, **validated_data)
+        gallery.save()
+        return gallery
+
+    def save(self, **kwargs):
+        try:
+            # A savepoint keeps an enclosing transaction usable after the error
+            with transaction.atomic():
+                return super().save(**kwargs)
+        except IntegrityError:
+            # gymgallery_unique_asset: another row already shows this image
+            raise serializers.ValidationError({"image": ["This image is already in the gallery."]})
 
     def to_representation(self, instance):
         """
-        Clean the URL before sending it back to React
+        Send back the delivery URL resolved when the row was saved
         """
         representation = super().to_representation(instance)
-        if instance.image:
-            img_val = str(instance.image)
-            # If the database already contains a full http link, return it as is
-            if img_val.startswith('http'):
-                representation['image'] = img_val
-            else:
-                # Fallback: If it's a relative path (from Admin upload), use the .url property
-                representation['image'] = instance.image.url if hasattr(instance.image, 'url') else img_val
+        representation['image'] = instance.url or None
+        # thumb/card/full URLs and a srcset for <img>, None for non-images
+        variants = instance.image_variants() or {}
+        representation['variants'] = variants.get('variants')
+        representation['srcset'] = variants.get('srcset')
         return representation
     
     
     
+class UploadedAssetSerializer(serializers.Serializer):
+    """
+    The Cloudinary response of one direct browser upload, to be attached to a
+    `model` row. Only public_id and version are covered by its signature, so
+    the delivery URL is rebuilt from them instead of taken from the client.
+    """
+    public_id = serializers.CharField(max_length=255)
+    version = serializers.IntegerField(min_value=1)
+    signature = serializers.CharField(max_length=128)
+    resource_type = serializers.ChoiceField(choices=["image", "raw", "video"], default="image")
+    format = serializers.RegexField(r"^[A-Za-z0-9]{1,10}$", required=False, allow_null=True)
+
+    def __init__(self, *args, model=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.model = model
+
+    def validate(self, attrs):
+        # A PATCH makes nested fields optional too, so the signed ones are checked here
+        missing = [name for name in ("public_id", "version", "signature") if name not in attrs]
+        if missing:
+            raise serializers.ValidationError({name: "This field is required." for name in missing})
+        attrs.setdefault("resource_type", "image")
+        field = self.model._meta.get_field(self.model.media_field)
+        folder = field.options["folder"].strip("/")
+        allowed_types = ["image", "raw", "video"] if field.resource_type == "auto" else [field.resource_type]
+        if not attrs["public_id"].startswith(f"{folder}/"):
+            raise serializers.ValidationError({"public_id": f"Must be uploaded to the {folder} folder."})
+        if attrs["resource_type"] not in allowed_types:
+            raise serializers.ValidationError({"resource_type": f"Must be one of: {', '.join(allowed_types)}."})
+        # Checked locally with the API secret, no call to Cloudinary
+        if not cloudinary.utils.verify_api_response_signature(attrs["public_id"], attrs["version"], attrs["signature"]):
+            raise serializers.ValidationError({"signature": "Does not match this upload."})
+        return {
+            "public_id": attrs["public_id"],
+            "version": attrs["version"],
+            "resource_type": attrs["resource_type"],
+            "format": attrs.get("format") or None,
+            "type": "upload",
+        }
+
+
+def unattached_assets(model, assets):
+    """Reject assets listed twice or already attached to a `model` row (one query)."""
+    public_ids = [asset["public_id"] for asset in assets]
+    if len(set(public_ids)) < len(public_ids):
+        raise serializers.ValidationError("The same upload is listed more than once.")
+    attached = set(model.objects.filter(public_id__in=public_ids).values_list("public_id", flat=True))
+    if attached:
+        raise serializers.ValidationError(f"Already attached: {', '.join(sorted(attached))}.")
+    return assets
+
+
+@contextmanager
+def attaching():
+    """
+    unattached_assets() runs before the insert transaction; a concurrent request
+    attaching the same upload in between trips the unique asset constraint instead.
+    """
+    try:
+        yield
+    except IntegrityError:
+        raise serializers.ValidationError({"uploaded_assets": "Already attached."})
+
+
 class LiveUpdateFilesSerializer(serializers.ModelSerializer):
     # We use a MethodField to explicitly get the full Cloudinary URL
     file = serializers.SerializerMethodField()
+    variants = serializers.SerializerMethodField()
+    srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = LiveUpdateFiles
-        fields = ['id', 'file']
+        fields = ['id', 'file', 'variants', 'srcset', 'width', 'height', 'placeholder']
 
     def get_file(self, obj):
-        try:
-            # This returns the full URL (e.g., https://res.cloudinary.com/...)
-            if obj.file:
-                return obj.file.url
-        except Exception:
-            return None
-        return None
+        # Full URL (e.g., https://res.cloudinary.com/...) stored when the file was saved
+        return obj.url or None
+
+    def get_variants(self, obj):
+        # Only images get resized versions; PDFs and other files keep just `file`
+        return (obj.image_variants() or {}).get('variants')
+
+    def get_srcset(self, obj):
+        return (obj.image_variants() or {}).get('srcset')
     
     
     
 
-class LiveUpdatesSerializer(serializers.ModelSerializer):
+class LiveUpdatesSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     # Nested serializer for reading files (returns the array of file objects with URLs)
     files = LiveUpdateFilesSerializer(many=True, read_only=True, source='liveupdates_files')
     
@@ -84,57 +179,85 @@ class LiveUpdatesSerializer(serializers.ModelSerializer):
         write_only=True,
         required=False
     )
+    # Files the browser already uploaded to Cloudinary (signed upload responses)
+    uploaded_assets = serializers.ListField(
+        child=UploadedAssetSerializer(model=LiveUpdateFiles),
+        write_only=True,
+        required=False,
+        max_length=settings.UPLOAD_SIGNATURE_BATCH_MAX
+    )
 
     class Meta:
         model = LiveUpdates
-        fields = ['id', 'subject', 'description', 'timestamp', 'last_modified', 'files', 'uploaded_files']
+        list_serializer_class = TimedListSerializer
+        fields = ['id', 'subject', 'description', 'timestamp', 'last_modified', 'files', 'uploaded_files',
+                  'uploaded_assets']
+
+    def validate_uploaded_assets(self, assets):
+        return unattached_assets(LiveUpdateFiles, assets)
 
     def create(self, validated_data):
         # 1. Pop files from data so they aren't passed to the LiveUpdates model directly
         uploaded_files = validated_data.pop('uploaded_files', [])
-        
-        # 2. Create the Live Update post
-        live_update = LiveUpdates.objects.create(**validated_data)
-        
-        # 3. Create the file associations
-        for file in uploaded_files:
-            LiveUpdateFiles.objects.create(live_update=live_update, file=file)
-            
+        attached = [media_row(LiveUpdateFiles, asset) for asset in validated_data.pop('uploaded_assets', [])]
+
+        # 2. Upload everything in parallel before touching the database
+        uploads = upload_files(uploaded_files, LiveUpdateFiles._meta.get_field('file'))
+
+        # 3. Create the post and its file rows in one short transaction
+        with attaching(), compensating(uploads), transaction.atomic():
+            live_update = LiveUpdates.objects.create(**validated_data)
+            for row in attached:
+                row.live_update = live_update
+            LiveUpdateFiles.objects.bulk_create([
+                *(media_row(LiveUpdateFiles, upload, live_update=live_update) for upload in uploads), *attached
+            ])
+
         return live_update
 
     def update(self, instance, validated_data):
         # 1. Handle new files if they are being uploaded during an edit
         uploaded_files = validated_data.pop('uploaded_files', [])
-        
-        # 2. Update the text fields
-        instance.subject = validated_data.get('subject', instance.subject)
-        instance.description = validated_data.get('description', instance.description)
-        instance.save()
-
-        # 3. Add NEW files to the existing list (Appending, not replacing)
-        for file in uploaded_files:
-            LiveUpdateFiles.objects.create(live_update=instance, file=file)
-            
+        attached = [media_row(LiveUpdateFiles, asset) for asset in validated_data.pop('uploaded_assets', [])]
+        uploads = upload_files(uploaded_files, LiveUpdateFiles._meta.get_field('file'))
+
+        with attaching(), compensating(uploads), transaction.atomic():
+            # 2. Update the text fields
+            instance.subject = validated_data.get('subject', instance.subject)
+            instance.description = validated_data.get('description', instance.description)
+            instance.save()
+
+            # 3. Add NEW files to the existing list (Appending, not replacing)
+            for row in attached:
+                row.live_update = instance
+            LiveUpdateFiles.objects.bulk_create([
+                *(media_row(LiveUpdateFiles, upload, live_update=instance) for upload in uploads), *attached
+            ])
+
         return instance
     
 
 class EventFilesSerializer(serializers.ModelSerializer):
     # Returns the direct Cloudinary URL for the frontend
     file_url = serializers.SerializerMethodField()
+    variants = serializers.SerializerMethodField()
+    srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = EventFiles
-        fields = ['id', 'file_url']
+        fields = ['id', 'file_url', 'variants', 'srcset', 'width', 'height', 'placeholder']
 
     def get_file_url(self, obj):
-        try:
-            if obj.file:
-                return obj.file.url
-        except Exception:
-            return None
-        return None
+        # Stored when the file was saved, no URL building per request
+        return obj.url or None
+
+    def get_variants(self, obj):
+        return (obj.image_variants() or {}).get('variants')
+
+    def get_srcset(self, obj):
+        return (obj.image_variants() or {}).get('srcset')
 
-class EventsSerializer(serializers.ModelSerializer):
+class EventsSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     # Read-only nested representation of the images
     files = EventFilesSerializer(many=True, read_only=True, source='events_files')
     
@@ -144,37 +267,57 @@ class EventsSerializer(serializers.ModelSerializer):
         write_only=True,
         required=False
     )
+    # Images the browser already uploaded to Cloudinary (signed upload responses)
+    uploaded_assets = serializers.ListField(
+        child=UploadedAssetSerializer(model=EventFiles),
+        write_only=True,
+        required=False,
+        max_length=settings.UPLOAD_SIGNATURE_BATCH_MAX
+    )
 
     class Meta:
         model = Events
-        fields = ['id', 'title', 'highlights', 'description', 'location', 'timestamp', 'files', 'uploaded_images']
+        list_serializer_class = TimedListSerializer
+        fields = ['id', 'title', 'highlights', 'description', 'location', 'timestamp', 'last_modified', 'files',
+                  'uploaded_images', 'uploaded_assets']
+
+    def validate_uploaded_assets(self, assets):
+        return unattached_assets(EventFiles, assets)
 
     def create(self, validated_data):
         # Extract images from the request
         uploaded_images = validated_data.pop('uploaded_images', [])
-        
-        # Create the Event instance
-        event = Events.objects.create(**validated_data)
-        
-        # Create related EventFiles instances
-        for image in uploaded_images:
-            EventFiles.objects.create(event=event, file=image)
-            
+        attached = [media_row(EventFiles, asset) for asset in validated_data.pop('uploaded_assets', [])]
+
+        # Upload in parallel first so the write lock is only held for the inserts
+        uploads = upload_files(uploaded_images, EventFiles._meta.get_field('file'))
+
+        with attaching(), compensating(uploads), transaction.atomic():
+            # Create the Event instance and its EventFiles in one go
+            event = Events.objects.create(**validated_data)
+            for row in attached:
+                row.event = event
+            EventFiles.objects.bulk_create([*(media_row(EventFiles, upload, event=event) for upload in uploads), *attached])
+
         return event
 
     def update(self, instance, validated_data):
         # Extract any new images from the request
         uploaded_images = validated_data.pop('uploaded_images', [])
-        
-        # Update text fields
-        instance.title = validated_data.get('title', instance.title)
-        instance.highlights = validated_data.get('highlights', instance.highlights)
-        instance.description = validated_data.get('description', instance.description)
-        instance.location = validated_data.get('location', instance.location)
-        instance.save()
-
-        # Append new images to the existing event
-        for image in uploaded_images:
-            EventFiles.objects.create(event=instance, file=image)
-            
+        attached = [media_row(EventFiles, asset) for asset in validated_data.pop('uploaded_assets', [])]
+        uploads = upload_files(uploaded_images, EventFiles._meta.get_field('file'))
+
+        with attaching(), compensating(uploads), transaction.atomic():
+            # Update text fields
+            instance.title = validated_data.get('title', instance.title)
+            instance.highlights = validated_data.get('highlights', instance.highlights)
+            instance.description = validated_data.get('description', instance.description)
+            instance.location = validated_data.get('location', instance.location)
+            instance.save()
+
+            # Append new images to the existing event
+            for row in attached:
+                row.event = instance
+            EventFiles.objects.bulk_create([*(media_row(EventFiles, upload, event=instance) for upload in uploads), *attached])
+
         return instance
\ No newline at end of file
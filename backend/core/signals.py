@@ -1,29 +1,129 @@
-import cloudinary.uploader
-from django.db.models.signals import post_delete
+from django.contrib.auth.models import Group, Permission, User
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
-from .models import GymGallery, EventFiles, LiveUpdateFiles
+from django.utils import timezone
+from .models import (SiteInfo, Testimonial, GymGallery, Events, EventFiles,
+                     LiveUpdates, LiveUpdateFiles)
+from .caching import bump_model_version_on_commit
+from .outbox import enqueue_media_deletion
+from .search import index_instance, unindex_instance
+from .authentication import invalidate_cached_user
+from .changes import record_change
+from .models import ChangeEvent
 
 @receiver(post_delete, sender=GymGallery)
 @receiver(post_delete, sender=EventFiles)
 @receiver(post_delete, sender=LiveUpdateFiles)
 def delete_from_cloudinary(sender, instance, **kwargs):
-    # Determine which field holds the file
-    file_field = getattr(instance, 'image', None) or getattr(instance, 'file', None)
-    
-    if file_field:
-        try:
-            # Extract the public_id from the URL
-            # Example URL: https://res.cloudinary.com/demo/image/upload/v1/folder/sample.jpg
-            # public_id: folder/sample
-            url = str(file_field)
-            if "upload/" in url:
-                parts = url.split("upload/")[-1].split("/")
-                # Remove versioning (v1234567) and extension (.jpg)
-                public_id_with_ext = "/".join(parts[1:])
-                public_id = public_id_with_ext.split(".")[0]
-                
-                # Delete from Cloudinary
-                cloudinary.uploader.destroy(public_id)
-                print(f"Successfully deleted {public_id} from Cloudinary")
-        except Exception as e:
-            print(f"Cloudinary cleanup failed: {e}")
\ No newline at end of file
+    # Runs inside the delete's transaction: the outbox row commits with it and
+    # the drain_media_outbox worker destroys the asset in bulk later
+    enqueue_media_deletion(instance.public_id, instance.resource_type)
+
+
+@receiver([post_save, post_delete], sender=SiteInfo)
+@receiver([post_save, post_delete], sender=Testimonial)
+@receiver([post_save, post_delete], sender=GymGallery)
+@receiver([post_save, post_delete], sender=Events)
+@receiver([post_save, post_delete], sender=EventFiles)
+@receiver([post_save, post_delete], sender=LiveUpdates)
+@receiver([post_save, post_delete], sender=LiveUpdateFiles)
+def invalidate_response_cache(sender, **kwargs):
+    bump_model_version_on_commit(sender)
+
+
+@receiver([post_save, post_delete], sender=EventFiles)
+@receiver([post_save, post_delete], sender=LiveUpdateFiles)
+def touch_parent_last_modified(sender, instance, **kwargs):
+    # File rows have no timestamp of their own; moving the parent's
+    # last_modified keeps ETag/Last-Modified correct when only files change
+    if isinstance(kwargs.get("origin"), (Events, LiveUpdates)):
+        return  # cascade from deleting the parent itself
+    if sender is EventFiles:
+        Events.objects.filter(pk=instance.event_id).update(last_modified=timezone.now())
+    else:
+        LiveUpdates.objects.filter(pk=instance.live_update_id).update(last_modified=timezone.now())
+
+
+@receiver(post_save, sender=Events)
+@receiver(post_save, sender=LiveUpdates)
+@receiver(post_save, sender=Testimonial)
+def update_search_index(sender, instance, **kwargs):
+    index_instance(instance)
+
+
+@receiver(post_delete, sender=Events)
+@receiver(post_delete, sender=LiveUpdates)
+@receiver(post_delete, sender=Testimonial)
+def remove_from_search_index(sender, instance, **kwargs):
+    unindex_instance(instance)
+
+
+@receiver(post_save, sender=SiteInfo)
+@receiver(post_save, sender=Testimonial)
+@receiver(post_save, sender=GymGallery)
+@receiver(post_save, sender=Events)
+@receiver(post_save, sender=LiveUpdates)
+def record_saved(sender, instance, created, **kwargs):
+    record_change(sender, instance.pk, ChangeEvent.CREATED if created else ChangeEvent.UPDATED)
+
+
+@receiver(post_delete, sender=SiteInfo)
+@receiver(post_delete, sender=Testimonial)
+@receiver(post_delete, sender=GymGallery)
+@receiver(post_delete, sender=Events)
+@receiver(post_delete, sender=LiveUpdates)
+def record_deleted(sender, instance, **kwargs):
+    record_change(sender, instance.pk, ChangeEvent.DELETED)
+
+
+@receiver([post_save, post_delete], sender=EventFiles)
+@receiver([post_save, post_delete], sender=LiveUpdateFiles)
+def record_files_changed(sender, instance, **kwargs):
+    if isinstance(kwargs.get("origin"), (Events, LiveUpdates)):
+        return  # the parent's own delete is recorded
+    if sender is EventFiles:
+        record_change(Events, instance.event_id, ChangeEvent.UPDATED)
+    else:
+        record_change(LiveUpdates, instance.live_update_id, ChangeEvent.UPDATED)
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_snapshot(sender, instance, **kwargs):
+    # Covers password changes and deactivation, which both save the user
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_user_snapshot_permissions(sender, instance, action, reverse, model, pk_set, **kwargs):
+    # Additions once the rows exist; removals and clears while they still do
+    if action not in ("post_add", "pre_remove", "pre_clear"):
+        return
+    if isinstance(instance, User):
+        user_ids = [instance.pk]
+    elif model is User:
+        # Reverse side, e.g. group.user_set.add(...) or permission.user_set.clear()
+        user_ids = pk_set if pk_set is not None else instance.user_set.values_list("pk", flat=True)
+    elif isinstance(instance, Group):
+        user_ids = instance.user_set.values_list("pk", flat=True)
+    else:
+        # Permission-side changes (permission.group_set.add(...)) touch the users of those groups
+        group_ids = pk_set if pk_set is not None else instance.group_set.values_list("pk", flat=True)
+        user_ids = User.objects.filter(groups__pk__in=group_ids).values_list("pk", flat=True)
+    for user_id in set(user_ids):
+        invalidate_cached_user(user_id)
+
+
+@receiver(pre_delete, sender=Group)
+@receiver(pre_delete, sender=Permission)
+def invalidate_user_snapshot_grants(sender, instance, **kwargs):
+    # Deleting a group or permission cascades to the m2m rows without m2m_changed
+    if sender is Group:
+        user_ids = instance.user_set.values_list("pk", flat=True)
+    else:
+        user_ids = User.objects.filter(
+            Q(user_permissions=instance) | Q(groups__permissions=instance)).values_list("pk", flat=True)
+    for user_id in set(user_ids):
+        invalidate_cached_user(user_id)
@@ -0,0 +1,77 @@
+import hashlib
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from rest_framework.renderers import JSONRenderer
+
+from .caching import get_model_versions
+from .compression import compress_variants
+from .models import SiteInfo
+from .serializers import SiteInfoSerializer
+
+
+@dataclass(frozen=True)
+class SiteSnapshot:
+    """
+    Read-only copy of the SiteInfo rows and their API representation,
+    rendered once per version. `data` is the first row (what every page
+    uses), `rows` maps pk -> representation.
+    """
+    version: str
+    data: MappingProxyType
+    rows: MappingProxyType
+    content: bytes  # JSON of `data`, as /api/edit/ returns it
+    list_content: bytes  # JSON of all rows, as /api/site_info/ returns it
+    encoded: MappingProxyType  # encoding -> compressed `content`
+    list_encoded: MappingProxyType
+    etag: str
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _load(version):
+    infos = list(SiteInfo.objects.order_by("pk"))
+    rows = SiteInfoSerializer(infos, many=True).data
+    # Same as SiteInfoSerializer(SiteInfo.objects.first()).data, empty fields when there is no row
+    data = rows[0] if rows else SiteInfoSerializer(None).data
+    renderer = JSONRenderer()
+    content, list_content = renderer.render(data), renderer.render(rows)
+    return SiteSnapshot(
+        version=version,
+        data=_freeze(dict(data)),
+        rows=MappingProxyType({info.pk: _freeze(dict(row)) for info, row in zip(infos, rows)}),
+        content=content,
+        list_content=list_content,
+        encoded=MappingProxyType(compress_variants(content)),
+        list_encoded=MappingProxyType(compress_variants(list_content)),
+        etag=f'"{hashlib.md5(list_content).hexdigest()}"',
+    )
+
+
+_snapshot = None
+_lock = threading.Lock()
+
+
+def get_site_snapshot():
+    """
+    The current SiteSnapshot of this process. The hot path is one read of
+    SiteInfo's version stamp from the shared cache, no database query; a save
+    or delete anywhere bumps the stamp and the next call reloads.
+    """
+    global _snapshot
+    version = get_model_versions([SiteInfo])[0]
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+    with _lock:
+        if _snapshot is None or _snapshot.version != version:
+            # Stamp read before the rows: a save in between only causes one more reload
+            _snapshot = _load(version)
+        return _snapshot
@@ -0,0 +1,135 @@
+import asyncio
+import logging
+from collections import deque
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+from .changes import fetch_changes, is_replayable, latest_change_id, serialize_changes, sse_message
+
+logger = logging.getLogger(__name__)
+
+RESET_MESSAGE = "event: reset\ndata: {}\n\n"
+
+
+def _poll(after_id):
+    close_old_connections()
+    events = fetch_changes(after_id)
+    return [(event.id, sse_message(change)) for event, change in zip(events, serialize_changes(events))]
+
+
+def _latest_id():
+    close_old_connections()
+    return latest_change_id()
+
+
+def _replay(after_id, until_id):
+    # Messages in (after_id, until_id], or None when the log no longer reaches
+    # back that far or the gap is too large to replay
+    close_old_connections()
+    if until_id - after_id > settings.SSE_REPLAY_MAX or not is_replayable(after_id):
+        return None
+    return [(event_id, message) for event_id, message in _poll(after_id) if event_id <= until_id]
+
+
+class Subscriber:
+    def __init__(self):
+        self.queue = asyncio.Queue(maxsize=settings.SSE_QUEUE_SIZE)
+
+    def push(self, message):
+        """Queue a message; False when the subscriber has fallen too far behind."""
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def close(self):
+        # Discard the backlog and leave only the end-of-stream marker
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class Broadcaster:
+    """
+    One per worker process. While anyone is subscribed, a single task polls
+    the ChangeEvent log, renders each change once and fans the same message
+    out to every subscriber's queue, so idle connections cost no queries.
+    Recent messages stay in a ring buffer to serve Last-Event-ID resumes.
+    """
+
+    def __init__(self):
+        self.subscribers = set()
+        self.buffer = deque(maxlen=settings.SSE_BUFFER_SIZE)  # (event id, message)
+        self.last_id = 0
+        self._lock = asyncio.Lock()
+        self._task = None
+
+    async def subscribe(self, last_event_id=None):
+        """Register a subscriber; returns it with the messages it missed since `last_event_id`."""
+        subscriber = Subscriber()
+        async with self._lock:
+            if self._task is None or self._task.done():
+                # Polling stopped while nobody listened: start again from the head of the log
+                self.last_id = await sync_to_async(_latest_id)()
+                self.buffer.clear()
+                self._task = asyncio.create_task(self._run())
+            # Anything after `since` reaches the new queue through the live feed
+            since = self.last_id
+            self.subscribers.add(subscriber)
+
+        if last_event_id is None or last_event_id >= since:
+            return subscriber, []
+        if self.buffer and self.buffer[0][0] <= last_event_id + 1:
+            return subscriber, [message for event_id, message in self.buffer if last_event_id < event_id <= since]
+        backlog = await sync_to_async(_replay)(last_event_id, since)
+        if backlog is None:
+            # Client should refetch everything
+            return subscriber, [RESET_MESSAGE]
+        return subscriber, [message for _, message in backlog]
+
+    def unsubscribe(self, subscriber):
+        self.subscribers.discard(subscriber)
+
+    async def _run(self):
+        while self.subscribers:
+            try:
+                messages = await sync_to_async(_poll)(self.last_id)
+            except Exception:
+                logger.exception("Polling the change log failed")
+                messages = []
+            for event_id, message in messages:
+                self.buffer.append((event_id, message))
+                self.last_id = event_id
+                for subscriber in list(self.subscribers):
+                    if not subscriber.push(message):
+                        # Too slow: end its stream, it resumes from its Last-Event-ID
+                        self.subscribers.discard(subscriber)
+                        subscriber.close()
+            await asyncio.sleep(settings.SSE_POLL_INTERVAL)
+        self._task = None
+
+
+broadcaster = Broadcaster()
+
+
+async def stream_messages(last_event_id=None):
+    """SSE body for one client: retry hint, missed changes, then live changes and heartbeats."""
+    yield f"retry: {settings.SSE_RETRY_MS}\n\n"
+    subscriber, backlog = await broadcaster.subscribe(last_event_id)
+    try:
+        for message in backlog:
+            yield message
+        while True:
+            try:
+                message = await asyncio.wait_for(subscriber.queue.get(), settings.SSE_HEARTBEAT)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            if message is None:
+                return
+            yield message
+    finally:
+        broadcaster.unsubscribe(subscriber)
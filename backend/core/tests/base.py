@@ -0,0 +1,38 @@
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from core import media
+
+core_test_settings = override_settings(
+    MEDIA_BACKEND="core.media.InMemoryMediaBackend",
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    # No background pruning threads against the test database
+    CHANGE_LOG_PRUNE_INTERVAL=None,
+    TOKEN_PRUNE_INTERVAL=None,
+)
+
+
+class CoreTestMixin:
+    """Local cache and the in-memory media backend, both fresh for every test."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        media._backend = None
+        self.addCleanup(setattr, media, "_backend", None)
+
+    @property
+    def media(self):
+        return media.get_media_backend()
+
+
+@core_test_settings
+class CoreTestCase(CoreTestMixin, TestCase):
+    databases = {"default"}
+
+
+@core_test_settings
+class CoreTransactionTestCase(CoreTestMixin, TransactionTestCase):
+    """For behaviour a TestCase's wrapping transaction would hide, e.g. replica routing."""
+
+    databases = {"default", "replica"}
@@ -0,0 +1,108 @@
+from django.contrib.auth.models import Group, Permission, User
+from django.core.cache import cache
+from django.test import RequestFactory
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.authentication import CachedJWTAuthentication
+
+from .base import CoreTestCase
+
+
+class CachedJWTAuthenticationTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user("staff", password="secret-pass", is_staff=True)
+        group = Group.objects.create(name="editors")
+        group.permissions.add(Permission.objects.get(codename="change_events"))
+        self.user.groups.add(group)
+        token = RefreshToken.for_user(self.user).access_token
+        self.request = RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.authentication = CachedJWTAuthentication()
+
+    def authenticate(self):
+        user, _ = self.authentication.authenticate(self.request)
+        return user
+
+    def test_cold_path_costs_two_queries_and_warm_path_none(self):
+        with self.assertNumQueries(2):
+            self.authenticate()
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+        self.assertEqual((user.pk, user.username, user.is_staff), (self.user.pk, "staff", True))
+        self.assertTrue(user.has_perm("core.change_events"))
+        self.assertFalse(user.has_perm("core.delete_events"))
+
+    def test_snapshot_leaves_out_the_password_hash(self):
+        self.authenticate()
+        entries = [value for key, value in cache._cache.items() if b"jwt-user:" in key.encode()]
+        self.assertEqual(len(entries), 1)
+        self.assertNotIn(b"pbkdf2", entries[0])
+        self.assertEqual(self.authenticate().password, "")
+
+    def test_snapshot_user_cannot_be_saved(self):
+        self.authenticate()
+        with self.assertRaises(TypeError):
+            self.authenticate().save()
+
+    def test_deactivating_the_user_invalidates_the_snapshot(self):
+        self.authenticate()
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.filter(pk=self.user.pk).update(is_active=False)
+            self.user.is_active = False
+            self.user.save()
+        with self.assertRaises(Exception):
+            self.authenticate()
+
+
+class SnapshotInvalidationTests(CoreTestCase):
+    """Every change to what has_perm() answers must reach the cached snapshot."""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user("staff", password="secret-pass", is_staff=True)
+        self.group = Group.objects.create(name="editors")
+        self.change = Permission.objects.get(codename="change_events")
+        self.delete = Permission.objects.get(codename="delete_events")
+        self.group.permissions.add(self.change)
+        self.user.groups.add(self.group)
+
+    def has_perm(self, user, perm):
+        token = RefreshToken.for_user(user).access_token
+        request = RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        return CachedJWTAuthentication().authenticate(request)[0].has_perm(perm)
+
+    def assertChanges(self, change, perm, before, after, user=None):
+        user = user or self.user
+        self.assertIs(self.has_perm(user, perm), before)
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+        self.assertIs(self.has_perm(user, perm), after)
+
+    def test_leaving_and_joining_a_group(self):
+        self.assertChanges(lambda: self.user.groups.remove(self.group), "core.change_events", True, False)
+        self.assertChanges(lambda: self.group.user_set.add(self.user), "core.change_events", False, True)
+        self.assertChanges(lambda: self.group.user_set.clear(), "core.change_events", True, False)
+
+    def test_group_permission_changes(self):
+        self.assertChanges(lambda: self.group.permissions.add(self.delete), "core.delete_events", False, True)
+        # From the permission's side of the relation
+        self.assertChanges(lambda: self.delete.group_set.remove(self.group), "core.delete_events", True, False)
+
+    def test_direct_user_permissions(self):
+        self.assertChanges(lambda: self.user.user_permissions.add(self.delete), "core.delete_events", False, True)
+        self.assertChanges(lambda: self.delete.user_set.remove(self.user), "core.delete_events", True, False)
+
+    def test_deleting_a_group(self):
+        self.assertChanges(self.group.delete, "core.change_events", True, False)
+
+    def test_superuser_flag(self):
+        def promote():
+            self.user.is_superuser = True
+            self.user.save()
+
+        self.assertChanges(promote, "core.delete_events", False, True)
+
+    def test_deleting_a_permission(self):
+        self.user.user_permissions.add(self.delete)
+        self.group.permissions.add(self.delete)
+        self.assertChanges(self.delete.delete, "core.delete_events", True, False)
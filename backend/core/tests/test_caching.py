@@ -0,0 +1,46 @@
+from django.test import Client
+
+from core.models import Testimonial
+
+from .base import CoreTestCase
+
+
+class ResponseCacheTests(CoreTestCase):
+    def test_cached_links_follow_the_request_host(self):
+        Testimonial.objects.bulk_create(Testimonial(name=f"n{i}", text="t") for i in range(5))
+        client = Client()
+        client.get("/api/testimonials/?page_size=2", HTTP_HOST="evil.example")
+        response = client.get("/api/testimonials/?page_size=2", HTTP_HOST="royalgym.example")
+        self.assertTrue(response.json()["next"].startswith("http://royalgym.example/"))
+
+
+class ConditionalGetTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.testimonials = Testimonial.objects.bulk_create(Testimonial(name=f"n{i}", text="t") for i in range(3))
+
+    def test_cache_hits_and_revalidation_cost_no_query(self):
+        client = Client()
+        etag = client.get("/api/testimonials/")["ETag"]
+        with self.assertNumQueries(0):
+            self.assertEqual(client.get("/api/testimonials/").status_code, 200)
+        with self.assertNumQueries(0):
+            response = client.get("/api/testimonials/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_deletes_change_the_etag(self):
+        client = Client()
+        etag = client.get("/api/testimonials/")["ETag"]
+        # Not the newest row: a MAX(last_modified) validator would not have moved
+        with self.captureOnCommitCallbacks(execute=True):
+            self.testimonials[0].delete()
+        response = client.get("/api/testimonials/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 2)
+
+    def test_no_last_modified_to_revalidate_against(self):
+        response = Client().get("/api/testimonials/")
+        self.assertNotIn("Last-Modified", response)
+        # If-Modified-Since alone never earns a 304
+        response = Client().get("/api/testimonials/", HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT")
+        self.assertEqual(response.status_code, 200)
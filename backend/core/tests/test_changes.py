@@ -0,0 +1,53 @@
+from datetime import timedelta
+
+from django.test import Client
+from django.utils import timezone
+
+from core.changes import is_replayable, prune_change_log, serialize_changes
+from core.models import ChangeEvent, Testimonial
+
+from .base import CoreTestCase
+
+
+class ChangeLogPruningTests(CoreTestCase):
+    def age_log(self):
+        ChangeEvent.objects.update(created=timezone.now() - timedelta(days=365))
+
+    def test_pruning_keeps_the_newest_entry(self):
+        testimonials = [Testimonial.objects.create(name=f"n{i}", text="t") for i in range(3)]
+        self.age_log()
+        self.assertEqual(prune_change_log(), 2)
+        self.assertEqual(list(ChangeEvent.objects.values_list("object_id", flat=True)), [testimonials[-1].pk])
+
+    def test_cursor_before_the_newest_entry_replays_it(self):
+        Testimonial.objects.create(name="a", text="t")
+        cursor = ChangeEvent.objects.get().id
+        Testimonial.objects.create(name="b", text="t")
+        self.age_log()
+        prune_change_log()
+        response = Client().get(f"/api/changes/?since={cursor}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([change["data"]["name"] for change in response.json()["changes"]], ["b"])
+
+    def test_cursor_older_than_the_pruned_log_is_gone(self):
+        Testimonial.objects.create(name="a", text="t")
+        cursor = ChangeEvent.objects.get().id
+        Testimonial.objects.create(name="b", text="t")
+        Testimonial.objects.create(name="c", text="t")
+        self.age_log()
+        prune_change_log()
+        self.assertFalse(is_replayable(cursor))
+        self.assertEqual(Client().get(f"/api/changes/?since={cursor}").status_code, 410)
+
+    def test_empty_log_only_accepts_the_initial_cursor(self):
+        self.assertTrue(is_replayable(0))
+        self.assertFalse(is_replayable(4))
+
+
+class SerializeChangesTests(CoreTestCase):
+    def test_entry_for_a_since_deleted_row_is_a_tombstone(self):
+        testimonial = Testimonial.objects.create(name="a", text="t")
+        testimonial.delete()
+        changes = serialize_changes(list(ChangeEvent.objects.order_by("id")))
+        self.assertEqual([change["action"] for change in changes], [ChangeEvent.DELETED, ChangeEvent.DELETED])
+        self.assertEqual([change["data"] for change in changes], [None, None])
@@ -0,0 +1,105 @@
+import gzip
+import json
+from unittest import skipUnless
+
+from django.test import Client, RequestFactory
+
+from core.caching import precomputed_response
+from core.compression import brotli, compress_variants, negotiate_encoding
+from core.models import Testimonial
+
+from .base import CoreTestCase
+
+
+def negotiate(accept_encoding):
+    return negotiate_encoding(RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept_encoding))
+
+
+def decode(response):
+    encoding = response.get("Content-Encoding")
+    if encoding == "br":
+        return brotli.decompress(response.content)
+    if encoding == "gzip":
+        return gzip.decompress(response.content)
+    return response.content
+
+
+class NegotiationTests(CoreTestCase):
+    @skipUnless(brotli, "brotli is not installed")
+    def test_brotli_preferred_when_equally_accepted(self):
+        self.assertEqual(negotiate("gzip, deflate, br"), "br")
+        self.assertEqual(negotiate("*"), "br")
+
+    def test_quality_values(self):
+        self.assertEqual(negotiate("br;q=0.5, gzip"), "gzip")
+        self.assertEqual(negotiate("gzip;q=0.2, *;q=0"), "gzip")
+        self.assertIsNone(negotiate("gzip;q=0, br;q=0"))
+        self.assertIsNone(negotiate("gzip;q=oops"))
+
+    def test_identity_fallback(self):
+        for accept_encoding in ("", "identity", "deflate", "compress;q=1"):
+            with self.subTest(accept_encoding=accept_encoding):
+                self.assertIsNone(negotiate(accept_encoding))
+
+    def test_small_bodies_are_not_compressed(self):
+        self.assertEqual(compress_variants(b"{}"), {})
+
+
+class EncodedResponseTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        # Enough rows for the list to pass COMPRESS_MIN_SIZE
+        Testimonial.objects.bulk_create(Testimonial(name=f"Member {i}", text="Great coaching " * 5) for i in range(10))
+
+    def get(self, accept_encoding, **headers):
+        return Client().get("/api/testimonials/", HTTP_ACCEPT_ENCODING=accept_encoding, **headers)
+
+    def test_each_encoding_serves_the_same_body(self):
+        identity = self.get("identity")
+        self.assertNotIn("Content-Encoding", identity)
+        encodings = ["gzip", "br"] if brotli else ["gzip"]
+        for encoding in encodings:
+            with self.subTest(encoding=encoding):
+                response = self.get(encoding)
+                self.assertEqual(response["Content-Encoding"], encoding)
+                self.assertLess(len(response.content), len(identity.content))
+                self.assertEqual(json.loads(decode(response)), json.loads(identity.content))
+
+    def test_responses_vary_on_accept_encoding(self):
+        for accept_encoding in ("gzip", "identity"):
+            with self.subTest(accept_encoding=accept_encoding):
+                first = self.get(accept_encoding)
+                # The cold response and the cached one alike
+                self.assertIn("Accept-Encoding", first["Vary"])
+                self.assertIn("Accept-Encoding", self.get(accept_encoding)["Vary"])
+
+    def test_each_encoding_has_its_own_etag(self):
+        gzipped, identity = self.get("gzip"), self.get("identity")
+        self.assertNotEqual(gzipped["ETag"], identity["ETag"])
+        self.assertEqual(self.get("gzip", HTTP_IF_NONE_MATCH=gzipped["ETag"]).status_code, 304)
+        # A cached identity body does not validate a gzip request
+        response = self.get("gzip", HTTP_IF_NONE_MATCH=identity["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+    def test_precomputed_bodies_negotiate_the_same_way(self):
+        content = json.dumps({"about": "Strength and conditioning " * 40}).encode()
+        encoded = compress_variants(content)
+        factory = RequestFactory()
+
+        response = precomputed_response(factory.get("/", HTTP_ACCEPT_ENCODING="gzip"), content, encoded, '"v1"')
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), content)
+        self.assertEqual(response["ETag"], '"v1-gzip"')
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+        response = precomputed_response(factory.get("/"), content, encoded, '"v1"')
+        self.assertNotIn("Content-Encoding", response)
+        self.assertEqual(response.content, content)
+        self.assertEqual(response["ETag"], '"v1"')
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+        not_modified = precomputed_response(
+            factory.get("/", HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH='"v1-gzip"'), content, encoded, '"v1"')
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertIn("Accept-Encoding", not_modified["Vary"])
@@ -0,0 +1,41 @@
+import json
+
+from django.contrib.auth.models import User
+from django.test import AsyncClient, Client
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.models import Testimonial
+
+from .base import CoreTestCase
+
+
+class ExportTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        Testimonial.objects.bulk_create(Testimonial(name=f"n{i}", text="t") for i in range(7))
+        staff = User.objects.create_user("staff", password="pass", is_staff=True)
+        self.token = str(RefreshToken.for_user(staff).access_token)
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {self.token}"}
+
+    def test_exports_are_staff_only(self):
+        self.assertEqual(Client().get("/api/testimonials/?export=json").status_code, 401)
+        member = User.objects.create_user("member", password="pass")
+        token = RefreshToken.for_user(member).access_token
+        response = Client().get("/api/testimonials/?export=json", HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response.status_code, 403)
+        # Plain reads stay public
+        self.assertEqual(Client().get("/api/testimonials/").status_code, 200)
+
+    def test_json_and_ndjson(self):
+        response = Client().get("/api/testimonials/?export=json", **self.auth)
+        self.assertEqual(len(json.loads(b"".join(response.streaming_content))), 7)
+        response = Client().get("/api/testimonials/?export=ndjson", **self.auth)
+        self.assertEqual(len(b"".join(response.streaming_content).splitlines()), 7)
+
+    async def test_asgi_exports_stream_asynchronously(self):
+        response = await AsyncClient().get(
+            "/api/testimonials/?export=ndjson", headers={"Authorization": f"Bearer {self.token}"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        lines = b"".join([chunk async for chunk in response.streaming_content]).splitlines()
+        self.assertEqual(len(lines), 7)
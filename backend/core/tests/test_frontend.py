@@ -0,0 +1,30 @@
+import io
+from unittest import mock
+
+from core import frontend
+
+from .base import CoreTestCase
+
+INDEX_HTML = (
+    b'<link rel="icon" href="/static/app/gymlogo.jpg">'
+    b'<script type="module" src="/static/app/assets/index-AbCd12_4.js"></script>'
+    b'<link rel="stylesheet" href="/static/app/assets/index-XyZ98765.css">'
+)
+
+
+class ShellTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        frontend._shell.cache_clear()
+        self.addCleanup(frontend._shell.cache_clear)
+
+    def test_vite_assets_keep_their_own_hashed_names(self):
+        storage = mock.Mock()
+        storage.open.return_value = io.BytesIO(INDEX_HTML)
+        storage.url.side_effect = lambda name: "/static/" + name.replace(".", ".0123456789ab.")
+        with mock.patch.object(frontend, "staticfiles_storage", storage):
+            html = frontend._shell()[0].decode()
+
+        self.assertIn('src="/static/app/assets/index-AbCd12_4.js"', html)
+        self.assertIn('href="/static/app/assets/index-XyZ98765.css"', html)
+        self.assertIn('href="/static/app/gymlogo.0123456789ab.jpg"', html)
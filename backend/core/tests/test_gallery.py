@@ -0,0 +1,99 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete
+from django.test import Client
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.models import ChangeEvent, GymGallery, MediaDeletion
+
+from .base import CoreTestCase
+
+
+def image_url(name):
+    return f"https://res.cloudinary.com/demo/image/upload/v1/gym_gallery/{name}.jpg"
+
+
+class GalleryTestCase(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        user = User.objects.create_user("staff", password="pass", is_staff=True)
+        self.client = Client(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+        # Warm the user snapshot so only the view's own queries are counted
+        self.client.get("/api/cloudinary-signature/")
+
+    def gallery(self, count):
+        return [GymGallery.objects.create(image=image_url(f"g{i}")).pk for i in range(count)]
+
+
+class GalleryBulkDeleteTests(GalleryTestCase):
+
+    def bulk_delete(self, ids):
+        return self.client.post("/api/gallery/bulk-delete/", {"ids": ids}, content_type="application/json")
+
+    def test_deletes_rows_and_queues_their_assets(self):
+        ids = self.gallery(3)
+        ChangeEvent.objects.all().delete()
+
+        response = self.bulk_delete([*ids, 999])
+
+        self.assertEqual(response.json()["deleted"], 3)
+        self.assertEqual(response.json()["results"][-1], {"id": 999, "status": "not_found"})
+        self.assertFalse(GymGallery.objects.exists())
+        self.assertEqual(set(MediaDeletion.objects.values_list("public_id", flat=True)),
+                         {f"gym_gallery/g{i}" for i in range(3)})
+        self.assertEqual(sorted(ChangeEvent.objects.filter(action=ChangeEvent.DELETED)
+                                .values_list("object_id", flat=True)), ids)
+
+    def test_queries_do_not_grow_with_the_batch(self):
+        # Savepoint, id select, row select for the signals, delete, outbox insert,
+        # change log insert, release
+        for count in (2, 20):
+            ids = self.gallery(count)
+            with self.assertNumQueries(7):
+                self.bulk_delete(ids)
+
+    def test_rejects_ids_that_are_not_positive_integers(self):
+        pk = self.gallery(1)[0]
+        for ids in ([True], [pk, False], [0], [-1], ["1"], [1.0], [], None):
+            with self.subTest(ids=ids):
+                self.assertEqual(self.bulk_delete(ids).status_code, 400)
+        self.assertTrue(GymGallery.objects.filter(pk=pk).exists())
+
+    def test_a_failed_delete_queues_nothing(self):
+        ids = self.gallery(2)
+        ChangeEvent.objects.all().delete()
+
+        def fail(**kwargs):
+            # Runs after the handlers that queue the outbox and change log rows
+            raise RuntimeError("signal failed")
+
+        post_delete.connect(fail, sender=GymGallery)
+        self.addCleanup(post_delete.disconnect, fail, sender=GymGallery)
+        with self.assertRaises(RuntimeError):
+            self.bulk_delete(ids)
+
+        self.assertFalse(MediaDeletion.objects.exists())
+        self.assertFalse(ChangeEvent.objects.exists())
+
+
+class GalleryUniqueAssetTests(GalleryTestCase):
+    def bulk_create(self, names):
+        return self.client.post("/api/gallery/bulk/", [{"image": image_url(name)} for name in names],
+                                content_type="application/json")
+
+    def test_bulk_create_rejects_images_already_in_the_gallery_or_the_batch(self):
+        self.gallery(1)
+
+        response = self.bulk_create(["g0", "new", "new"])
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([result["status"] for result in response.json()["results"]],
+                         ["invalid", "created", "invalid"])
+        self.assertIn("image", response.json()["results"][0]["errors"])
+        self.assertEqual(GymGallery.objects.filter(public_id="gym_gallery/new").count(), 1)
+
+    def test_single_create_of_a_shown_image_is_a_400(self):
+        self.gallery(1)
+        response = self.client.post("/api/gallery/", {"image": image_url("g0")}, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("image", response.json())
+        self.assertEqual(GymGallery.objects.count(), 1)
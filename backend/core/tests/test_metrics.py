@@ -0,0 +1,53 @@
+from asgiref.sync import iscoroutinefunction
+from django.http import HttpResponse
+from django.test import AsyncClient, Client, override_settings
+from prometheus_client import REGISTRY
+
+from core.middleware import MetricsMiddleware, ReplicaRoutingMiddleware
+from core.models import Testimonial
+
+from .base import CoreTestCase
+
+
+def requests_seen(route):
+    return REGISTRY.get_sample_value(
+        "http_requests_total", {"route": route, "method": "GET", "status": "200"}) or 0
+
+
+class MetricsEndpointTests(CoreTestCase):
+    @override_settings(METRICS_TOKEN="")
+    def test_disabled_without_a_token(self):
+        self.assertEqual(Client().get("/metrics").status_code, 404)
+
+    @override_settings(METRICS_TOKEN="scrape-secret")
+    def test_requires_the_bearer_token_even_from_loopback(self):
+        client = Client(REMOTE_ADDR="127.0.0.1")
+        self.assertEqual(client.get("/metrics").status_code, 403)
+        self.assertEqual(client.get("/metrics", HTTP_AUTHORIZATION="Bearer wrong").status_code, 403)
+        response = client.get("/metrics", HTTP_AUTHORIZATION="Bearer scrape-secret")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"http_requests_total", response.content)
+
+
+class MiddlewareModeTests(CoreTestCase):
+    def test_follows_the_mode_of_the_stack(self):
+        async def async_view(request):
+            return HttpResponse()
+
+        for middleware in (MetricsMiddleware, ReplicaRoutingMiddleware):
+            with self.subTest(middleware=middleware.__name__):
+                self.assertFalse(iscoroutinefunction(middleware(lambda request: HttpResponse())))
+                self.assertTrue(iscoroutinefunction(middleware(async_view)))
+
+    async def test_async_requests_are_measured(self):
+        await Testimonial.objects.acreate(name="n", text="t")
+        before = requests_seen("testimonials-list")
+        queries = REGISTRY.get_sample_value(
+            "http_request_db_queries_sum", {"route": "testimonials-list", "method": "GET"}) or 0
+
+        response = await AsyncClient().get("/api/testimonials/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(requests_seen("testimonials-list"), before + 1)
+        self.assertGreater(REGISTRY.get_sample_value(
+            "http_request_db_queries_sum", {"route": "testimonials-list", "method": "GET"}), queries)
@@ -0,0 +1,100 @@
+from datetime import timedelta
+
+from django.test import override_settings
+from django.utils import timezone
+
+from core.metrics import render_metrics
+from core.models import MediaDeletion
+from core.outbox import _lease, claim_due_entries, drain_media_outbox, enqueue_media_deletion, outbox_stats
+
+from .base import CoreTestCase
+
+
+class FlakyBackend:
+    """Wraps the in-memory backend; the next `failures` delete calls raise."""
+
+    def __init__(self, backend, failures=0):
+        self.backend, self.failures = backend, failures
+
+    def delete_resources(self, public_ids, resource_type="image"):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("Cloudinary unavailable")
+        return self.backend.delete_resources(public_ids, resource_type=resource_type)
+
+
+@override_settings(MEDIA_OUTBOX_RETRY_BASE=30, MEDIA_OUTBOX_MAX_ATTEMPTS=3, MEDIA_OUTBOX_LEASE=300)
+class MediaOutboxTests(CoreTestCase):
+    def upload(self, count, folder="gym_gallery"):
+        return [self.media.upload(b"x", folder=folder)["public_id"] for _ in range(count)]
+
+    def make_due(self):
+        MediaDeletion.objects.update(next_attempt_at=timezone.now())
+
+    def test_drain_deletes_in_bulk_batches(self):
+        public_ids = self.upload(150)
+        for public_id in public_ids:
+            enqueue_media_deletion(public_id)
+        enqueue_media_deletion("gym_gallery/already_gone")
+
+        stats = drain_media_outbox(self.media)
+
+        self.assertEqual(stats, {"deleted": 151, "failed": 0, "dead": 0})
+        self.assertFalse(MediaDeletion.objects.exists())
+        self.assertFalse(self.media.assets)
+        self.assertEqual([call[0] for call in self.media.calls].count("delete_resources"), 2)
+
+    def test_failures_back_off_exponentially(self):
+        enqueue_media_deletion(self.upload(1)[0])
+        backend = FlakyBackend(self.media, failures=2)
+
+        start = timezone.now()
+        with self.assertLogs("core.outbox", "WARNING"):
+            self.assertEqual(drain_media_outbox(backend)["failed"], 1)
+        entry = MediaDeletion.objects.get()
+        self.assertEqual(entry.attempts, 1)
+        self.assertIn("Cloudinary unavailable", entry.last_error)
+        self.assertAlmostEqual((entry.next_attempt_at - start).total_seconds(), 30, delta=2)
+        # Not due yet: the next pass leaves it alone
+        self.assertEqual(drain_media_outbox(backend), {"deleted": 0, "failed": 0, "dead": 0})
+
+        self.make_due()
+        start = timezone.now()
+        with self.assertLogs("core.outbox", "WARNING"):
+            drain_media_outbox(backend)
+        entry.refresh_from_db()
+        self.assertEqual(entry.attempts, 2)
+        self.assertAlmostEqual((entry.next_attempt_at - start).total_seconds(), 60, delta=2)
+
+        self.make_due()
+        self.assertEqual(drain_media_outbox(backend)["deleted"], 1)
+        self.assertFalse(self.media.assets)
+
+    def test_entries_that_use_up_their_attempts_are_reported(self):
+        enqueue_media_deletion(self.upload(1)[0])
+        backend = FlakyBackend(self.media, failures=10)
+        for _ in range(2):
+            with self.assertLogs("core.outbox", "WARNING"):
+                drain_media_outbox(backend)
+            self.make_due()
+        with self.assertLogs("core.outbox", "ERROR"):
+            self.assertEqual(drain_media_outbox(backend)["dead"], 1)
+
+        self.make_due()
+        self.assertEqual(drain_media_outbox(backend)["failed"], 0)
+        self.assertEqual(outbox_stats(), {"pending": 0, "dead": 1})
+        self.assertIn(b'media_outbox_entries{state="dead"} 1.0', render_metrics()[0])
+
+    def test_a_due_entry_is_claimed_by_one_worker_only(self):
+        enqueue_media_deletion("gym_gallery/a")
+        enqueue_media_deletion("gym_gallery/b")
+        now = timezone.now() + timedelta(seconds=1)
+        candidates = list(MediaDeletion.objects.values_list("id", flat=True))
+
+        first = _lease(candidates, now)
+        # A second worker that selected the same due rows before the first lease landed
+        second = _lease(candidates, now)
+
+        self.assertEqual(len(first), 2)
+        self.assertEqual(second, [])
+        self.assertEqual(claim_due_entries(10, now), [])
@@ -0,0 +1,22 @@
+from django.test import Client
+
+from core.models import LiveUpdates
+
+from .base import CoreTestCase
+
+
+class LiveUpdatesPaginationTests(CoreTestCase):
+    def test_editing_a_post_mid_scroll_neither_skips_nor_repeats(self):
+        updates = [LiveUpdates.objects.create(subject=f"s{i}", description="d") for i in range(5)]
+        client = Client()
+
+        page = client.get("/api/live-updates/?page_size=2").json()
+        seen = [item["id"] for item in page["results"]]
+        # An edit moves last_modified, not the creation time the pages are keyed on
+        updates[0].subject = "edited"
+        updates[0].save()
+        while page["next"]:
+            page = client.get(page["next"]).json()
+            seen += [item["id"] for item in page["results"]]
+
+        self.assertEqual(seen, [update.pk for update in reversed(updates)])
@@ -0,0 +1,103 @@
+import io
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import Client
+from PIL import ExifTags, Image, ImageFile
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core import backfill
+from core.models import ChangeEvent, GymGallery
+from core.placeholders import encode_placeholder
+
+from .base import CoreTestCase
+
+# Runs each queued fill inline, so the test database (one uncommitted transaction) sees the rows
+INLINE = SimpleNamespace(submit=lambda fn, *args: fn(*args))
+
+
+def jpeg(width, height, orientation=None):
+    exif = Image.Exif()
+    if orientation:
+        exif[ExifTags.Base.Orientation] = orientation
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 10, 10)).save(buffer, "JPEG", exif=exif)
+    buffer.seek(0)
+    return buffer
+
+
+class EncodePlaceholderTests(CoreTestCase):
+    def test_size_is_the_full_resolution(self):
+        encoded = encode_placeholder(jpeg(1600, 1200))
+        self.assertEqual((encoded["width"], encoded["height"]), (1600, 1200))
+        self.assertTrue(encoded["placeholder"].startswith("data:image/webp;base64,"))
+
+    def test_exif_rotation_swaps_the_size(self):
+        encoded = encode_placeholder(jpeg(1600, 1200, orientation=6))
+        self.assertEqual((encoded["width"], encoded["height"]), (1200, 1600))
+
+    def test_jpegs_decode_downscaled(self):
+        loaded_sizes, real_load = [], ImageFile.ImageFile.load
+
+        def load(image):
+            loaded_sizes.append(image.size)
+            return real_load(image)
+
+        with mock.patch.object(Image.Image, "draft", autospec=True, side_effect=Image.Image.draft) as draft, \
+                mock.patch.object(ImageFile.ImageFile, "load", autospec=True, side_effect=load):
+            encode_placeholder(jpeg(1600, 1200))
+        draft.assert_called_once()
+        # The first decode already runs at the draft's reduced scale
+        self.assertLess(loaded_sizes[0][0], 1600)
+
+    def test_decompression_bombs_are_skipped(self):
+        with mock.patch.object(Image, "MAX_IMAGE_PIXELS", 1000), self.assertLogs("core.placeholders", "WARNING"):
+            self.assertIsNone(encode_placeholder(jpeg(100, 100)))
+
+    def test_non_images_are_skipped(self):
+        self.assertIsNone(encode_placeholder(io.BytesIO(b"not an image")))
+
+
+@mock.patch.object(backfill, "_filler", INLINE)
+class FillAfterCommitTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        user = User.objects.create_user("staff", password="pass", is_staff=True)
+        self.client = Client(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+
+    def url(self, name):
+        return f"https://res.cloudinary.com/demo/image/upload/v1/gym_gallery/{name}.jpg"
+
+    def test_placeholder_is_filled_after_the_response(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post("/api/gallery/", {"title": "t", "image": self.url("a")},
+                                        content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        # The request itself never asked Cloudinary for the preview
+        self.assertEqual(response.json()["placeholder"], "")
+        self.assertNotIn(("image_preview", "gym_gallery/a"), self.media.calls)
+
+        for callback in callbacks:
+            callback()
+        row = GymGallery.objects.get()
+        self.assertEqual((row.width, row.height), (1600, 1200))
+        self.assertTrue(row.placeholder)
+        self.assertTrue(ChangeEvent.objects.filter(object_id=row.pk, action=ChangeEvent.UPDATED).exists())
+
+    def test_bulk_create_fills_every_row(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/api/gallery/bulk/", [{"title": str(i), "image": self.url(f"b{i}")}
+                                                                 for i in range(3)],
+                                        content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(GymGallery.objects.filter(placeholder="").exists())
+
+    def test_failed_previews_are_left_for_the_backfill(self):
+        with mock.patch("core.placeholders.get_media_backend") as backend:
+            backend.return_value.image_preview.side_effect = OSError("timeout")
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post("/api/gallery/", {"title": "t", "image": self.url("c")},
+                                            content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(GymGallery.objects.get().placeholder, "")
@@ -0,0 +1,97 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core import site_config
+from core.management.commands.benchmark_api import QUERY_BUDGETS, _image, seed, seed_media
+from core.models import (EventFiles, Events, GymGallery, LiveUpdateFiles, LiveUpdates, SearchEntry,
+                         Testimonial)
+
+from .base import CoreTestCase
+
+# Cold path (nothing cached) of the key reads, by their QUERY_BUDGETS route: the
+# same number of queries however many rows and files are listed, within budget
+READS = {
+    "/api/bootstrap/": "bootstrap",
+    "/api/events/": "events-list",
+    "/api/live-updates/": "liveupdates-list",
+    "/api/gallery/": "gym-gallery",
+    "/api/testimonials/": "testimonials-list",
+    "/api/search/?q=deadlift": "search",
+}
+
+
+class QueryCountTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.ids = seed(events=2, files=1, live_updates=2, gallery=2, testimonials=2)
+        user = User.objects.create_user("staff", password="pass", is_staff=True)
+        self.token = RefreshToken.for_user(user).access_token
+
+    def cold_get(self, path):
+        cache.clear()
+        site_config._snapshot = None
+        return Client().get(path)
+
+    def grow(self):
+        # Several times the rows, with more files each, than the first measurement
+        events = Events.objects.bulk_create(
+            Events(title=f"Deadlift {i}", highlights="h", description="d") for i in range(10))
+        EventFiles.objects.bulk_create(
+            seed_media(EventFiles, "event_photos", f"more_{event.pk}_{j}", event=event)
+            for event in events for j in range(3))
+        updates = LiveUpdates.objects.bulk_create(LiveUpdates(subject=f"Update {i}", description="d") for i in range(10))
+        LiveUpdateFiles.objects.bulk_create(
+            seed_media(LiveUpdateFiles, "live_update_files", f"more_{update.pk}_{j}", live_update=update)
+            for update in updates for j in range(3))
+        GymGallery.objects.bulk_create(seed_media(GymGallery, "gym_gallery", f"more_{i}") for i in range(10))
+        Testimonial.objects.bulk_create(Testimonial(name=f"n{i}", text="t") for i in range(10))
+        SearchEntry.objects.bulk_create(
+            SearchEntry(kind="event", object_id=event.pk, title=event.title, body="") for event in events)
+
+    def count_queries(self, request):
+        with CaptureQueriesContext(connection) as queries:
+            request()
+        return len(queries)
+
+    def assertFixedWithinBudget(self, counts, route, extra=0):
+        """`counts` are the queries of one request at growing sizes; `extra` allows for test-only savepoints."""
+        self.assertEqual(len(set(counts)), 1, f"{route} grew with rows: {counts}")
+        self.assertLessEqual(counts[0], QUERY_BUDGETS[route] + extra)
+
+    def test_reads_do_not_grow_with_rows(self):
+        counts = {path: [] for path in READS}
+        for grown in (False, True):
+            if grown:
+                self.grow()
+            for path in READS:
+                counts[path].append(self.count_queries(
+                    lambda: self.assertEqual(self.cold_get(path).status_code, 200)))
+        for path, route in READS.items():
+            with self.subTest(path=path):
+                self.assertFixedWithinBudget(counts[path], route)
+
+    def test_change_feed_does_not_grow_with_changes(self):
+        counts = []
+        for count in (2, 12):
+            Testimonial.objects.bulk_create(Testimonial(name=f"n{i}", text="t") for i in range(count))
+            for testimonial in Testimonial.objects.all():
+                testimonial.save()
+            counts.append(self.count_queries(
+                lambda: self.assertEqual(self.cold_get("/api/changes/?since=0").status_code, 200)))
+        self.assertFixedWithinBudget(counts, "changes")
+
+    def test_event_create(self):
+        client = Client(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        counts = []
+        for images in (1, 3):
+            cache.clear()
+            data = {"title": "New", "highlights": "h", "description": "d",
+                    "uploaded_images": [_image(f"p{i}.jpg") for i in range(images)]}
+            counts.append(self.count_queries(
+                lambda: self.assertEqual(client.post("/api/events/", data).status_code, 201)))
+        # Here the insert transaction is a savepoint inside the test's own: one more pair
+        self.assertFixedWithinBudget(counts, "events-list POST", extra=2)
@@ -0,0 +1,100 @@
+import io
+from datetime import timedelta
+from unittest import mock
+
+from django.test import override_settings
+from django.utils import timezone
+
+from core import reconcile
+from core.media import LIST_PAGE_SIZE
+from core.models import GymGallery, MediaDeletion, SiteInfo
+from core.reconcile import reconcile_media
+
+from .base import CoreTestCase
+
+FOLDERS = {"gym_gallery": ["image"]}
+
+
+@override_settings(MEDIA_RECONCILE_FOLDERS=FOLDERS, MEDIA_RECONCILE_GRACE=timedelta(hours=24))
+class ReconcileMediaTests(CoreTestCase):
+    def upload(self, name, age=timedelta(days=2), folder="gym_gallery"):
+        file = io.BytesIO(b"x" * 10)
+        file.name = f"{name}.jpg"
+        upload = self.media.upload(file, folder=folder)
+        self.media.assets[("image", upload["public_id"])]["created_at"] = timezone.now() - age
+        return upload["public_id"]
+
+    def remaining(self):
+        return {public_id for _, public_id in self.media.assets}
+
+    def deletes(self):
+        return [call for call in self.media.calls if call[0] == "delete_resources"]
+
+    def test_deletes_only_old_unreferenced_assets(self):
+        orphan = self.upload("orphan")
+        recent = self.upload("recent", age=timedelta(hours=1))
+        saved = self.upload("saved")
+        GymGallery.objects.create(image=f"https://res.cloudinary.com/demo/image/upload/v1/{saved}.jpg")
+
+        stats = reconcile_media(self.media)
+
+        self.assertEqual(
+            {key: stats[key] for key in ("scanned", "referenced", "recent", "orphans", "deleted")},
+            {"scanned": 3, "referenced": 1, "recent": 1, "orphans": 1, "deleted": 1},
+        )
+        self.assertEqual(self.remaining(), {recent, saved})
+        self.assertNotIn(orphan, self.remaining())
+
+    def test_grace_period_is_configurable(self):
+        self.upload("hour_old", age=timedelta(hours=1))
+        self.assertEqual(reconcile_media(self.media)["deleted"], 0)
+        self.assertEqual(reconcile_media(self.media, grace=timedelta(minutes=30))["deleted"], 1)
+
+    def test_dry_run_deletes_nothing(self):
+        orphans = {self.upload(f"orphan_{i}") for i in range(3)}
+        found = []
+
+        stats = reconcile_media(self.media, dry_run=True, report=found.append)
+
+        self.assertEqual((stats["orphans"], stats["orphan_bytes"], stats["deleted"]), (3, 30, 0))
+        self.assertEqual({resource["public_id"] for resource in found}, orphans)
+        self.assertEqual(self.remaining(), orphans)
+        self.assertEqual(self.deletes(), [])
+
+    def test_pages_through_large_folders(self):
+        for i in range(LIST_PAGE_SIZE + 150):
+            self.upload(f"bulk_{i:04d}")
+
+        stats = reconcile_media(self.media)
+
+        self.assertEqual((stats["scanned"], stats["deleted"]), (LIST_PAGE_SIZE + 150, LIST_PAGE_SIZE + 150))
+        self.assertEqual(self.remaining(), set())
+        self.assertEqual(sum(1 for call in self.media.calls if call[0] == "list_resources"), 2)
+        self.assertEqual(len(self.deletes()), 7)
+
+    def test_keeps_assets_queued_in_the_outbox_and_site_background(self):
+        queued = self.upload("queued")
+        MediaDeletion.objects.create(public_id=queued)
+        background = self.upload("hero", folder="site_info_media")
+        SiteInfo.objects.create(main_bg_image=background, membershi_plan={}, phone1=1, gym_address="a")
+
+        stats = reconcile_media(self.media, folders={"gym_gallery": ["image"], "site_info_media": ["image"]})
+
+        self.assertEqual((stats["referenced"], stats["deleted"]), (2, 0))
+        self.assertEqual(self.remaining(), {queued, background})
+
+    def test_rechecks_the_database_before_deleting(self):
+        late = self.upload("late")
+        known_assets = reconcile.known_assets
+
+        def then_saved():
+            # The index is built, then a row for the asset commits before the delete
+            known = known_assets()
+            GymGallery.objects.create(image=f"https://res.cloudinary.com/demo/image/upload/v1/{late}.jpg")
+            return known
+
+        with mock.patch.object(reconcile, "known_assets", then_saved):
+            stats = reconcile_media(self.media)
+
+        self.assertEqual((stats["orphans"], stats["deleted"]), (1, 0))
+        self.assertEqual(self.remaining(), {late})
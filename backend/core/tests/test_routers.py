@@ -0,0 +1,80 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connections, transaction
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.models import Testimonial
+from core.routers import REPLICA_DB_ALIAS, PrimaryReplicaRouter, replica_reads
+
+from .base import CoreTransactionTestCase
+
+
+class PrimaryReplicaRouterTests(CoreTransactionTestCase):
+    def setUp(self):
+        super().setUp()
+        Testimonial.objects.create(name="n", text="t")
+        user = User.objects.create_user("staff", password="pass", is_staff=True)
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {RefreshToken.for_user(user).access_token}"}
+
+    def get(self, client, path):
+        """(primary queries, replica queries) of one GET."""
+        with CaptureQueriesContext(connections["default"]) as primary, \
+                CaptureQueriesContext(connections[REPLICA_DB_ALIAS]) as replica:
+            self.assertEqual(client.get(path).status_code, 200)
+        return len(primary), len(replica)
+
+    def test_router_follows_the_context(self):
+        router = PrimaryReplicaRouter()
+        self.assertEqual(router.db_for_read(Testimonial), "default")
+        with replica_reads():
+            self.assertEqual(router.db_for_read(Testimonial), REPLICA_DB_ALIAS)
+            with transaction.atomic():
+                # An open transaction reads its own writes
+                self.assertEqual(router.db_for_read(Testimonial), "default")
+            with replica_reads(False):
+                self.assertEqual(router.db_for_read(Testimonial), "default")
+        self.assertEqual(router.db_for_write(Testimonial), "default")
+
+    def test_safe_requests_read_from_the_replica(self):
+        primary, replica = self.get(Client(), "/api/testimonials/")
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+        # The mirror sees committed rows
+        with replica_reads():
+            self.assertEqual(list(Testimonial.objects.values_list("name", flat=True)), ["n"])
+
+    def test_reads_after_a_write_stick_to_the_primary(self):
+        client = Client(**self.auth)
+        response = client.post("/api/testimonials/", {"name": "new", "text": "t"}, content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        self.assertIn(settings.REPLICA_STICKY_COOKIE, response.cookies)
+
+        primary, replica = self.get(client, "/api/testimonials/")
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+        # Other clients keep reading from the replica
+        self.assertEqual(self.get(Client(), "/api/testimonials/")[0], 0)
+
+    def test_failed_writes_do_not_pin_reads(self):
+        client = Client(**self.auth)
+        response = client.post("/api/testimonials/", {}, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn(settings.REPLICA_STICKY_COOKIE, response.cookies)
+
+    def test_async_requests_route_the_same_way(self):
+        client = AsyncClient()
+        with CaptureQueriesContext(connections["default"]) as primary, \
+                CaptureQueriesContext(connections[REPLICA_DB_ALIAS]) as replica:
+            self.assertEqual(async_to_sync(client.get)("/api/testimonials/").status_code, 200)
+        self.assertEqual(len(primary), 0)
+        self.assertGreater(len(replica), 0)
+
+        response = async_to_sync(client.post)(
+            "/api/testimonials/", {"name": "new", "text": "t"}, content_type="application/json",
+            headers={"Authorization": self.auth["HTTP_AUTHORIZATION"]})
+        self.assertEqual(response.status_code, 201)
+        self.assertIn(settings.REPLICA_STICKY_COOKIE, response.cookies)
@@ -0,0 +1,97 @@
+from unittest import mock, skipUnless
+
+from django.db import connection
+
+from core.models import Events, LiveUpdates, SearchEntry, Testimonial
+from core.search import search
+
+from .base import CoreTestCase
+
+
+def ids(hits):
+    return [(kind, object_id) for kind, object_id, *_ in hits]
+
+
+class SearchTests(CoreTestCase):
+    def event(self, title, description="d"):
+        return Events.objects.create(title=title, highlights="h", description=description)
+
+    def test_title_matches_rank_above_body_matches(self):
+        # Created first, so a plain newest-first order would put it last
+        in_title = self.event("Deadlift clinic")
+        in_body = self.event("Open day", "Bring a belt for the deadlift station, deadlift all day.")
+        self.assertEqual(ids(search("deadlift")), [("event", in_title.pk), ("event", in_body.pk)])
+
+    def test_every_term_must_match_and_terms_are_prefixes(self):
+        both = self.event("Squat and deadlift night")
+        self.event("Squat night")
+        self.assertEqual(ids(search("squ dead")), [("event", both.pk)])
+
+    def test_kinds_filter(self):
+        self.event("Deadlift clinic")
+        update = LiveUpdates.objects.create(subject="Deadlift record", description="d")
+        Testimonial.objects.create(name="Sam", text="Deadlift coaching was great")
+        self.assertEqual(ids(search("deadlift", kinds=["live_update"])), [("live_update", update.pk)])
+        self.assertEqual(search("deadlift", kinds=["unknown"]), [])
+
+    def test_query_syntax_is_searched_as_plain_words(self):
+        event = self.event("Deadlift clinic")
+        for query in ('"deadlift', "deadlift*", "-deadlift", "(deadlift)", "deadlift:"):
+            with self.subTest(query=query):
+                self.assertEqual(ids(search(query)), [("event", event.pk)])
+        # Operators are just more words every hit must contain
+        for query in ('deadlift" OR "x', "deadlift NEAR(", "title:deadlift"):
+            with self.subTest(query=query):
+                self.assertEqual(search(query), [])
+        self.assertEqual(search("*"), [])
+
+    def test_saving_and_deleting_rows_keeps_the_index_current(self):
+        event = self.event("Deadlift clinic")
+        event.title = "Bench clinic"
+        event.save()
+        self.assertEqual(search("deadlift"), [])
+        self.assertEqual(ids(search("bench")), [("event", event.pk)])
+
+        event.delete()
+        self.assertEqual(search("bench"), [])
+        self.assertFalse(SearchEntry.objects.exists())
+
+    @skipUnless(connection.vendor == "sqlite", "FTS5 triggers are SQLite only")
+    def test_fts_triggers_follow_entry_updates_and_deletes(self):
+        entry = SearchEntry.objects.create(kind="event", object_id=1, title="Deadlift clinic", body="")
+        # Queryset update/delete bypass the model signals: only the triggers keep the FTS table in step
+        SearchEntry.objects.filter(pk=entry.pk).update(title="Bench clinic")
+        self.assertEqual(search("deadlift"), [])
+        self.assertEqual(ids(search("bench")), [("event", 1)])
+
+        SearchEntry.objects.filter(pk=entry.pk).delete()
+        self.assertEqual(search("bench"), [])
+        with connection.cursor() as cursor:
+            # An external-content table answers from core_searchentry, so check the index itself
+            cursor.execute("SELECT count(*) FROM core_searchentry_fts WHERE core_searchentry_fts MATCH 'bench'")
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+    def test_like_fallback_on_other_databases(self):
+        older = self.event("Deadlift clinic", "Squat too")
+        newer = self.event("Deadlift night", "Squat and bench")
+        self.event("Bench only")
+
+        with mock.patch.object(connection, "vendor", "mysql"):
+            hits = search("DEADLIFT squat")
+
+        # Unranked: every term anywhere, case-insensitive, newest first
+        self.assertEqual(ids(hits), [("event", newer.pk), ("event", older.pk)])
+        self.assertEqual({score for *_, score in hits}, {0.0})
+
+    def test_postgres_query_is_a_prefix_tsquery(self):
+        # No PostgreSQL here: check what reaches the driver. The ranking tests above
+        # are backend-neutral and cover the generated tsvector column under PostgreSQL.
+        with mock.patch.object(connection, "vendor", "postgresql"), \
+                mock.patch.object(connection, "cursor") as cursor:
+            cursor.return_value.__enter__.return_value.fetchall.return_value = [("event", 1, "t", "s", 0.5)]
+            hits = search("Squat dead-lift", kinds=["event"], limit=5, offset=10)
+
+        sql, params = cursor.return_value.__enter__.return_value.execute.call_args.args
+        self.assertIn("ts_rank(search_vector, q)", sql)
+        self.assertEqual(params, ["squat:* & dead:* & lift:*", "event", 5, 10])
+        self.assertEqual(hits, [("event", 1, "t", "s", 0.5)])
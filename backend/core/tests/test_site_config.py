@@ -0,0 +1,59 @@
+from django.contrib.auth.models import User
+from django.test import Client
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core import site_config
+from core.models import SiteInfo
+from core.site_config import get_site_snapshot
+
+from .base import CoreTestCase
+
+
+class SiteSnapshotTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        site_config._snapshot = None
+        self.addCleanup(setattr, site_config, "_snapshot", None)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.info = SiteInfo.objects.create(
+                main_bg_image="site_info_media/bg.jpg", membershi_plan=[{"name": "Monthly", "price": 1000}],
+                phone1=9000000000, gym_address="Main road",
+            )
+
+    def test_reused_until_site_info_changes(self):
+        snapshot = get_site_snapshot()
+        with self.assertNumQueries(0):
+            self.assertIs(get_site_snapshot(), snapshot)
+
+    def test_editing_site_info_reloads_it(self):
+        etag = Client().get("/api/edit/")["ETag"]
+        self.assertEqual(get_site_snapshot().data["gym_address"], "Main road")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.info.gym_address = "Station road"
+            self.info.save()
+
+        self.assertEqual(get_site_snapshot().data["gym_address"], "Station road")
+        response = Client().get("/api/edit/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["gym_address"], "Station road")
+        self.assertEqual(Client().get(f"/api/site_info/{self.info.pk}/").json()["gym_address"], "Station road")
+
+    def test_edits_through_the_api_reload_it(self):
+        user = User.objects.create_user("staff", password="pass", is_staff=True)
+        client = Client(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+        self.assertEqual(client.get("/api/edit/").json()["phone1"], 9000000000)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.put("/api/edit/", {"phone1": 9111111111}, content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(client.get("/api/edit/").json()["phone1"], 9111111111)
+        self.assertEqual(Client().get("/api/site_info/").json()[0]["phone1"], 9111111111)
+
+    def test_deleting_site_info_reloads_it(self):
+        get_site_snapshot()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.info.delete()
+        self.assertEqual(dict(get_site_snapshot().rows), {})
+        self.assertEqual(Client().get(f"/api/site_info/{self.info.pk}/").status_code, 404)
@@ -0,0 +1,114 @@
+import asyncio
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.test import AsyncClient, Client, override_settings
+
+from core import stream
+from core.models import ChangeEvent, LiveUpdates
+from core.stream import RESET_MESSAGE, Broadcaster
+
+from .base import CoreTestCase
+
+
+def create_update(subject):
+    LiveUpdates.objects.create(subject=subject, description="d")
+    return ChangeEvent.objects.latest("id").id
+
+
+def event_id(message):
+    return int(message.split("\n", 1)[0].removeprefix("id: "))
+
+
+@override_settings(SSE_POLL_INTERVAL=0.01, SSE_HEARTBEAT=5)
+class StreamTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.broadcaster = Broadcaster()
+        patcher = mock.patch.object(stream, "broadcaster", self.broadcaster)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def stop(self):
+        # The poll task belongs to this test's event loop
+        self.broadcaster.subscribers.clear()
+        if self.broadcaster._task is not None:
+            self.broadcaster._task.cancel()
+            await asyncio.gather(self.broadcaster._task, return_exceptions=True)
+
+    async def next_message(self, subscriber):
+        return await asyncio.wait_for(subscriber.queue.get(), 2)
+
+    def test_wsgi_requests_get_503(self):
+        self.assertEqual(Client().get("/api/stream/").status_code, 503)
+
+    async def test_one_rendered_message_fans_out_to_every_subscriber(self):
+        first, _ = await self.broadcaster.subscribe()
+        second, _ = await self.broadcaster.subscribe()
+        try:
+            change_id = await sync_to_async(create_update)("a")
+            message = await self.next_message(first)
+            self.assertIs(await self.next_message(second), message)
+            self.assertEqual(event_id(message), change_id)
+            self.assertIn('"action": "created"', message)
+        finally:
+            await self.stop()
+
+    async def test_resume_from_the_buffer(self):
+        subscriber, _ = await self.broadcaster.subscribe()
+        try:
+            first = await sync_to_async(create_update)("a")
+            second = await sync_to_async(create_update)("b")
+            await self.next_message(subscriber)
+            await self.next_message(subscriber)
+
+            _, backlog = await self.broadcaster.subscribe(last_event_id=first)
+            self.assertEqual([event_id(message) for message in backlog], [second])
+        finally:
+            await self.stop()
+
+    async def test_resume_replays_from_the_log(self):
+        # Changes made while this worker had nobody subscribed are not in its buffer
+        first = await sync_to_async(create_update)("a")
+        second = await sync_to_async(create_update)("b")
+        try:
+            _, backlog = await self.broadcaster.subscribe(last_event_id=first)
+            self.assertEqual([event_id(message) for message in backlog], [second])
+        finally:
+            await self.stop()
+
+    async def test_resume_from_before_the_pruned_log_resets(self):
+        first = await sync_to_async(create_update)("a")
+        await sync_to_async(create_update)("b")
+        await sync_to_async(create_update)("c")
+        await sync_to_async(ChangeEvent.objects.filter(id__lt=first + 2).delete)()
+        try:
+            _, backlog = await self.broadcaster.subscribe(last_event_id=first)
+            self.assertEqual(backlog, [RESET_MESSAGE])
+        finally:
+            await self.stop()
+
+    @override_settings(SSE_REPLAY_MAX=1)
+    async def test_resume_too_far_back_resets(self):
+        first = await sync_to_async(create_update)("a")
+        for subject in "bc":
+            await sync_to_async(create_update)(subject)
+        try:
+            _, backlog = await self.broadcaster.subscribe(last_event_id=first)
+            self.assertEqual(backlog, [RESET_MESSAGE])
+        finally:
+            await self.stop()
+
+    async def test_asgi_stream_honours_last_event_id(self):
+        first = await sync_to_async(create_update)("a")
+        second = await sync_to_async(create_update)("b")
+        response = await AsyncClient().get("/api/stream/", headers={"Last-Event-ID": str(first)})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        chunks = aiter(response.streaming_content)
+        try:
+            self.assertTrue((await anext(chunks)).startswith(b"retry: "))
+            self.assertEqual(event_id((await anext(chunks)).decode()), second)
+        finally:
+            await chunks.aclose()
+            await self.stop()
@@ -0,0 +1,74 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from core.tokens import prune_expired_tokens, token_table_stats
+
+from .base import CoreTestCase
+
+EXPIRES_AT_INDEX = "token_blacklist_outstandingtoken_expires_at_idx"
+
+
+class PruneTokensTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user("member", password="pass")
+
+    def tokens(self, count, expires_in, blacklist=False):
+        now = timezone.now()
+        tokens = OutstandingToken.objects.bulk_create(
+            OutstandingToken(user=self.user, jti=f"{expires_in.total_seconds()}-{i}", token="t",
+                             created_at=now, expires_at=now + expires_in)
+            for i in range(count))
+        if blacklist:
+            BlacklistedToken.objects.bulk_create(BlacklistedToken(token=token) for token in tokens)
+        return tokens
+
+    def test_deletes_expired_tokens_and_their_blacklist_rows_in_chunks(self):
+        self.tokens(5, timedelta(hours=-1), blacklist=True)
+        self.tokens(2, timedelta(hours=-2))
+        live = self.tokens(3, timedelta(hours=1), blacklist=True)
+
+        stats = prune_expired_tokens(chunk_size=3)
+
+        self.assertEqual((stats["outstanding"], stats["blacklisted"], stats["chunks"]), (7, 5, 3))
+        self.assertEqual(set(OutstandingToken.objects.values_list("pk", flat=True)), {token.pk for token in live})
+        # Blacklisted live tokens stay blacklisted
+        self.assertEqual(BlacklistedToken.objects.count(), 3)
+
+    def test_each_chunk_is_its_own_transaction(self):
+        self.tokens(4, timedelta(hours=-1), blacklist=True)
+        # Per chunk: select ids, savepoint, the collector's row select, delete the blacklist
+        # rows then the tokens, release
+        with self.assertNumQueries(6 * 2 + 1):
+            stats = prune_expired_tokens(chunk_size=2)
+        # A full last chunk needs one more (empty) select to know it was the last
+        self.assertEqual(stats["chunks"], 2)
+
+    def test_max_chunks_bounds_one_run(self):
+        self.tokens(5, timedelta(hours=-1))
+        self.assertEqual(prune_expired_tokens(chunk_size=2, max_chunks=2)["outstanding"], 4)
+        self.assertEqual(token_table_stats()["expired"], 1)
+
+    def test_command_reports_before_and_after(self):
+        self.tokens(2, timedelta(hours=-1), blacklist=True)
+        self.tokens(1, timedelta(hours=1))
+        out = StringIO()
+        call_command("prune_tokens", "--chunk-size", "1", stdout=out)
+        self.assertIn("outstanding=3 blacklisted=2 expired=2", out.getvalue())
+        self.assertIn("pruned outstanding=2 blacklisted=2 in 2 chunks", out.getvalue())
+        self.assertIn("outstanding=1 blacklisted=0", out.getvalue())
+
+    def test_expires_at_index_backs_the_prune_scan(self):
+        with connection.cursor() as cursor:
+            indexes = connection.introspection.get_constraints(cursor, OutstandingToken._meta.db_table)
+        self.assertEqual(indexes[EXPIRES_AT_INDEX]["columns"], ["expires_at"])
+        if connection.vendor == "sqlite":
+            query = OutstandingToken.objects.filter(expires_at__lte=timezone.now()).order_by("expires_at")
+            plan = query.values_list("id", flat=True)[:10].explain()
+            self.assertIn(EXPIRES_AT_INDEX, plan)
@@ -0,0 +1,117 @@
+from unittest import mock
+
+import cloudinary
+import cloudinary.utils
+from django.contrib.auth.models import User
+from django.test import Client, override_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.management.commands.benchmark_api import _image
+from core.models import EventFiles, Events, MediaDeletion
+
+from .base import CoreTestCase
+
+
+def signed(public_id, version=1):
+    """A signed upload response, as the browser gets it back from Cloudinary."""
+    signature = cloudinary.utils.api_sign_request(
+        {"public_id": public_id, "version": version}, cloudinary.config().api_secret, signature_version=1)
+    return {"public_id": public_id, "version": version, "signature": signature, "format": "jpg"}
+
+
+class AttachUploadedAssetsTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        user = User.objects.create_user("staff", password="pass", is_staff=True)
+        self.client = Client(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+
+    def post_event(self, *assets):
+        return self.client.post("/api/events/", {"title": "t", "highlights": "h", "description": "d",
+                                                 "uploaded_assets": list(assets)},
+                                content_type="application/json")
+
+    def test_attaches_direct_uploads(self):
+        response = self.post_event(signed("event_photos/a"), signed("event_photos/b"))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(set(EventFiles.objects.values_list("public_id", flat=True)),
+                         {"event_photos/a", "event_photos/b"})
+
+    def test_rejects_an_upload_already_attached(self):
+        self.assertEqual(self.post_event(signed("event_photos/a")).status_code, 201)
+        response = self.post_event(signed("event_photos/a"))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Events.objects.count(), 1)
+
+    def test_concurrent_attach_hits_the_constraint(self):
+        self.assertEqual(self.post_event(signed("event_photos/a")).status_code, 201)
+        # As if another request attached it between this one's check and its insert
+        with mock.patch("core.serializers.unattached_assets", side_effect=lambda model, assets: assets):
+            response = self.post_event(signed("event_photos/a"))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Already attached", response.json()["uploaded_assets"])
+        self.assertEqual(Events.objects.count(), 1)
+        self.assertEqual(EventFiles.objects.count(), 1)
+
+
+class WriteErrorTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        user = User.objects.create_user("staff", password="pass", is_staff=True)
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {RefreshToken.for_user(user).access_token}"}
+
+    def post_event(self, client, *names):
+        return client.post("/api/events/", {"title": "t", "highlights": "h", "description": "d",
+                                            "uploaded_images": [_image(name) for name in names]})
+
+    def test_a_failed_upload_is_a_502_and_compensates_the_others(self):
+        upload = self.media.upload
+
+        def flaky_upload(file, **options):
+            if file.name == "bad.jpg":
+                raise ConnectionError("Cloudinary unavailable")
+            return upload(file, **options)
+
+        with mock.patch.object(self.media, "upload", side_effect=flaky_upload), \
+                self.assertLogs("core.uploads", "ERROR"):
+            response = self.post_event(Client(**self.auth), "good.jpg", "bad.jpg")
+
+        self.assertEqual(response.status_code, 502)
+        self.assertNotIn("Cloudinary", response.json()["detail"])
+        self.assertFalse(Events.objects.exists())
+        self.assertEqual([public_id.split("/")[-1].split("_")[0]
+                          for public_id in MediaDeletion.objects.values_list("public_id", flat=True)], ["good"])
+
+    def test_server_errors_are_500s_not_400s(self):
+        client = Client(raise_request_exception=False, **self.auth)
+        with self.assertLogs("django.request", "ERROR"):
+            with mock.patch("core.views.EventsViewSet.perform_create", side_effect=RuntimeError("bug")):
+                self.assertEqual(self.post_event(client, "a.jpg").status_code, 500)
+            with mock.patch("core.views.LiveUpdatesViewSet.perform_create", side_effect=RuntimeError("bug")):
+                response = client.post("/api/live-updates/", {"subject": "s", "description": "d"})
+        self.assertEqual(response.status_code, 500)
+
+
+@override_settings(UPLOAD_SIGNATURE_BATCH_MAX=3)
+class SignatureBatchTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        user = User.objects.create_user("staff", password="pass", is_staff=True)
+        self.client = Client(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+
+    def sign(self, count, folder="event_photos"):
+        return self.client.post("/api/cloudinary-signature/batch/", {"count": count, "folder": folder},
+                                content_type="application/json")
+
+    def test_reports_the_batch_limit(self):
+        response = self.sign(2)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["max_batch"], 3)
+        self.assertEqual([signed["folder"] for signed in response.json()["signatures"]], ["event_photos"] * 2)
+
+    def test_too_many_reports_the_limit_to_split_by(self):
+        response = self.sign(4)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["max_batch"], 3)
+
+    def test_unknown_folders_are_refused(self):
+        self.assertEqual(self.sign(1, folder="elsewhere").status_code, 400)
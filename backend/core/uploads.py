@@ -0,0 +1,112 @@
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from cloudinary import CloudinaryResource
+from django.conf import settings
+from django.db import transaction
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .media import get_media_backend
+from .outbox import enqueue_media_deletion
+from .placeholders import encode_placeholder
+
+logger = logging.getLogger(__name__)
+
+
+class UploadFailed(APIException):
+    """The media host rejected or dropped an upload: the request was fine, so not a 400."""
+    status_code = status.HTTP_502_BAD_GATEWAY
+    default_detail = "A file could not be uploaded; try again."
+    default_code = "upload_failed"
+
+
+def _upload_one(backend, file, field):
+    # Same options CloudinaryField.pre_save would use for this field
+    options = {"type": field.type, "resource_type": field.resource_type, **field.options}
+    # Placeholder and intrinsic size from the local bytes; None for PDFs and other files
+    preview = encode_placeholder(file) if field.resource_type in ("image", "auto") else None
+    if hasattr(file, "seekable") and file.seekable():
+        file.seek(0)
+    result = backend.upload(file, **options)
+    return {**result, **preview} if preview else result
+
+
+def upload_files(files, field):
+    """
+    Upload `files` for the CloudinaryField `field` concurrently in a bounded
+    thread pool, before any database transaction is opened.
+    Returns the upload responses in input order. If any upload fails, the ones
+    that succeeded are compensated and UploadFailed is raised.
+    """
+    if not files:
+        return []
+    backend = get_media_backend()
+    workers = min(settings.MEDIA_UPLOAD_WORKERS, len(files))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # Each task runs in a copy of the request context so its timings are attributed to the request
+        futures = [
+            pool.submit(contextvars.copy_context().run, _upload_one, backend, file, field) for file in files
+        ]
+
+    uploads, error = [], None
+    for future in futures:
+        try:
+            uploads.append(future.result())
+        except Exception as e:
+            error = error or e
+    if error is not None:
+        compensate_uploads(uploads)
+        logger.error("Upload failed", exc_info=error)
+        raise UploadFailed() from error
+    return uploads
+
+
+def as_resource(upload):
+    """Turn an upload response into the value stored in a CloudinaryField."""
+    return CloudinaryResource(metadata=upload, type=upload.get("type"), resource_type=upload.get("resource_type"))
+
+
+def media_row(model, upload, **fields):
+    """
+    Build an unsaved MediaAsset row for an upload response, with its media
+    columns filled in (bulk_create skips save(), so they are set here).
+    """
+    row = model(**fields, **{model.media_field: as_resource(upload)})
+    row.sync_media_columns()
+    if upload.get("secure_url"):
+        row.url = upload["secure_url"]
+    if upload.get("placeholder"):
+        row.width, row.height, row.placeholder = upload["width"], upload["height"], upload["placeholder"]
+    return row
+
+
+def compensate_uploads(uploads):
+    """Queue already-uploaded assets for deletion after the rows that referenced them failed to save."""
+    if not uploads:
+        return
+    try:
+        with transaction.atomic():
+            for upload in uploads:
+                enqueue_media_deletion(upload["public_id"], upload.get("resource_type"))
+    except Exception:
+        # The database itself is failing: fall back to deleting right away
+        logger.exception("Could not queue %d uploads for deletion, destroying directly", len(uploads))
+        backend = get_media_backend()
+        for upload in uploads:
+            try:
+                backend.delete_resources([upload["public_id"]], resource_type=upload.get("resource_type") or "image")
+            except Exception:
+                logger.exception("Orphaned upload %s", upload["public_id"])
+
+
+@contextmanager
+def compensating(uploads):
+    """Compensate `uploads` if the block that stores them raises."""
+    try:
+        yield
+    except Exception:
+        compensate_uploads(uploads)
+        raise
@@ -1,9 +1,10 @@
 from django.urls import path
 from rest_framework.routers import DefaultRouter
-from .views import SiteInfoViewSet, TestimonialViewSet, edit_site_info
+from .views import SiteInfoViewSet, TestimonialViewSet, edit_site_info, bootstrap, stream
 from .views import (GymGalleryListCreateView, GymGalleryDeleteView,
-                    CloudinarySignatureView, LogoutView, LiveUpdatesViewSet,
-                    EventsViewSet)
+                    GymGalleryBulkCreateView, GymGalleryBulkDeleteView,
+                    CloudinarySignatureView, CloudinarySignatureBatchView, LogoutView, LiveUpdatesViewSet,
+                    EventsViewSet, SearchView, ChangesView)
 # 1. Register ViewSets with the Router
 router = DefaultRouter()
 router.register(r"site_info", SiteInfoViewSet, basename="site_info")
@@ -15,10 +16,17 @@ router.register(r'events', EventsViewSet, basename='events')
 urlpatterns = [
     # Function-based views must be added here, not in the router
     path('edit/', edit_site_info, name='edit_site_info'),
+    path('bootstrap/', bootstrap, name='bootstrap'),
     path("gallery/", GymGalleryListCreateView.as_view(), name="gym-gallery"),
     path("gallery/<int:pk>/", GymGalleryDeleteView.as_view(), name="gym-gallery-delete"),
+    path("gallery/bulk/", GymGalleryBulkCreateView.as_view(), name="gym-gallery-bulk"),
+    path("gallery/bulk-delete/", GymGalleryBulkDeleteView.as_view(), name="gym-gallery-bulk-delete"),
     path('cloudinary-signature/', CloudinarySignatureView.as_view(), name='cloudinary-signature'),
+    path('cloudinary-signature/batch/', CloudinarySignatureBatchView.as_view(), name='cloudinary-signature-batch'),
     path('logout/', LogoutView.as_view(), name='auth_logout'),
+    path('search/', SearchView.as_view(), name='search'),
+    path('stream/', stream, name='stream'),
+    path('changes/', ChangesView.as_view(), name='changes'),
 ]
 
 # 3. Append router URLs to urlpatterns
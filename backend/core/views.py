@@ -1,7 +1,8 @@
-from django.http import HttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from rest_framework import viewsets, permissions, generics
 from .models import (SiteInfo, Testimonial, GymGallery, 
-                     LiveUpdates, LiveUpdateFiles, Events)
+                     LiveUpdates, LiveUpdateFiles, Events, EventFiles, ChangeEvent)
 from .serializers import (SiteInfoSerializer, TestimonialSerializer, GymGallerySerializer, 
                           LiveUpdatesSerializer, EventsSerializer)
 from rest_framework.response import Response
@@ -11,19 +12,49 @@ from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 import cloudinary.utils
 from rest_framework.views import APIView
 from django.conf import settings
+import hmac
+import re
 import time
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework import status
-from django.db import transaction
+from django.db import IntegrityError, transaction
+from .pagination import KeysetPagination
+from .caching import CachedReadMixin, cached_response, bump_model_version_on_commit, precomputed_response
+from .export import StreamingExportMixin
+from .site_config import get_site_snapshot
+from .search import search
+from .metrics import render_metrics
+from .backfill import fill_placeholders_later
+from .outbox import batched_media_deletions
+from .stream import stream_messages
+from .changes import (collapse_changes, fetch_changes, is_replayable, latest_change_id,
+                      batched_changes, record_changes, serialize_changes)
 
 
 class SiteInfoViewSet(viewsets.ModelViewSet):
     queryset = SiteInfo.objects.all()
     serializer_class = SiteInfoSerializer
 
-class TestimonialViewSet(viewsets.ModelViewSet):
-    queryset = Testimonial.objects.all().order_by("-created")
+    # Reads come from the process-local snapshot: no query per request
+    def list(self, request, *args, **kwargs):
+        site = get_site_snapshot()
+        if request.accepted_renderer.format == 'json':
+            return precomputed_response(request, site.list_content, site.list_encoded, site.etag)
+        return Response(list(site.rows.values()))
+
+    def retrieve(self, request, *args, **kwargs):
+        pk = kwargs[self.lookup_url_kwarg or self.lookup_field]
+        row = get_site_snapshot().rows.get(int(pk)) if str(pk).isdigit() else None
+        if row is None:
+            raise Http404
+        return Response(row)
+
+class TestimonialViewSet(StreamingExportMixin, CachedReadMixin, viewsets.ModelViewSet):
+    queryset = Testimonial.objects.all().order_by("-created", "-id")
     serializer_class = TestimonialSerializer
+    cache_models = (Testimonial,)
+    pagination_class = KeysetPagination
+    cursor_ordering = ("-created", "-id")
     # allow unauthenticated read, only admin can create/update/delete
     def get_permissions(self):
         if self.request.method in permissions.SAFE_METHODS:
@@ -33,14 +64,14 @@ class TestimonialViewSet(viewsets.ModelViewSet):
 @api_view(['GET', 'PUT'])
 @permission_classes([IsAuthenticatedOrReadOnly])
 def edit_site_info(request):
-    info = SiteInfo.objects.first() 
-    
     if request.method == 'GET':
-        # FIX: Pass context={'request': request} here
-        serializer = SiteInfoSerializer(info, context={'request': request})
-        return Response(serializer.data)
+        site = get_site_snapshot()
+        if request.accepted_renderer.format == 'json':
+            return precomputed_response(request, site.content, site.encoded, site.etag)
+        return Response(site.data)
 
     elif request.method == 'PUT':
+        info = SiteInfo.objects.first()
         # FIX: Pass context={'request': request} here as well
         serializer = SiteInfoSerializer(info, data=request.data, partial=True, context={'request': request})
         if serializer.is_valid():
@@ -49,11 +80,19 @@ def edit_site_info(request):
         return Response(serializer.errors, status=400)
     
 
-class GymGalleryListCreateView(generics.ListCreateAPIView):
+class GymGalleryListCreateView(StreamingExportMixin, CachedReadMixin, generics.ListCreateAPIView):
     queryset = GymGallery.objects.all().order_by("-id")
     serializer_class = GymGallerySerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     parser_classes = [MultiPartParser, FormParser, JSONParser]
+    pagination_class = KeysetPagination
+    cursor_ordering = ("-id",)
+    cache_models = (GymGallery,)
+
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        # The browser uploaded the file, so the placeholder comes from Cloudinary, after the response
+        fill_placeholders_later(GymGallery, pk=serializer.instance.pk)
 
 # ADD THIS NEW VIEW for individual item actions (PUT/PATCH/DELETE)
 class GymGalleryDeleteView(generics.RetrieveUpdateDestroyAPIView):
@@ -62,67 +101,198 @@ class GymGalleryDeleteView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     parser_classes = [MultiPartParser, FormParser, JSONParser]
 
-    def perform_destroy(self, instance):
-        # 1. Get the image URL from the instance
-        image_url = str(instance.image) if instance.image else None
-        
-        if image_url and 'res.cloudinary.com' in image_url:
-            try:
-                # 2. Extract Public ID
-                # Handles doubled URLs by splitting at /upload/ and taking the right side
-                parts = image_url.split('upload/')
-                if len(parts) > 1:
-                    # Remove the version (e.g., v1770798421/) and file extension
-                    path_after_upload = parts[-1] 
-                    path_parts = path_after_upload.split('/')
-                    
-                    # If it starts with 'v' and numbers, skip the version part
-                    if path_parts[0].startswith('v') and path_parts[0][1:].isdigit():
-                        public_id_with_ext = "/".join(path_parts[1:])
-                    else:
-                        public_id_with_ext = "/".join(path_parts)
-                    
-                    # Remove the extension (.png, .jpg)
-                    public_id = public_id_with_ext.rsplit('.', 1)[0]
-                    
-                    # 3. Delete from Cloudinary
-                    cloudinary.uploader.destroy(public_id, invalidate=True)
-                    print(f"Successfully deleted from Cloudinary: {public_id}")
-            except Exception as e:
-                print(f"Cloudinary deletion error: {e}")
-
-        # 4. Finally, delete the record from the database
-        instance.delete()
+
+
+class GymGalleryBulkCreateView(APIView):
+    """
+    POST a list of {"title", "description", "image"} items (already uploaded to
+    Cloudinary). Each item is validated on its own; the valid ones are inserted
+    with one bulk_create and every item gets a result entry.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        items = request.data.get('items') if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list) or not items:
+            return Response({"detail": "Send a non-empty list of items."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > settings.GALLERY_BULK_MAX:
+            return Response({"detail": f"At most {settings.GALLERY_BULK_MAX} items per batch."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        results, candidates = [], []
+        for index, item in enumerate(items):
+            serializer = GymGallerySerializer(data=item, context={'request': request})
+            if not serializer.is_valid():
+                results.append({"index": index, "status": "invalid", "errors": serializer.errors})
+                continue
+            data = serializer.validated_data
+            row = GymGallery(title=data.get('title'), description=data.get('description'),
+                             image=data.get('image') or None)
+            # bulk_create skips save(), so resolve the media columns here
+            row.sync_media_columns()
+            result = {"index": index, "status": "created"}
+            results.append(result)
+            candidates.append((result, row))
+
+        # An asset backs at most one row (gymgallery_unique_asset), or deleting
+        # either row would destroy the other's image. Duplicates within the batch
+        # and of existing rows are reported per item like any invalid one.
+        taken = set(GymGallery.objects.filter(public_id__in={row.public_id for _, row in candidates if row.public_id})
+                    .values_list('resource_type', 'public_id'))
+        rows = []
+        for result, row in candidates:
+            asset = (row.resource_type, row.public_id)
+            if row.public_id and asset in taken:
+                result.update(status="invalid", errors={"image": ["This image is already in the gallery."]})
+                continue
+            taken.add(asset)
+            rows.append(row)
+
+        try:
+            with transaction.atomic():
+                GymGallery.objects.bulk_create(rows)
+                # bulk_create skips post_save, so log the new rows here
+                record_changes(GymGallery, [row.pk for row in rows], ChangeEvent.CREATED)
+                bump_model_version_on_commit(GymGallery)
+                # The browser uploaded the files, so placeholders come from Cloudinary, after the response
+                fill_placeholders_later(GymGallery, pk__in=[row.pk for row in rows])
+        except IntegrityError:
+            # Another request added one of these images since the check above
+            return Response({"detail": "An image in this batch was just added to the gallery; retry."},
+                            status=status.HTTP_409_CONFLICT)
+
+        created = iter(rows)
+        for result in results:
+            if result["status"] == "created":
+                row = next(created)
+                result["id"] = row.id
+                result["item"] = GymGallerySerializer(row, context={'request': request}).data
+
+        if not rows:
+            response_status = status.HTTP_400_BAD_REQUEST
+        elif len(rows) < len(items):
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_201_CREATED
+        return Response({"created": len(rows), "results": results}, status=response_status)
+
+
+class GymGalleryBulkDeleteView(APIView):
+    """
+    POST {"ids": [...]}: delete the rows in one transaction. The Cloudinary
+    assets go to the deletion outbox, which the worker destroys in bulk calls.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        # bool is an int subclass: JSON true/false must not pass as ids 1/0
+        if not isinstance(ids, list) or not ids or not all(
+                isinstance(pk, int) and not isinstance(pk, bool) and pk > 0 for pk in ids):
+            return Response({"detail": "Send a non-empty list of positive integer ids."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > settings.GALLERY_BULK_MAX:
+            return Response({"detail": f"At most {settings.GALLERY_BULK_MAX} ids per batch."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        rows = GymGallery.objects.filter(pk__in=ids)
+        with transaction.atomic(), batched_changes(), batched_media_deletions():
+            found = set(rows.values_list('pk', flat=True))
+            # A regular delete, so post_delete still runs per row; the outbox and
+            # change log entries it queues are inserted once each on the way out
+            rows.delete()
+
+        results = [{"id": pk, "status": "deleted" if pk in found else "not_found"} for pk in ids]
+        return Response({"deleted": len(found), "results": results})
         
         
+def sign_upload(folder, public_id=None):
+    """
+    Sign one direct browser upload to `folder`.
+    Cloudinary accepts a signed upload for an hour after its timestamp, so the
+    timestamp is backdated to make the signature expire after UPLOAD_SIGNATURE_TTL.
+    """
+    now = int(time.time())
+    timestamp = now - (3600 - settings.UPLOAD_SIGNATURE_TTL)
+    params = {'timestamp': timestamp, 'folder': folder}
+    if public_id:
+        params['public_id'] = public_id
+    signature = cloudinary.utils.api_sign_request(params, settings.CLOUDINARY_STORAGE['API_SECRET'])
+    return {**params, 'signature': signature, 'expires_at': now + settings.UPLOAD_SIGNATURE_TTL}
+
+
+PUBLIC_ID_RE = re.compile(r"[\w\-/]{1,200}")
+
+
+def _upload_target_errors(folder, public_id):
+    if folder not in settings.UPLOAD_SIGNATURE_FOLDERS:
+        return {"folder": f"Must be one of: {', '.join(settings.UPLOAD_SIGNATURE_FOLDERS)}."}
+    if public_id is not None and not (isinstance(public_id, str) and PUBLIC_ID_RE.fullmatch(public_id)):
+        return {"public_id": "Letters, digits, '_', '-' and '/' only."}
+    return None
+
+
 class CloudinarySignatureView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        # FIX: Generate a standard unix timestamp manually
-        timestamp = int(time.time())
-        
-        # Define parameters to sign
-        params = {
-            'timestamp': timestamp,
-            'folder': 'gym_gallery',
-        }
-        
-        # Generate the signature using your API Secret
-        # This will now work without the attribute error
-        signature = cloudinary.utils.api_sign_request(
-            params, 
-            settings.CLOUDINARY_STORAGE['API_SECRET']
-        )
-        
+        folder = request.query_params.get('folder', 'gym_gallery')
+        errors = _upload_target_errors(folder, None)
+        if errors:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        signed = sign_upload(folder)
         return Response({
-            'signature': signature,
-            'timestamp': timestamp,
+            **signed,
             'api_key': settings.CLOUDINARY_STORAGE['API_KEY'],
             'cloud_name': settings.CLOUDINARY_STORAGE['CLOUD_NAME'],
-            'folder': 'gym_gallery'
         })
-        
+
+
+class CloudinarySignatureBatchView(APIView):
+    """
+    POST {"count": N, "folder": "..."} or {"items": [{"folder", "public_id"}, ...]}
+    and get one upload signature per item, so a batch of direct uploads needs
+    a single authenticated round trip. All share the same expiry.
+    Responses carry `max_batch` (UPLOAD_SIGNATURE_BATCH_MAX), including the
+    400 for too many items, so clients split larger batches by it.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        data = request.data if isinstance(request.data, dict) else {}
+        items = data.get('items')
+        if items is None:
+            try:
+                count = int(data.get('count', 0))
+            except (TypeError, ValueError):
+                count = 0
+            items = [{'folder': data.get('folder', 'gym_gallery')}] * count
+        if not isinstance(items, list) or not items:
+            return Response({"detail": "Send a positive count or a non-empty list of items."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > settings.UPLOAD_SIGNATURE_BATCH_MAX:
+            return Response({"detail": f"At most {settings.UPLOAD_SIGNATURE_BATCH_MAX} signatures per request.",
+                             "max_batch": settings.UPLOAD_SIGNATURE_BATCH_MAX},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        signatures = []
+        for index, item in enumerate(items):
+            item = item if isinstance(item, dict) else {}
+            folder, public_id = item.get('folder', 'gym_gallery'), item.get('public_id')
+            errors = _upload_target_errors(folder, public_id)
+            if errors:
+                return Response({"index": index, **errors}, status=status.HTTP_400_BAD_REQUEST)
+            signatures.append(sign_upload(folder, public_id))
+
+        return Response({
+            'api_key': settings.CLOUDINARY_STORAGE['API_KEY'],
+            'cloud_name': settings.CLOUDINARY_STORAGE['CLOUD_NAME'],
+            'expires_at': min(signed['expires_at'] for signed in signatures),
+            'max_batch': settings.UPLOAD_SIGNATURE_BATCH_MAX,
+            'signatures': signatures,
+        })
+
 
 class LogoutView(APIView):
     permission_classes = [IsAuthenticated]
@@ -138,27 +308,204 @@ class LogoutView(APIView):
         
         
         
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def bootstrap(request):
+    """
+    Everything the landing page needs for first paint in one round trip:
+    the SiteInfo singleton plus the latest `limit` items of each collection.
+    At most 8 queries on a cache miss (7 while the SiteInfo snapshot is
+    current), regardless of how much content exists.
+    `cursor` is where /api/changes/ picks up from this snapshot.
+    """
+    try:
+        limit = min(int(request.query_params.get('limit', settings.BOOTSTRAP_ITEMS)), settings.API_MAX_PAGE_SIZE)
+    except ValueError:
+        limit = settings.BOOTSTRAP_ITEMS
+    limit = max(limit, 1)
+
+    def build():
+        context = {'request': request}
+        # Taken first: changes made while the rest is read are replayed, not lost
+        cursor = latest_change_id()
+        site = get_site_snapshot()
+        return Response({
+            'limit': limit,
+            'cursor': cursor,
+            'site_info': site.data if site.rows else None,
+            'gallery': GymGallerySerializer(
+                GymGallery.objects.order_by('-id')[:limit], many=True, context=context).data,
+            'events': EventsSerializer(
+                Events.objects.prefetch_related('events_files').order_by('-timestamp', '-id')[:limit],
+                many=True, context=context).data,
+            'live_updates': LiveUpdatesSerializer(
+                LiveUpdates.objects.prefetch_related('liveupdates_files').order_by('-timestamp', '-id')[:limit],
+                many=True, context=context).data,
+            'testimonials': TestimonialSerializer(
+                Testimonial.objects.order_by('-created', '-id')[:limit], many=True, context=context).data,
+        })
+
+    return cached_response(
+        request,
+        (SiteInfo, GymGallery, Events, EventFiles, LiveUpdates, LiveUpdateFiles, Testimonial),
+        build,
+    )
+
+
+class SearchView(APIView):
+    """
+    GET /api/search/?q=<words>[&type=event,live_update,testimonial][&page_size=][&offset=]
+    Ranked full-text search backed by the SearchEntry index; each hit carries
+    the same representation its own list endpoint returns.
+    """
+    permission_classes = [permissions.AllowAny]
+    hydrate = {
+        'event': (Events.objects.prefetch_related('events_files'), EventsSerializer),
+        'live_update': (LiveUpdates.objects.prefetch_related('liveupdates_files'), LiveUpdatesSerializer),
+        'testimonial': (Testimonial.objects.all(), TestimonialSerializer),
+    }
+
+    def get(self, request):
+        return cached_response(
+            request, (Events, EventFiles, LiveUpdates, LiveUpdateFiles, Testimonial), lambda: self.build(request)
+        )
+
+    def build(self, request):
+        query = request.query_params.get('q', '').strip()
+        kinds = [kind for kind in request.query_params.get('type', '').split(',') if kind] or None
+        try:
+            page_size = min(int(request.query_params.get('page_size', settings.API_PAGE_SIZE)), settings.API_MAX_PAGE_SIZE)
+            offset = max(int(request.query_params.get('offset', 0)), 0)
+        except ValueError:
+            return Response({"detail": "page_size and offset must be integers."}, status=400)
+        page_size = max(page_size, 1)
+
+        # One extra row tells us whether there is a next page without a COUNT query
+        hits = search(query, kinds=kinds, limit=page_size + 1, offset=offset)
+        has_next = len(hits) > page_size
+        hits = hits[:page_size]
+
+        objects = {}
+        for kind, (queryset, _) in self.hydrate.items():
+            ids = [object_id for hit_kind, object_id, *_ in hits if hit_kind == kind]
+            if ids:
+                objects[kind] = queryset.in_bulk(ids)
+
+        results = []
+        for kind, object_id, title, snippet, score in hits:
+            obj = objects.get(kind, {}).get(object_id)
+            if obj is None:
+                continue
+            serializer_class = self.hydrate[kind][1]
+            results.append({
+                'kind': kind,
+                'id': object_id,
+                'title': title,
+                'snippet': snippet,
+                'score': round(score, 4),
+                'object': serializer_class(obj, context={'request': request}).data,
+            })
+
+        next_url = None
+        if has_next:
+            params = request.query_params.copy()
+            params['offset'] = offset + page_size
+            next_url = request.build_absolute_uri(f"{request.path}?{params.urlencode()}")
+        return Response({'query': query, 'next': next_url, 'results': results})
+
+
+class ChangesView(APIView):
+    """
+    GET /api/changes/?since=<cursor>[&limit=]
+    Rows of every content collection created, updated or deleted after the
+    cursor, oldest first, one entry per object. Deleted objects come back as
+    tombstones with "data": null. Keep calling with the returned cursor until
+    has_more is false. Without `since` only the current cursor is returned.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        try:
+            since = int(request.query_params['since']) if 'since' in request.query_params else None
+            limit = min(int(request.query_params.get('limit', settings.CHANGES_PAGE_SIZE)), settings.CHANGES_PAGE_SIZE)
+        except ValueError:
+            return Response({"detail": "since and limit must be integers."}, status=400)
+        limit = max(limit, 1)
+        if since is None:
+            return Response({'cursor': latest_change_id(), 'has_more': False, 'changes': []})
+        if not is_replayable(since):
+            return Response({"detail": "The cursor is older than the change log; reload everything.",
+                             "cursor": latest_change_id()}, status=status.HTTP_410_GONE)
+
+        events = fetch_changes(max(since, 0), limit=limit)
+        cursor = events[-1].id if events else since
+        changes = serialize_changes(collapse_changes(events))
+        for change in changes:
+            del change['id']
+        return Response({'cursor': cursor, 'has_more': len(events) == limit, 'changes': changes})
+
+
 def home(request):
     return HttpResponse("HI HELLO")
 
 
+def metrics(request):
+    """Prometheus scrape endpoint, for requests bearing METRICS_TOKEN."""
+    if not settings.METRICS_TOKEN:
+        raise Http404
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+        return HttpResponse(status=403)
+    body, content_type = render_metrics()
+    return HttpResponse(body, content_type=content_type)
+
+
+async def stream(request):
+    """
+    Server-Sent Events feed of created, updated and deleted events and live
+    updates. Resumes after the Last-Event-ID header (or ?last_event_id=).
+    Only served by the ASGI entry point: a WSGI worker would be held forever.
+    """
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse("Streaming needs the ASGI server (royalgym.asgi).", status=503)
+    last_event_id = request.headers.get("Last-Event-ID") or request.GET.get("last_event_id")
+    last_event_id = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+    response = StreamingHttpResponse(stream_messages(last_event_id), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx from buffering the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
 
-class LiveUpdatesViewSet(viewsets.ModelViewSet):
-    queryset = LiveUpdates.objects.all().prefetch_related('liveupdates_files')
+class LiveUpdatesViewSet(StreamingExportMixin, CachedReadMixin, viewsets.ModelViewSet):
+    queryset = LiveUpdates.objects.all().prefetch_related('liveupdates_files').order_by('-timestamp', '-id')
     serializer_class = LiveUpdatesSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = KeysetPagination
+    # Creation time never changes; paging on last_modified would skip or repeat posts edited mid-scroll
+    cursor_ordering = ('-timestamp', '-id')
+    cache_models = (LiveUpdates, LiveUpdateFiles)
+
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        # Files attached by reference (uploaded_assets) get their placeholders after the response
+        fill_placeholders_later(LiveUpdateFiles, live_update_id=serializer.instance.pk)
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        fill_placeholders_later(LiveUpdateFiles, live_update_id=serializer.instance.pk)
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
-        try:
-            with transaction.atomic():
-                self.perform_create(serializer)
-            headers = self.get_success_headers(serializer.data)
-            return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
-        except Exception as e:
-            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        # The serializer uploads first and keeps its own short transaction for the inserts.
+        # Its ValidationError (e.g. an asset already attached) is a 400 with field
+        # errors, a failed upload a 502 (UploadFailed) and anything else a 500.
+        self.perform_create(serializer)
+        headers = self.get_success_headers(serializer.data)
+        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop('partial', False)
@@ -166,35 +513,42 @@ class LiveUpdatesViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(instance, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
         
-        with transaction.atomic():
-            self.perform_update(serializer)
-            # Logic for adding new files during update
-            uploaded_files = request.FILES.getlist('uploaded_files')
-            for file in uploaded_files:
-                LiveUpdateFiles.objects.create(live_update=instance, file=file)
+        # New files in `uploaded_files` are appended by the serializer
+        self.perform_update(serializer)
 
+        # Drop the prefetched files so the response includes the new ones
+        instance._prefetched_objects_cache = {}
         return Response(serializer.data)
     
 
 
-class EventsViewSet(viewsets.ModelViewSet):
+class EventsViewSet(StreamingExportMixin, CachedReadMixin, viewsets.ModelViewSet):
     # prefetch_related stops the N+1 query problem, making fetches lightning fast
-    queryset = Events.objects.all().prefetch_related('events_files').order_by('-timestamp')
+    queryset = Events.objects.all().prefetch_related('events_files').order_by('-timestamp', '-id')
     serializer_class = EventsSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = KeysetPagination
+    cursor_ordering = ('-timestamp', '-id')
+    cache_models = (Events, EventFiles)
+
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        # Files attached by reference (uploaded_assets) get their placeholders after the response
+        fill_placeholders_later(EventFiles, event_id=serializer.instance.pk)
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        fill_placeholders_later(EventFiles, event_id=serializer.instance.pk)
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
-        # Atomic transaction prevents ghost records if an image fails to upload
-        try:
-            with transaction.atomic():
-                self.perform_create(serializer)
-            headers = self.get_success_headers(serializer.data)
-            return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
-        except Exception as e:
-            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        # Images are uploaded before the (short) insert transaction; a failed insert
+        # queues the uploaded images for deletion so no ghost assets are left behind
+        self.perform_create(serializer)
+        headers = self.get_success_headers(serializer.data)
+        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop('partial', False)
@@ -202,9 +556,7 @@ class EventsViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(instance, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
         
-        try:
-            with transaction.atomic():
-                self.perform_update(serializer)
-            return Response(serializer.data)
-        except Exception as e:
-            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        self.perform_update(serializer)
+        # Drop the prefetched files so the response includes the new ones
+        instance._prefetched_objects_cache = {}
+        return Response(serializer.data)
\ No newline at end of file
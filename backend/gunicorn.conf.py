@@ -0,0 +1,24 @@
+import os
+import shutil
+
+from prometheus_client import multiprocess
+
+
+# Workers write metric samples here so /metrics can sum them across processes.
+# Must be set before the app (and prometheus_client in it) is imported by a worker.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(os.path.dirname(__file__), "prometheus"))
+
+# Sync WSGI workers serve the API. /api/stream/ holds connections open, which they
+# can't do (the view answers 503 there): the reverse proxy sends that path to the
+# separate `stream` process (uvicorn royalgym.asgi:application, see Procfile).
+
+
+def on_starting(server):
+    # Start each deploy from empty counters
+    directory = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory)
+
+
+def child_exit(server, worker):
+    multiprocess.mark_process_dead(worker.pid)
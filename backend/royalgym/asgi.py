@@ -0,0 +1,7 @@
+import os
+from django.core.asgi import get_asgi_application
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "royalgym.settings")
+# Entry point of the `stream` process (Procfile), which only /api/stream/ is routed to;
+# the rest of the API stays on the gunicorn WSGI workers. In nginx:
+#   location /api/stream/ { proxy_pass http://127.0.0.1:8001; proxy_http_version 1.1; proxy_buffering off; }
+application = get_asgi_application()
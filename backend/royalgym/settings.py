@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from datetime import timedelta
 
@@ -30,6 +31,8 @@ INSTALLED_APPS = [
 
 
 MIDDLEWARE = [
+    "core.middleware.MetricsMiddleware",
+    "core.middleware.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -56,6 +59,7 @@ TEMPLATES = [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                "core.context_processors.site_info",
             ]
         },
     }
@@ -65,13 +69,40 @@ TEMPLATES = [
 WSGI_APPLICATION = "royalgym.wsgi.application"
 
 
+# --- DATABASE SETTINGS ---
+# Reads from core views go to "replica" (see core.routers). On SQLite the replica
+# is the same file opened read-only, which under WAL (set by migration 0026) lets
+# readers run alongside the writer; point it at a real replica on other engines.
+# Connections are not kept between requests (CONN_MAX_AGE 0): benchmark_db_reads
+# showed no gain from reusing them, and the ASGI stream process must not.
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
-    }
+    },
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": f"file:{BASE_DIR / 'db.sqlite3'}?mode=ro",
+        "TEST": {"MIRROR": "default"},
+    },
+}
+
+DATABASE_ROUTERS = ["core.routers.PrimaryReplicaRouter"]
+
+# Applied to every new SQLite connection by core.db.configure_sqlite. Only
+# per-connection pragmas: journal_mode is stored in the file, so migration 0026
+# switches it to WAL once instead of every connection (and manage.py command) rewriting it.
+SQLITE_PRAGMAS = {
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,
+    "busy_timeout": 5000,  # ms to wait for a lock instead of failing with "database is locked"
+    "temp_store": "MEMORY",
 }
 
+# Seconds a client's reads stay on the primary after it writes
+REPLICA_STICKY_SECONDS = 10
+REPLICA_STICKY_COOKIE = "db_primary"
+
 
 AUTH_PASSWORD_VALIDATORS = []
 LANGUAGE_CODE = "en-us"
@@ -94,10 +125,46 @@ STORAGES = {
     },
 }
 
+# --- FRONTEND SETTINGS ---
+# SERVE_FRONTEND=1: Django serves the Vite build as well as the API. Build it with
+#   VITE_BASE=/static/app/ npm run build
+#   python manage.py collectstatic --noinput --upload-unhashed-files
+# (cloudinary_storage's collectstatic copies only hashed files without that flag)
+# collectstatic then stores every file under a content hash with brotli/gzip
+# copies, and whitenoise serves hashed files with a one-year immutable lifetime.
+SERVE_FRONTEND = os.environ.get("SERVE_FRONTEND") == "1"
+FRONTEND_DIST = Path(os.environ.get("FRONTEND_DIST", BASE_DIR.parent / "frontend" / "dist"))
+FRONTEND_STATIC_PREFIX = "app"
+
+if SERVE_FRONTEND:
+    STATICFILES_DIRS = [(FRONTEND_STATIC_PREFIX, FRONTEND_DIST)]
+    STORAGES["staticfiles"] = {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"}
+    # Manifest-hashed names (app/favicon.1a2b3c4d5e6f.svg) and Vite's own hashed
+    # chunks (assets/index-Bx3f_9aQ.js), which the shell and lazy imports
+    # reference by their Vite names
+    WHITENOISE_IMMUTABLE_FILE_TEST = r"(\.[0-9a-f]{12}\.[^/]+|/assets/[^/]+-[\w-]{8}\.\w+)$"
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 
+# --- CACHE SETTINGS ---
+# File-based so cached responses and model version stamps are shared by all gunicorn workers
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR / "cache",
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    }
+}
+
+# Cached API bodies are invalidated by version bumps, the timeout only bounds disk usage
+RESPONSE_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Cached bodies at least this large are also stored brotli- and gzip-compressed
+COMPRESS_MIN_SIZE = 512
+
+
 # --- CLOUDINARY SETTINGS ---
 # Hardcoded as requested. Replace these with your real values.
 CLOUDINARY_STORAGE = {
@@ -107,16 +174,87 @@ CLOUDINARY_STORAGE = {
     'RESOURCE_TYPES': ['image', 'raw', 'video'],
 }
 
+# Direct browser uploads: folders a signature can be issued for, signatures per
+# batch request, and seconds a signature stays valid (Cloudinary's cap is 3600)
+UPLOAD_SIGNATURE_FOLDERS = ["gym_gallery", "event_photos", "live_update_files"]
+UPLOAD_SIGNATURE_BATCH_MAX = 100
+UPLOAD_SIGNATURE_TTL = 15 * 60
+
+# reconcile_media: folder -> resource types scanned for assets no row references,
+# and how old an unreferenced asset must be before it counts as orphaned
+MEDIA_RECONCILE_FOLDERS = {
+    "gym_gallery": ["image"],
+    "event_photos": ["image"],
+    "live_update_files": ["image", "raw", "video"],
+}
+MEDIA_RECONCILE_GRACE = timedelta(hours=24)
+
+# --- MEDIA DELETION OUTBOX ---
+# Deleted rows queue their assets; `manage.py drain_media_outbox --loop` destroys them in bulk
+MEDIA_BACKEND = "core.media.CloudinaryMediaBackend"
+MEDIA_OUTBOX_MAX_ATTEMPTS = 10
+MEDIA_OUTBOX_RETRY_BASE = 30  # seconds, doubled per failed attempt
+MEDIA_OUTBOX_LEASE = 300  # seconds a claimed batch is hidden from other workers
+
+# Parallel Cloudinary uploads per request (event/live-update files)
+MEDIA_UPLOAD_WORKERS = 4
+
+# Max widths (px) of the responsive image URLs returned with every image
+IMAGE_VARIANT_WIDTHS = {"thumb": 320, "card": 768, "full": 1920}
+
+# Longest side (px) of the blurred placeholder stored with every image
+IMAGE_PLACEHOLDER_SIZE = 16
+
+# --- METRICS SETTINGS ---
+# Bearer token Prometheus sends to scrape /metrics (`authorization: {credentials: ...}`
+# in its scrape config). Unset disables the endpoint. Not an IP allowlist: behind a
+# local reverse proxy every client arrives from 127.0.0.1.
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+# --- STREAM SETTINGS ---
+# /api/stream/ (ASGI only): one poll of the change log per worker per interval,
+# shared by every subscriber
+SSE_POLL_INTERVAL = 1.0
+SSE_HEARTBEAT = 20  # seconds between keep-alive comments on an idle stream
+SSE_RETRY_MS = 3000  # reconnect delay suggested to EventSource
+SSE_BUFFER_SIZE = 1000  # recent messages kept in memory for Last-Event-ID resumes
+SSE_QUEUE_SIZE = 200  # pending messages per subscriber before it is disconnected
+SSE_REPLAY_MAX = 500  # older resumes get a "reset" event instead of a replay
+# Gaps in the change log younger than this may be uncommitted writes; wait for them
+CHANGE_GAP_WAIT = 5
+
+# --- CHANGE LOG SETTINGS ---
+# Most changes returned by one /api/changes/ call (overridable with ?limit=)
+CHANGES_PAGE_SIZE = 500
+# Older entries are pruned; clients behind that get 410 Gone and resync in full
+CHANGE_LOG_RETENTION = timedelta(days=30)
+CHANGE_LOG_PRUNE_INTERVAL = 60 * 60
+
 # --- REST FRAMEWORK SETTINGS ---
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # JWTAuthentication with the resolved user cached for the token's lifetime
+        "core.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
     ),
 }
 
+# --- PAGINATION SETTINGS ---
+# Cursor pagination is opt-in per request (?page_size= or ?cursor=)
+API_PAGE_SIZE = 20
+API_MAX_PAGE_SIZE = 100
+
+# Rows serialized per chunk by ?export=json|ndjson streaming list responses
+EXPORT_CHUNK_SIZE = 500
+
+# Items per collection returned by /api/bootstrap/ (overridable with ?limit=)
+BOOTSTRAP_ITEMS = 20
+
+# Largest batch accepted by /api/gallery/bulk/ and /api/gallery/bulk-delete/
+GALLERY_BULK_MAX = 500
+
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
@@ -132,6 +270,11 @@ SIMPLE_JWT = {
     "AUTH_COOKIE_SAMESITE": "Lax",
 }
 
+# Expired refresh tokens are pruned from the blacklist tables at most once per
+# interval by whichever worker finishes a request (None disables; see prune_tokens)
+TOKEN_PRUNE_INTERVAL = 60 * 60
+TOKEN_PRUNE_CHUNK = 1000
+
 
 # --- CORS SETTINGS ---
 CORS_ALLOW_CREDENTIALS = True
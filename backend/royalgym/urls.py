@@ -1,16 +1,23 @@
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.contrib import admin
 from django.conf import settings
 from django.conf.urls.static import static
 from core.auth import CustomTokenObtainPairView, CustomTokenRefreshView
-from core.views import home
+from core.views import home, metrics
+from core.frontend import spa_shell
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/token/", CustomTokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("api/token/refresh/", CustomTokenRefreshView.as_view(), name="token_refresh"),
     path("api/", include("core.urls")),
-    path("", home, name="home"),
+    path("metrics", metrics, name="metrics"),
+    # With SERVE_FRONTEND the React app takes over "/"
+    path("", spa_shell if settings.SERVE_FRONTEND else home, name="home"),
 ]
 
+if settings.SERVE_FRONTEND:
+    # Client-side routes survive a reload
+    urlpatterns.append(re_path(r"^(?!api/|admin/|static/|metrics).*$", spa_shell, name="spa-fallback"))
+
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
@@ -69,4 +69,11 @@ export const FullPageLoader = ({ label }) => (
       <p className="text-xs font-black text-white uppercase tracking-[0.2em] italic">{label}</p>
     </div>
   </div>
-);
\ No newline at end of file
+);
+// --- IMAGE PLACEHOLDER ---
+// Paints the server's tiny blurred preview behind an <img> until the real image loads
+export const placeholderStyle = (placeholder) => (
+  placeholder
+    ? { backgroundImage: `url(${placeholder})`, backgroundSize: 'cover', backgroundPosition: 'center' }
+    : undefined
+);
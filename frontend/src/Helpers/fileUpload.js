@@ -3,15 +3,56 @@ import axios from 'axios';
 import { loadAccessToken } from '../api/auth';
 import { server_domain } from './Domain';
 
+/**
+ * BATCH SIGNATURES
+ * One authenticated call for a whole batch of direct uploads.
+ * Returns [{ signature, timestamp, folder, public_id?, api_key, cloud_name }],
+ * valid until expires_at (unix seconds).
+ * The server caps signatures per call and reports the cap as `max_batch`
+ * (with its 400 too), so larger batches are split by what it says.
+ */
+let signatureBatchMax = null;
+
+export const getUploadSignatures = async (count, folder = 'gym_gallery') => {
+  const token = loadAccessToken();
+  const signed = [];
+  while (signed.length < count) {
+    const wanted = count - signed.length;
+    let res;
+    try {
+      res = await axios.post(
+        `${server_domain}api/cloudinary-signature/batch/`,
+        { count: signatureBatchMax ? Math.min(signatureBatchMax, wanted) : wanted, folder },
+        { headers: { Authorization: `Bearer ${token}` } }
+      );
+    } catch (error) {
+      const max = error.response?.data?.max_batch;
+      // The cap is lower than we assumed: retry with it
+      if (max && max < wanted && max !== signatureBatchMax) {
+        signatureBatchMax = max;
+        continue;
+      }
+      throw error;
+    }
+    const { api_key, cloud_name, signatures, max_batch } = res.data;
+    if (max_batch) signatureBatchMax = max_batch;
+    if (!signatures.length) throw new Error('No upload signatures returned');
+    signed.push(...signatures.map((signature) => ({ ...signature, api_key, cloud_name })));
+  }
+  return signed;
+};
+
 /**
  * HIGH-PERFORMANCE SECURE UPLOAD
- * 1. Verifies User Auth
+ * 1. Takes a signature from getUploadSignatures (it names the target folder)
  * 2. Compresses Image (background worker)
- * 3. Fetches Signed Token from Django
+ * 3. Re-signs for the same folder if that signature expired meanwhile
  * 4. Uploads to Cloudinary
  */
-export const secureSmartUpload = async (file, onProgress = () => {}) => {
+export const secureSmartUpload = async (file, onProgress = () => {}, signed) => {
   try {
+    if (!signed?.folder) throw new Error('secureSmartUpload needs a signature from getUploadSignatures');
+
     let fileToUpload = file;
 
     // 1. COMPRESSION (Performance Boost)
@@ -28,13 +69,17 @@ export const secureSmartUpload = async (file, onProgress = () => {}) => {
       }
     }
 
-    // 2. GET SECURE SIGNATURE FROM DJANGO
-    const token = loadAccessToken();
-    const sigResponse = await axios.get(`${server_domain}api/cloudinary-signature/`, {
-      headers: { Authorization: `Bearer ${token}` }
-    });
+    // 2. FRESH SIGNATURE FROM DJANGO, only when the batch one expired (e.g. a long compression)
+    if (signed.expires_at * 1000 <= Date.now()) {
+      const token = loadAccessToken();
+      const sigResponse = await axios.get(`${server_domain}api/cloudinary-signature/`, {
+        headers: { Authorization: `Bearer ${token}` },
+        params: { folder: signed.folder }
+      });
+      signed = sigResponse.data;
+    }
 
-    const { signature, timestamp, api_key, cloud_name, folder } = sigResponse.data;
+    const { signature, timestamp, api_key, cloud_name, folder, public_id } = signed;
 
     // 3. PREPARE SIGNED FORMDATA
     const formData = new FormData();
@@ -43,6 +88,7 @@ export const secureSmartUpload = async (file, onProgress = () => {}) => {
     formData.append('timestamp', timestamp);
     formData.append('signature', signature);
     formData.append('folder', folder);
+    if (public_id) formData.append('public_id', public_id);
 
     // 4. UPLOAD DIRECTLY TO CLOUDINARY (High Speed)
     const uploadRes = await axios.post(
@@ -56,14 +102,31 @@ export const secureSmartUpload = async (file, onProgress = () => {}) => {
       }
     );
 
+    const { public_id: uploadedId, version, signature: responseSignature, resource_type, format } = uploadRes.data;
     return {
       success: true,
       secure_url: uploadRes.data.secure_url,
-      public_id: uploadRes.data.public_id
+      public_id: uploadedId,
+      // Signed reference Django verifies before attaching the file to an event/live update
+      asset: { public_id: uploadedId, version, signature: responseSignature, resource_type, format }
     };
 
   } catch (error) {
     console.error("Secure Upload Failed:", error);
     return { success: false, error: error.message };
   }
-};
\ No newline at end of file
+};
+
+/**
+ * DIRECT UPLOADS FOR EVENTS & LIVE UPDATES
+ * Uploads `files` straight to Cloudinary in parallel and returns the signed
+ * references to send as `uploaded_assets`. Throws if any upload fails.
+ */
+export const uploadAssets = async (files, folder) => {
+  if (!files.length) return [];
+  const signatures = await getUploadSignatures(files.length, folder);
+  const results = await Promise.all(files.map((file, i) => secureSmartUpload(file, () => {}, signatures[i])));
+  const failed = results.find((result) => !result.success);
+  if (failed) throw new Error(failed.error);
+  return results.map((result) => result.asset);
+};
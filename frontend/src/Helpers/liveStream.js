@@ -0,0 +1,49 @@
+import { server_domain } from './Domain';
+
+/**
+ * LIVE CHANGES
+ * One shared EventSource on /api/stream/ for every subscribed component.
+ * The browser reconnects by itself and resumes from the last event id.
+ */
+const STREAM_URL = `${server_domain}api/stream/`;
+
+let source = null;
+const listeners = new Set();
+
+const open = () => {
+  source = new EventSource(STREAM_URL, { withCredentials: true });
+  source.addEventListener('change', (e) => {
+    const change = JSON.parse(e.data);
+    listeners.forEach((listener) => listener.onChange(change));
+  });
+  // The server could not replay what we missed: reload from the REST API
+  source.addEventListener('reset', () => {
+    listeners.forEach((listener) => listener.onReset && listener.onReset());
+  });
+};
+
+// onChange receives { id, kind, action, object_id, data }; returns an unsubscribe function
+export const subscribeToChanges = (onChange, onReset) => {
+  if (typeof EventSource === 'undefined') return () => {};
+  const listener = { onChange, onReset };
+  listeners.add(listener);
+  if (!source) open();
+  return () => {
+    listeners.delete(listener);
+    if (!listeners.size && source) {
+      source.close();
+      source = null;
+    }
+  };
+};
+
+// Apply one change to a list of rows (newest first); rows without data are left alone
+export const applyChange = (items, { action, object_id, data }) => {
+  if (action === 'deleted' || !data) {
+    return action === 'deleted' ? items.filter((item) => item.id !== object_id) : items;
+  }
+  if (items.some((item) => item.id === object_id)) {
+    return items.map((item) => (item.id === object_id ? data : item));
+  }
+  return [data, ...items];
+};
@@ -8,8 +8,8 @@ import {
 } from 'lucide-react';
 import { server_domain } from "../Helpers/Domain";
 import { loadAccessToken } from "../api/auth";
-import { secureSmartUpload } from "../Helpers/fileUpload";
-import { ToastCustom, ProgressOverlay, FullPageLoader } from "../Helpers/Utils";
+import { secureSmartUpload, getUploadSignatures } from "../Helpers/fileUpload";
+import { ToastCustom, ProgressOverlay, FullPageLoader, placeholderStyle } from "../Helpers/Utils";
 
 const API_URL = `${server_domain}api/gallery/`;
 
@@ -136,31 +136,31 @@ const AdminGalleryManager = () => {
     const total = newUploads.length;
 
     try {
-        await Promise.all(newUploads.map(async (item) => {
+        // 1. Upload every file straight to Cloudinary in parallel
+        // One signing round trip for the whole batch
+        const signatures = await getUploadSignatures(newUploads.length, 'gym_gallery');
+
+        const uploaded = await Promise.all(newUploads.map(async (item, index) => {
             setUploadProgress(prev => ({ ...prev, [item.id]: 2 }));
 
             const cloudRes = await secureSmartUpload(item.file, (progress) => {
                 setUploadProgress(prev => ({ ...prev, [item.id]: progress }));
-            });
-
-            if (cloudRes.success) {
-                await axios.post(`${server_domain}api/gallery/`, {
-                    title: item.title,
-                    description: item.description,
-                    image: cloudRes.secure_url 
-                }, {
-                    headers: { Authorization: `Bearer ${loadAccessToken()}` }
-                });
-                
-                completedCount++;
-                setUploadProgress(prev => ({ ...prev, [item.id]: 100 }));
-                setGlobalProgress((completedCount / total) * 100);
-            } else {
+            }, signatures[index]);
+
+            if (!cloudRes.success) {
                 throw new Error(`Asset ${item.title} failed`);
             }
+            completedCount++;
+            setGlobalProgress((completedCount / total) * 100);
+            return { title: item.title, description: item.description, image: cloudRes.secure_url };
         }));
 
-        showToast(`${newUploads.length} Assets Published Successfully`);
+        // 2. Register all of them with a single batch request
+        const batchRes = await axios.post(`${API_URL}bulk/`, uploaded, {
+            headers: { Authorization: `Bearer ${loadAccessToken()}` }
+        });
+
+        showToast(`${batchRes.data.created} Assets Published Successfully`);
         setNewUploads([]);
         fetchImages();
         setActiveTab('manage');
@@ -235,7 +235,7 @@ const AdminGalleryManager = () => {
     setGlobalLoading("De-linking from Cloudinary CDN...");
     const token = loadAccessToken();
     try {
-      await Promise.all(targets.map(tId => axios.delete(`${API_URL}${tId}/`, { headers: { "Authorization": `Bearer ${token}` } })));
+      await axios.post(`${API_URL}bulk-delete/`, { ids: targets }, { headers: { "Authorization": `Bearer ${token}` } });
       showToast(`Purged ${targets.length} assets`);
       setExistingImages(prev => prev.filter(img => !targets.includes(img.id)));
       setSelectedIds([]); setIsSelectionMode(false);
@@ -291,7 +291,7 @@ const AdminGalleryManager = () => {
                 <div className="absolute top-full left-0 right-0 mt-2 bg-[#0a0a0c] border border-white/10 rounded-2xl shadow-2xl z-50 max-h-[300px] overflow-y-auto custom-scrollbar animate-in fade-in zoom-in-95 backdrop-blur-2xl">
                     {filteredImages.length > 0 ? filteredImages.map(img => (
                         <div key={img.id} onClick={() => scrollToImage(img.id)} className="flex items-center gap-4 p-3 hover:bg-white/5 cursor-pointer border-b border-white/5 last:border-none group/item transition-colors">
-                            <img src={img.image} className="w-10 h-10 object-cover rounded-lg border border-white/10" alt="" />
+                            <img src={img.variants?.thumb || img.image} className="w-10 h-10 object-cover rounded-lg border border-white/10" alt="" />
                             <div className="flex-grow min-w-0">
                                 <p className="text-xs font-bold text-white truncate uppercase italic">{img.title || "Untitled"}</p>
                                 <p className="text-[9px] text-slate-500 truncate">{img.description || "No metadata"}</p>
@@ -353,7 +353,7 @@ const AdminGalleryManager = () => {
                           onClick={() => isSelectionMode ? toggleSelectImage(img.id) : setViewImage(img)} 
                           className={`group relative aspect-square rounded-2xl overflow-hidden border-2 transition-all duration-500 cursor-pointer ${isSelected ? 'border-emerald-500 ring-4 ring-emerald-500/10 scale-95' : 'border-slate-800 hover:border-slate-600'}`}
                         >
-                            <img src={img.image} className="w-full h-full object-cover transition-transform duration-[1.5s] group-hover:scale-110" alt="" />
+                            <img src={img.variants?.card || img.image} srcSet={img.srcset || undefined} sizes="(min-width: 1024px) 20vw, 50vw" loading="lazy" style={placeholderStyle(img.placeholder)} className="w-full h-full object-cover transition-transform duration-[1.5s] group-hover:scale-110" alt="" />
                             
                             {!isSelectionMode && (
                                 <div className="absolute inset-0 bg-black/40 opacity-0 group-hover:opacity-100 transition-opacity flex items-center justify-center gap-2 backdrop-blur-[1px]">
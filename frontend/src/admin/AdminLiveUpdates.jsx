@@ -9,6 +9,7 @@ import {
 import { server_domain } from "../Helpers/Domain";
 import { loadAccessToken } from "../api/auth";
 import { ToastCustom, FullPageLoader } from "../Helpers/Utils";
+import { uploadAssets } from "../Helpers/fileUpload";
 
 const API_URL = `${server_domain}api/live-updates/`;
 
@@ -88,17 +89,15 @@ const LiveUpdateManager = () => {
         if (!newPost.title.trim()) return showToast("Subject is required", "error");
 
         setIsSubmitting(true);
-        const formData = new FormData();
-        formData.append('subject', newPost.title);
-        formData.append('description', newPost.description);
-        newPost.files.forEach(file => formData.append('uploaded_files', file));
-
         try {
-            await axios.post(API_URL, formData, {
-                headers: {
-                    'Content-Type': 'multipart/form-data',
-                    Authorization: `Bearer ${loadAccessToken()}`
-                }
+            // Files go straight to Cloudinary; Django only gets the signed references
+            const uploaded_assets = await uploadAssets(newPost.files, 'live_update_files');
+            await axios.post(API_URL, {
+                subject: newPost.title,
+                description: newPost.description,
+                uploaded_assets,
+            }, {
+                headers: { Authorization: `Bearer ${loadAccessToken()}` }
             });
             showToast("Broadcast published successfully");
             setNewPost({ title: '', description: '', files: [] });
@@ -153,18 +152,15 @@ const LiveUpdateManager = () => {
         if (!editingPost) return;
         setIsSubmitting(true);
 
-        const formData = new FormData();
-        formData.append('subject', editFormData.subject);
-        formData.append('description', editFormData.description);
-        // Append NEW files only
-        editFormData.newFiles.forEach(file => formData.append('uploaded_files', file));
-
         try {
-            await axios.patch(`${API_URL}${editingPost.id}/`, formData, {
-                headers: {
-                    'Content-Type': 'multipart/form-data',
-                    Authorization: `Bearer ${loadAccessToken()}`
-                }
+            // Upload NEW files only
+            const uploaded_assets = await uploadAssets(editFormData.newFiles, 'live_update_files');
+            await axios.patch(`${API_URL}${editingPost.id}/`, {
+                subject: editFormData.subject,
+                description: editFormData.description,
+                uploaded_assets,
+            }, {
+                headers: { Authorization: `Bearer ${loadAccessToken()}` }
             });
             showToast("Changes saved");
             setEditModalOpen(false);
@@ -10,6 +10,7 @@ import {
 import { server_domain } from "../Helpers/Domain";
 import { loadAccessToken } from "../api/auth";
 import { ToastCustom, FullPageLoader } from "../Helpers/Utils";
+import { uploadAssets } from "../Helpers/fileUpload";
 
 const API_URL = `${server_domain}api/events/`;
 
@@ -75,16 +76,17 @@ const EventManager = () => {
         if (!formData.title || !formData.location) return showToast("Title & Location are required", "error");
 
         setIsSubmitting(true);
-        const data = new FormData();
-        data.append('title', formData.title);
-        data.append('highlights', formData.highlights); // This is now an HTML string from Quill
-        data.append('description', formData.description); // This is now an HTML string from Quill
-        data.append('location', formData.location);
-        formData.files.forEach(file => data.append('uploaded_images', file));
-
         try {
-            await axios.post(API_URL, data, {
-                headers: { 'Content-Type': 'multipart/form-data', Authorization: `Bearer ${loadAccessToken()}` }
+            // Images go straight to Cloudinary; Django only gets the signed references
+            const uploaded_assets = await uploadAssets(formData.files, 'event_photos');
+            await axios.post(API_URL, {
+                title: formData.title,
+                highlights: formData.highlights, // This is now an HTML string from Quill
+                description: formData.description, // This is now an HTML string from Quill
+                location: formData.location,
+                uploaded_assets,
+            }, {
+                headers: { Authorization: `Bearer ${loadAccessToken()}` }
             });
             showToast("Event Published Successfully");
             setFormData(initialFormState);
@@ -109,16 +111,16 @@ const EventManager = () => {
 
     const handleSaveEdit = async () => {
         setIsSubmitting(true);
-        const data = new FormData();
-        data.append('title', editFormData.title);
-        data.append('highlights', editFormData.highlights);
-        data.append('description', editFormData.description);
-        data.append('location', editFormData.location);
-        editFormData.newFiles.forEach(file => data.append('uploaded_images', file));
-
         try {
-            await axios.patch(`${API_URL}${editingEvent.id}/`, data, {
-                headers: { 'Content-Type': 'multipart/form-data', Authorization: `Bearer ${loadAccessToken()}` }
+            const uploaded_assets = await uploadAssets(editFormData.newFiles, 'event_photos');
+            await axios.patch(`${API_URL}${editingEvent.id}/`, {
+                title: editFormData.title,
+                highlights: editFormData.highlights,
+                description: editFormData.description,
+                location: editFormData.location,
+                uploaded_assets,
+            }, {
+                headers: { Authorization: `Bearer ${loadAccessToken()}` }
             });
             showToast("Event Updated Successfully");
             setEditModalOpen(false);
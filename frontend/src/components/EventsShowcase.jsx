@@ -5,12 +5,17 @@ import {
     X, ZoomIn, Download, ImageIcon, ChevronDown, ChevronUp
 } from 'lucide-react';
 import { server_domain } from "../Helpers/Domain";
+import { useSiteData, getBootstrapList } from "../context/SiteDataContext";
+import { placeholderStyle } from "../Helpers/Utils";
+import { subscribeToChanges, applyChange } from "../Helpers/liveStream";
 
 const API_URL = `${server_domain}api/events/`;
 
 const EventsShowcase = () => {
-    const [events, setEvents] = useState([]);
-    const [loading, setLoading] = useState(true);
+    const { bootstrap } = useSiteData();
+    const initialEvents = getBootstrapList(bootstrap, "events");
+    const [events, setEvents] = useState(initialEvents || []);
+    const [loading, setLoading] = useState(!initialEvents);
 
     // UI States
     const [lightbox, setLightbox] = useState({ isOpen: false, url: null, title: '' });
@@ -22,6 +27,9 @@ const EventsShowcase = () => {
     const carouselRef = useRef(null);
 
     useEffect(() => {
+        // Already delivered in full by /bootstrap/
+        if (initialEvents) return;
+
         const fetchEvents = async () => {
             try {
                 const response = await axios.get(API_URL);
@@ -33,8 +41,17 @@ const EventsShowcase = () => {
             }
         };
         fetchEvents();
+        // eslint-disable-next-line react-hooks/exhaustive-deps
     }, []);
 
+    // Push created/updated/deleted rows from the server as they happen
+    useEffect(() => subscribeToChanges(
+        (change) => {
+            if (change.kind === "event") setEvents(prev => applyChange(prev, change));
+        },
+        () => axios.get(API_URL).then(response => setEvents(response.data)).catch(() => {})
+    ), []);
+
     // --- CAROUSEL LOGIC ---
     const handleScroll = () => {
         if (!carouselRef.current) return;
@@ -155,7 +172,13 @@ const EventsShowcase = () => {
                                         <div className="relative h-40 bg-slate-950 overflow-hidden shrink-0">
                                             {event.files && event.files.length > 0 ? (
                                                 <img
-                                                    src={event.files[0].file_url}
+                                                    src={event.files[0].variants?.card || event.files[0].file_url}
+                                                    srcSet={event.files[0].srcset || undefined}
+                                                    sizes="(min-width: 768px) 33vw, 100vw"
+                                                    loading="lazy"
+                                                    width={event.files[0].width || undefined}
+                                                    height={event.files[0].height || undefined}
+                                                    style={placeholderStyle(event.files[0].placeholder)}
                                                     className="w-full h-full object-cover transition-transform duration-700"
                                                     alt={event.title}
                                                 />
@@ -235,7 +258,9 @@ const EventsShowcase = () => {
                                                             className="relative w-12 h-12 shrink-0 rounded-lg overflow-hidden group/thumb snap-start border border-white/10 bg-black"
                                                         >
                                                             <img
-                                                                src={fileObj.file_url}
+                                                                src={fileObj.variants?.thumb || fileObj.file_url}
+                                                                loading="lazy"
+                                                                style={placeholderStyle(fileObj.placeholder)}
                                                                 alt="thumb"
                                                                 className="w-full h-full object-cover transition-transform duration-500 group-hover/thumb:scale-110"
                                                             />
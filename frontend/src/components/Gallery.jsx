@@ -1,5 +1,6 @@
 import React, { useState } from 'react';
 import { X, ChevronLeft, ChevronRight, Maximize2, Info, Eye, Download } from 'lucide-react';
+import { placeholderStyle } from '../Helpers/Utils';
 
 const INITIAL_COUNT = 8; 
 const MAX_DESC_LENGTH = 80;
@@ -75,7 +76,13 @@ const Gallery = ({ images = [] }) => {
               {/* Image Container */}
               <div className="relative h-48 sm:h-56 overflow-hidden bg-black">
                 <img
-                  src={item.image}
+                  src={item.variants?.card || item.image}
+                  srcSet={item.srcset || undefined}
+                  sizes="(min-width: 1024px) 25vw, (min-width: 640px) 50vw, 100vw"
+                  loading="lazy"
+                  width={item.width || undefined}
+                  height={item.height || undefined}
+                  style={placeholderStyle(item.placeholder)}
                   alt={item.title || `Gallery ${index}`}
                   className="w-full h-full object-cover transform group-hover:scale-110 transition-transform duration-1000 ease-out"
                 />
@@ -172,7 +179,10 @@ const Gallery = ({ images = [] }) => {
 
           <div className="w-full h-full p-4 flex flex-col items-center justify-center">
             <img
-              src={images[activeIndex].image}
+              src={images[activeIndex].variants?.full || images[activeIndex].image}
+              width={images[activeIndex].width || undefined}
+              height={images[activeIndex].height || undefined}
+              style={placeholderStyle(images[activeIndex].placeholder)}
               alt=""
               className="max-w-full max-h-[80vh] object-contain rounded shadow-2xl"
             />
@@ -6,6 +6,11 @@ import { useSiteData } from "../context/SiteDataContext";
 
 const Hero = () => {
   const { siteData } = useSiteData();
+  // Phones get the card-width background instead of the full-size one
+  const bgVariants = siteData.main_bg_image_variants;
+  const bgImage = bgVariants
+    ? (window.innerWidth <= 768 ? bgVariants.card : bgVariants.full)
+    : siteData.main_bg_image;
 
   return (
     <section
@@ -19,7 +24,7 @@ const Hero = () => {
       */}
       <div 
         className="absolute inset-0 bg-cover bg-center bg-no-repeat md:bg-fixed z-0"
-        style={{ backgroundImage: `url(${siteData.main_bg_image})` }}
+        style={{ backgroundImage: `url(${bgImage})` }}
       />
       {/* {console.log(siteData.main_bg_image)} */}
 
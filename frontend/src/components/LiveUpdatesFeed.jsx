@@ -14,6 +14,8 @@ import {
     Activity
 } from 'lucide-react';
 import { server_domain } from "../Helpers/Domain";
+import { useSiteData, getBootstrapList } from "../context/SiteDataContext";
+import { subscribeToChanges, applyChange } from "../Helpers/liveStream";
 
 const API_URL = `${server_domain}api/live-updates/`;
 
@@ -38,12 +40,17 @@ const formatDate = (isoString) => {
 };
 
 const LiveUpdatesFeed = () => {
-    const [updates, setUpdates] = useState([]);
-    const [loading, setLoading] = useState(true);
+    const { bootstrap } = useSiteData();
+    const initialUpdates = getBootstrapList(bootstrap, "live_updates");
+    const [updates, setUpdates] = useState(initialUpdates || []);
+    const [loading, setLoading] = useState(!initialUpdates);
     const [error, setError] = useState(null);
     const [expandedDesc, setExpandedDesc] = useState({});
 
     useEffect(() => {
+        // Already delivered in full by /bootstrap/
+        if (initialUpdates) return;
+
         const fetchUpdates = async () => {
             try {
                 const response = await axios.get(API_URL);
@@ -56,8 +63,17 @@ const LiveUpdatesFeed = () => {
             }
         };
         fetchUpdates();
+        // eslint-disable-next-line react-hooks/exhaustive-deps
     }, []);
 
+    // Push created/updated/deleted rows from the server as they happen
+    useEffect(() => subscribeToChanges(
+        (change) => {
+            if (change.kind === "live_update") setUpdates(prev => applyChange(prev, change));
+        },
+        () => axios.get(API_URL).then(response => setUpdates(response.data)).catch(() => {})
+    ), []);
+
     const toggleDesc = (id) => {
         setExpandedDesc(prev => ({ ...prev, [id]: !prev[id] }));
     };
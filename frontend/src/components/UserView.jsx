@@ -10,14 +10,20 @@ import { Loader2 } from 'lucide-react'; // Assuming you have lucide-react instal
 
 // Ensure this import path is correct for your project structure
 import { server_domain } from "../Helpers/Domain";
+import { useSiteData, getBootstrapList } from "../context/SiteDataContext";
 import LiveUpdatesFeed from "./LiveUpdatesFeed.jsx";
 import EventsShowcase from "./EventsShowcase.jsx";
 
 const UserView = () => {
-  const [galleryData, setGalleryData] = useState([]);
-  const [loading, setLoading] = useState(true);
+  const { bootstrap } = useSiteData();
+  const initialGallery = getBootstrapList(bootstrap, "gallery");
+  const [galleryData, setGalleryData] = useState(initialGallery || []);
+  const [loading, setLoading] = useState(!initialGallery);
 
   useEffect(() => {
+    // Already delivered in full by /bootstrap/
+    if (initialGallery) return;
+
     const fetchGallery = async () => {
       try {
         const response = await axios.get(`${server_domain}api/gallery/`);
@@ -30,6 +36,7 @@ const UserView = () => {
     };
 
     fetchGallery();
+    // eslint-disable-next-line react-hooks/exhaustive-deps
   }, []);
 
   return (
@@ -1,37 +1,91 @@
-import React, { createContext, useContext, useEffect, useState } from "react";
+import React, { createContext, useContext, useEffect, useRef, useState } from "react";
 import api from "../api/axios";
+import { applyChange } from "../Helpers/liveStream";
+
+// /api/changes/ kind -> bootstrap collection
+const CHANGE_KEYS = {
+  event: "events",
+  live_update: "live_updates",
+  gallery: "gallery",
+  testimonial: "testimonials",
+};
 
 const SiteDataContext = createContext(null);
 
 export const SiteDataProvider = ({ children }) => {
   const [siteData, setSiteData] = useState(null);
+  // Latest items of each collection, delivered with the site info in one request
+  const [bootstrap, setBootstrap] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
+  const cursor = useRef(null);
 
-  useEffect(() => {
-    const fetchSiteData = async () => {
-      try {
-        const res = await api.get("/site_info/"); // use correct endpoint
-        // If API returns list, pick first item
-        setSiteData(Array.isArray(res.data) ? res.data[0] : res.data);
-      } catch (err) {
-        console.error(err);
-        setError("Failed to load site data");
-      } finally {
-        setLoading(false);
+  const fetchSiteData = async () => {
+    try {
+      const res = await api.get("/bootstrap/");
+      cursor.current = res.data.cursor;
+      setSiteData(res.data.site_info);
+      setBootstrap(res.data);
+    } catch (err) {
+      console.error(err);
+      setError("Failed to load site data");
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  // Back on the tab: fetch only what changed since the snapshot
+  const syncChanges = async () => {
+    if (cursor.current === null || cursor.current === undefined) return;
+    try {
+      let more = true;
+      while (more) {
+        const res = await api.get("/changes/", { params: { since: cursor.current } });
+        const { changes } = res.data;
+        setBootstrap(prev => {
+          if (!prev) return prev;
+          const next = { ...prev };
+          changes.forEach(change => {
+            const key = CHANGE_KEYS[change.kind];
+            if (key && Array.isArray(next[key])) next[key] = applyChange(next[key], change);
+          });
+          return next;
+        });
+        changes
+          .filter(change => change.kind === "site_info" && change.data)
+          .forEach(change => setSiteData(change.data));
+        cursor.current = res.data.cursor;
+        more = res.data.has_more;
       }
-    };
+    } catch (err) {
+      // 410: the server no longer has our cursor in its change log
+      if (err.response && err.response.status === 410) fetchSiteData();
+    }
+  };
 
+  useEffect(() => {
     fetchSiteData();
+    const onVisible = () => document.visibilityState === "visible" && syncChanges();
+    document.addEventListener("visibilitychange", onVisible);
+    return () => document.removeEventListener("visibilitychange", onVisible);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
   }, []);
 
   return (
-    <SiteDataContext.Provider value={{ siteData, loading, error }}>
+    <SiteDataContext.Provider value={{ siteData, bootstrap, loading, error }}>
       {children}
     </SiteDataContext.Provider>
   );
 };
 
+// A bootstrap collection is complete unless it was cut at the limit;
+// returns null when the caller should fetch the full list itself
+// eslint-disable-next-line react-refresh/only-export-components
+export const getBootstrapList = (bootstrap, key) => {
+  if (!bootstrap || !Array.isArray(bootstrap[key])) return null;
+  return bootstrap[key].length < bootstrap.limit ? bootstrap[key] : null;
+};
+
 // Custom hook (THIS is what you use everywhere)
 // eslint-disable-next-line react-refresh/only-export-components
 export const useSiteData = () => {
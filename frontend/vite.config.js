@@ -4,5 +4,6 @@ import react from '@vitejs/plugin-react'
 // https://vite.dev/config/
 export default defineConfig({
   plugins: [react()],
-  base: '/The-Royal-Gym',
+  // VITE_BASE=/static/app/ when the build is served by Django (SERVE_FRONTEND)
+  base: process.env.VITE_BASE || '/The-Royal-Gym',
 })